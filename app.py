@@ -31,6 +31,7 @@ def clean_games() -> None:
         print(game.get_game_state())
         if game.get_game_state() == GameState.GAME_OVER:
             print(f"GameID: {game.get_game_id()} cleaned.")
+            game.close()
             games.remove(game)
             break
 
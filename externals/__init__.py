@@ -1,4 +1,11 @@
 # Import specific classes or functions to expose them at the package level
 from .dictionary.dictionary import Dictionary
 from .dictionary.letter_node import LetterNode
-from .dictionary.explorer import Explorer
\ No newline at end of file
+from .dictionary.packed_dictionary import PackedDictionary, PackedNode
+from .dictionary.dawg_builder import DawgBuilder
+from .dictionary.gaddag import Gaddag
+from .dictionary.factor_index import FactorIndex
+from .dictionary.alphagram_index import AlphagramIndex
+from .dictionary.pattern import Pattern
+from .dictionary.explorer import Explorer
+from .dictionary.registry import DictionaryRegistry
\ No newline at end of file
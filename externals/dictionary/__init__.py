@@ -1,6 +1,16 @@
 # Import specific classes or functions to expose them at the package level
 from .letter_node import LetterNode
 from .dictionary import Dictionary
+from .packed_dictionary import PackedDictionary, PackedNode
+from .dawg_builder import DawgBuilder
+from .gaddag import Gaddag
+from .factor_index import FactorIndex
+from .alphagram_index import AlphagramIndex
+from .pattern import Pattern
+from .letter_index import LetterIndex
+from .overlay import OverlayDictionary
+from .hook_index import HookIndex
 from .explorer import Explorer
+from .registry import DictionaryRegistry
 from .trie_node import TrieNode
 from .trie import Trie
\ No newline at end of file
@@ -0,0 +1,272 @@
+import mmap
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .packed_dictionary import PackedDictionary
+from .cached_automaton import is_cache_fresh, write_cache_file
+from .dawg_codec import read_dawg_section
+
+class AlphagramIndex:
+    """
+    @class AlphagramIndex
+    @brief Words of up to max_length letters grouped by alphagram, the
+    sorted string of their letters.
+
+    @description The anagrams of a rack are found by looking up the
+    sub-multisets of its letters, each blank standing for any letter,
+    instead of walking the DAWG. Sub-multisets are generated as sorted
+    strings, skipping those that do not start an alphagram. The index is
+    cached next to the dictionary as a `.alphagrams` file, or embedded in a
+    v2 `.dict` file, and looked up in place by binary search. All integers
+    are big-endian u32:
+
+    - MAGIC, VERSION, max_length, number of alphagrams, number of words,
+      size of the alphabet and of the longest alphagram in bytes
+    - the alphabet as UTF-8, zero padded to 4 bytes
+    - the alphagrams, sorted, as UTF-8 zero padded to the same size,
+      then to 4 bytes in all
+    - number of alphagrams + 1 offsets into the word groups
+    - the words of each alphagram, sorted, as newline separated UTF-8
+    """
+
+    EXTENSION = '.alphagrams'
+    SECTION = b'ALPH'
+    MAGIC = b'ALPH'
+    VERSION = 2
+    HEADER_SIZE = 28
+
+    def __init__(self, max_length: int):
+        """
+        @brief Initialize an empty index.
+        @param max_length: length of the longest words indexed, usually the rack capacity
+        """
+        self.max_length: int = max_length
+        self.number_of_words: int = 0
+        self.alphabet: List[str] = []                 # Letters found in the words, sorted
+        self.data = b''                               # Encoded index, bytes or a read-only mapping
+        self.keys: np.ndarray = np.zeros(0, dtype='S1')  # Sorted alphagrams, UTF-8 encoded
+        self.group_offsets: np.ndarray = np.zeros(1, dtype='>u4')
+        self.groups_start: int = 0                    # Offset of the word groups in data
+
+    def __len__(self) -> int:
+        return self.number_of_words
+
+    def build(self, words: Iterable[str]) -> 'AlphagramIndex':
+        """
+        @brief Index the words of at most max_length letters.
+        @param words: words to be indexed, in any order
+        @return: this
+        """
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for word in set(words):
+            if 0 < len(word) <= self.max_length:
+                groups["".join(sorted(word))].append(word)
+        # Code point order is UTF-8 byte order, so the encoded alphagrams stay sorted
+        keys = sorted(groups)
+        alphabet = "".join(sorted({ch for key in keys for ch in key})).encode('utf-8')
+        encoded_keys = np.array([key.encode('utf-8') for key in keys], dtype=bytes)
+        key_width = encoded_keys.dtype.itemsize
+        encoded_keys = encoded_keys.tobytes()
+        encoded_groups = ["\n".join(sorted(groups[key])).encode('utf-8') for key in keys]
+
+        data = (AlphagramIndex.MAGIC
+                + AlphagramIndex.VERSION.to_bytes(4, 'big')
+                + self.max_length.to_bytes(4, 'big')
+                + len(keys).to_bytes(4, 'big')
+                + sum(len(group) for group in groups.values()).to_bytes(4, 'big')
+                + len(alphabet).to_bytes(4, 'big')
+                + key_width.to_bytes(4, 'big')
+                + alphabet + bytes(-len(alphabet) % 4)
+                + encoded_keys + bytes(-len(encoded_keys) % 4)
+                + np.cumsum([0] + [len(group) for group in encoded_groups]).astype('>u4').tobytes()
+                + b''.join(encoded_groups))
+        return self._set_data(data)
+
+    def to_bytes(self) -> bytes:
+        """
+        @brief Encode the index in the `.alphagrams` format.
+        """
+        return bytes(self.data)
+
+    @classmethod
+    def read_header(cls, data) -> Tuple[int, int]:
+        """
+        @brief Read the version and max_length of an encoded index.
+        @param data: the encoded index
+        @return: (version, max_length)
+        """
+        if len(data) < 12 or data[0:4] != cls.MAGIC:
+            raise ValueError("AlphagramIndex: not an alphagram index")
+        return int.from_bytes(data[4:8], 'big'), int.from_bytes(data[8:12], 'big')
+
+    @classmethod
+    def from_bytes(cls, data) -> 'AlphagramIndex':
+        """
+        @brief Use an index encoded with to_bytes in place.
+        @param data: the encoded index, bytes or a read-only mapping
+        """
+        version, max_length = cls.read_header(data)
+        if version != cls.VERSION:
+            raise ValueError(f"AlphagramIndex: unsupported version {version}")
+        if len(data) < cls.HEADER_SIZE:
+            raise ValueError("AlphagramIndex: truncated index")
+        return cls(max_length)._set_data(data)
+
+    def _set_data(self, data) -> 'AlphagramIndex':
+        """
+        @brief Use an encoded index, checking that it is complete.
+        """
+        number_of_keys = int.from_bytes(data[12:16], 'big')
+        alphabet_size = int.from_bytes(data[20:24], 'big')
+        key_width = int.from_bytes(data[24:28], 'big')
+        keys_start = AlphagramIndex.HEADER_SIZE + alphabet_size + (-alphabet_size % 4)
+        offsets_start = keys_start + number_of_keys * key_width + (-number_of_keys * key_width % 4)
+        groups_start = offsets_start + 4 * (number_of_keys + 1)
+        if len(data) < groups_start:
+            raise ValueError(f"AlphagramIndex: truncated index, expected {number_of_keys} alphagrams")
+        group_offsets = np.frombuffer(data, dtype='>u4', count=number_of_keys + 1, offset=offsets_start)
+        size = groups_start + group_offsets.item(number_of_keys)
+        if len(data) != size:
+            raise ValueError(f"AlphagramIndex: corrupt index, {len(data)} bytes instead of {size}")
+
+        self.number_of_words = int.from_bytes(data[16:20], 'big')
+        self.alphabet = list(bytes(data[AlphagramIndex.HEADER_SIZE:AlphagramIndex.HEADER_SIZE + alphabet_size]).decode('utf-8'))
+        self.data = data
+        self.keys = np.frombuffer(data, dtype=f'S{key_width}', count=number_of_keys, offset=keys_start)
+        self.group_offsets = group_offsets
+        self.groups_start = groups_start
+        return self
+
+    def _group(self, i: int) -> List[str]:
+        """
+        @brief The words of the i-th alphagram.
+        """
+        group = self.data[self.groups_start + self.group_offsets.item(i):self.groups_start + self.group_offsets.item(i + 1)]
+        return group.decode('utf-8').split("\n")
+
+    def get(self, alphagram: str) -> Tuple[str, ...]:
+        """
+        @brief Words whose letters, sorted, are alphagram.
+        @param alphagram: the sorted letters
+        @return: the words, sorted, empty if there is none
+        """
+        key = alphagram.encode('utf-8')
+        i = int(self.keys.searchsorted(key))
+        if i < len(self.keys) and self.keys.item(i) == key:
+            return tuple(self._group(i))
+        return ()
+
+    @classmethod
+    def path_for(cls, dict_path: str) -> str:
+        """
+        @brief Path of the index cached next to a `.dict` file.
+        """
+        return os.path.splitext(dict_path)[0] + cls.EXTENSION
+
+    @classmethod
+    def load_or_build(cls, dict_path: str, max_length: int) -> 'AlphagramIndex':
+        """
+        @brief Load the index embedded in a `.dict` file, or else map the
+        one cached next to it, building and saving it first if it is
+        missing, older than the dictionary, of an older version, built
+        for shorter words or corrupt (e.g. left by a crashed build).
+
+        @param dict_path: path of the `.dict` file
+        @param max_length: length of the longest words indexed
+        @return: index of the dictionary
+        """
+        section = read_dawg_section(dict_path, cls.SECTION)
+        if section is not None:
+            version, section_length = cls.read_header(section)
+            if version == cls.VERSION and section_length >= max_length:
+                return cls.from_bytes(section)
+
+        cache_path = cls.path_for(dict_path)
+        if is_cache_fresh(cache_path, dict_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                index = cls.from_bytes(mapping)
+                if index.max_length >= max_length:
+                    return index
+            except ValueError:
+                pass  # Empty, truncated, corrupt or of an older version: rebuilt below
+
+        dictionary = PackedDictionary(os.path.basename(dict_path)).load_mmap(dict_path)
+        words: List[str] = []
+        dictionary.each_word(words.append)
+        index = cls(max_length).build(words)
+        try:
+            write_cache_file(cache_path, index.to_bytes())
+        except OSError:
+            pass  # Read-only installation: keep the index in memory only
+        return index
+
+    def find_anagrams(self, the_chars: str) -> Dict[str, str]:
+        """
+        @brief Find anagrams of a set of letters, with the same results as
+        Dictionary.find_anagrams for racks of up to max_length letters.
+
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @return: a map of actual words, in sorted order, to the letter
+                sequence (using ' ' for blanks) that matched.
+        """
+        the_chars = the_chars.upper()
+        if len(the_chars) < 2:
+            raise ValueError(f"Dictionary: '{the_chars}' is too short to find anagrams")
+        if len(the_chars) > self.max_length:
+            raise ValueError(f"AlphagramIndex: '{the_chars}' is longer than {self.max_length} letters")
+
+        alphabet = self.alphabet
+        keys = self.keys
+        found = set()
+
+        # Sub-multisets are extended a letter at a time, one length at a time,
+        # so that all the prefixes of a length are looked up in a single search.
+        # Each is held with the letters left on the rack, sorted, and the blanks left.
+        level = [("", "".join(sorted(ch for ch in the_chars if ch != ' ')), the_chars.count(' '))]
+        for _ in range(len(the_chars)):
+            longer = []
+            for key, rest, blanks in level:
+                # Letters are appended in sorted order so every multiset is met once,
+                # and a blank only stands for a letter once the rack has none left
+                last = key[-1] if key else ""
+                for i, letter in enumerate(rest):
+                    if letter >= last and (i == 0 or rest[i - 1] != letter):
+                        longer.append((key + letter, rest[:i] + rest[i + 1:], blanks))
+                if blanks > 0:
+                    for letter in alphabet:
+                        if letter >= last and letter not in rest:
+                            longer.append((key + letter, rest, blanks - 1))
+            if not longer:
+                break
+
+            # 0xFF never occurs in UTF-8, so prefix + 0xFF follows every alphagram starting with prefix
+            prefixes = [key.encode('utf-8') for key, _, _ in longer]
+            bounds = keys.searchsorted(prefixes + [prefix + b'\xff' for prefix in prefixes]).tolist()
+            level = []
+            for i, prefix in enumerate(prefixes):
+                start = bounds[i]
+                if start == bounds[len(prefixes) + i]:
+                    continue  # Not the start of any alphagram
+                if keys.item(start) == prefix:
+                    found.update(self._group(start))
+                level.append(longer[i])
+
+        rack = Counter(ch for ch in the_chars if ch != ' ')
+        found_words: Dict[str, str] = {}
+        for word in sorted(found):
+            # Real letters are used first, left to right, as the DAWG search does
+            left = dict(rack)
+            blanked = []
+            for ch in word:
+                if left.get(ch, 0) > 0:
+                    left[ch] -= 1
+                    blanked.append(ch)
+                else:
+                    blanked.append(' ')
+            found_words[word] = "".join(blanked)
+        return found_words
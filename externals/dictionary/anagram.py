@@ -0,0 +1,137 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .letter_node import LetterNode
+
+BLANK = ' '
+
+class RackCounts:
+    """
+    @class RackCounts
+    @brief Letters available to an anagram search, as a fixed-size array of
+    counts, one slot per distinct letter, plus a counter of blanks.
+
+    @description The search takes a letter with take() and gives it back
+    with put_back() when it backtracks, so the rack is never copied. A real
+    letter is always preferred over a blank, as in
+    LetterNode.find_words_that_use.
+    """
+    __slots__ = ('slots', 'counts', 'blanks', 'remaining')
+
+    def __init__(self, chars: str):
+        """
+        @brief Count the letters of a rack.
+        @param chars: the letters, ' ' for a blank
+        """
+        self.slots: Dict[str, int] = {}   # Letter -> index in counts
+        self.counts: List[int] = []       # Number of each letter left
+        self.blanks: int = 0              # Number of blanks left
+        self.remaining: int = len(chars)  # Number of tiles left
+        for ch in chars:
+            if ch == BLANK:
+                self.blanks += 1
+                continue
+            slot = self.slots.setdefault(ch, len(self.counts))
+            if slot == len(self.counts):
+                self.counts.append(0)
+            self.counts[slot] += 1
+
+    def take(self, letter: str) -> Optional[str]:
+        """
+        @brief Take a tile for the letter.
+        @return: the letter if it was on the rack, ' ' if a blank was used, None if neither is left
+        """
+        slot = self.slots.get(letter, -1)
+        if slot >= 0 and self.counts[slot] > 0:
+            self.counts[slot] -= 1
+            self.remaining -= 1
+            return letter
+        if self.blanks > 0:
+            self.blanks -= 1
+            self.remaining -= 1
+            return BLANK
+        return None
+
+    def put_back(self, match: str) -> None:
+        """
+        @brief Give back a tile returned by take().
+        """
+        self.remaining += 1
+        if match == BLANK:
+            self.blanks += 1
+        else:
+            self.counts[self.slots[match]] += 1
+
+def find_anagrams_in_nodes(root: Optional[LetterNode], the_chars: str) -> Dict[str, str]:
+    """
+    @brief Find the words that can be made from some or all of the letters,
+    walking a LetterNode graph. Each sibling chain is walked once.
+
+    @param root: first node of the dictionary
+    @param the_chars: the letters, ' ' for an any-letter wildcard
+    @return: a map of actual words to the letter sequence (using ' ' for blanks) that matched
+    """
+    found_words: Dict[str, str] = {}
+    rack = RackCounts(the_chars)
+    real: List[str] = []
+    blanked: List[str] = []
+
+    def find_words_that_use(node: LetterNode) -> None:
+        while node is not None:
+            match = rack.take(node.letter)
+            if match is not None:
+                real.append(node.letter)
+                blanked.append(match)
+                if node.isEndOfWord:
+                    found_words["".join(real)] = "".join(blanked)
+                if rack.remaining > 0 and node.child is not None:
+                    find_words_that_use(node.child)
+                real.pop()
+                blanked.pop()
+                rack.put_back(match)
+            node = node.next
+
+    find_words_that_use(root)
+    return found_words
+
+def find_anagrams_in_table(letters: np.ndarray, info: np.ndarray, the_chars: str) -> Dict[str, str]:
+    """
+    @brief Find the words that can be made from some or all of the letters,
+    walking a packed node table (see PackedDictionary).
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @param the_chars: the letters, ' ' for an any-letter wildcard
+    @return: a map of actual words to the letter sequence (using ' ' for blanks) that matched
+    """
+    found_words: Dict[str, str] = {}
+    if len(letters) == 0:
+        return found_words
+
+    rack = RackCounts(the_chars)
+    real: List[str] = []
+    blanked: List[str] = []
+
+    def find_words_that_use(i: int) -> None:
+        while True:
+            letter = chr(letters.item(i))
+            numb = info.item(i)
+            match = rack.take(letter)
+            if match is not None:
+                real.append(letter)
+                blanked.append(match)
+                if numb & LetterNode.END_OF_WORD_BIT_MASK:
+                    found_words["".join(real)] = "".join(blanked)
+                child = (numb >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+                if rack.remaining > 0 and child:
+                    find_words_that_use(child)
+                real.pop()
+                blanked.pop()
+                rack.put_back(match)
+            if numb & LetterNode.END_OF_LIST_BIT_MASK:
+                return
+            i += 1
+
+    find_words_that_use(0)
+    return found_words
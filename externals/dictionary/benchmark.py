@@ -0,0 +1,320 @@
+"""
+@brief Micro benchmarks for the dictionary backends.
+
+Usage:
+    python -m externals.dictionary.benchmark backends [dictionaries/*.dict]
+    python -m externals.dictionary.benchmark decode [dictionaries/*.dict]
+    python -m externals.dictionary.benchmark sequences [dictionaries/*.dict]
+    python -m externals.dictionary.benchmark layout [dictionaries/*.dict]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+from io import BytesIO, StringIO
+from typing import List, Callable, Dict, Tuple
+
+from .dictionary import Dictionary
+from .letter_node import LetterNode
+from .packed_dictionary import PackedDictionary
+from .factor_index import FactorIndex
+from .cached_automaton import is_cache_fresh
+from .dawg_codec import read_node_table, write_node_table
+from .layout import depth_first_layout
+
+DEFAULT_DICTIONARIES = [
+    "dictionaries/Oxford_5000.dict",
+    "dictionaries/British_English.dict",
+    "dictionaries/CSW2021_English.dict",
+]
+
+# Loaders taking the path and the content of a .dict file
+BACKENDS: Dict[str, Callable[[str, bytes], object]] = {
+    "LetterNode": lambda path, data: Dictionary("benchmark").load_dawg(BytesIO(data)),
+    "Packed": lambda path, data: PackedDictionary("benchmark").load_dawg(BytesIO(data)),
+    "Mapped": lambda path, data: PackedDictionary("benchmark").load_mmap(path),
+}
+
+def read_words(dict_path: str, count: int, seed: int = 0) -> List[str]:
+    """
+    @brief Pick a reproducible sample of words from the word list next to a .dict file.
+    @param dict_path: path of the .dict file
+    @param count: number of words to sample
+    @return: list of words
+    """
+    txt_path = os.path.splitext(dict_path)[0] + ".txt"
+    with open(txt_path, encoding="utf-8") as f:
+        words = [w.strip().upper() for w in f if w.strip()]
+    return random.Random(seed).sample(words, min(count, len(words)))
+
+def measure_load(loader: Callable[[str, bytes], object], path: str, data: bytes) -> Tuple[object, float, int]:
+    """
+    @brief Load and link a dictionary, measuring time and traced memory.
+    Time and memory are taken from separate loads since tracing slows
+    allocation-heavy code down considerably.
+    @return: Tuple of (dictionary, seconds, bytes allocated)
+    """
+    start = time.perf_counter()
+    dic = loader(path, data)
+    dic.add_links()
+    dic.create_sequence_roots()
+    elapsed = time.perf_counter() - start
+    del dic
+
+    tracemalloc.start()
+    dic = loader(path, data)
+    dic.add_links()
+    dic.create_sequence_roots()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dic, elapsed, size
+
+def measure_calls(fn: Callable[[str], object], inputs: List[str]) -> float:
+    """
+    @brief Average latency of fn over the inputs in microseconds.
+    """
+    start = time.perf_counter()
+    for value in inputs:
+        fn(value)
+    return (time.perf_counter() - start) / max(1, len(inputs)) * 1e6
+
+def legacy_load_dawg(data: BytesIO) -> LetterNode:
+    """
+    @brief Node-by-node decoder Dictionary.load_dawg used before the
+    vectorized one, kept as the baseline of the decode benchmark.
+    @return: root node
+    """
+    number_of_nodes = int.from_bytes(data.read(4), 'big')
+
+    nodes = []
+    for i in range(number_of_nodes):
+        letter = int.from_bytes(data.read(4), 'big')
+        node = LetterNode(chr(letter))
+        node.decode(i, int.from_bytes(data.read(4), 'big'))
+        nodes.append(node)
+
+    for node in nodes:
+        if isinstance(node.next, int):
+            node.next = nodes[node.next]
+        if isinstance(node.child, int):
+            node.child = nodes[node.child]
+    return nodes[0]
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    """
+    @brief Best wall time of fn over a number of runs in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+def compare_decoders(paths: List[str], repeat: int) -> None:
+    """
+    @brief Print the load time of the node-by-node and vectorized DAWG decoders.
+    """
+    print(f"{'dictionary':<22} {'nodes':>8} {'legacy ms':>10} {'vectorized ms':>14} {'speedup':>8}")
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        legacy = best_of(lambda: legacy_load_dawg(BytesIO(data)), repeat)
+        vectorized = best_of(lambda: Dictionary("benchmark").load_dawg(BytesIO(data)), repeat)
+        nodes = int.from_bytes(data[:4], 'big')
+        print(f"{os.path.basename(path):<22} {nodes:>8} {legacy:>10.1f} {vectorized:>14.1f} {legacy / vectorized:>7.1f}x")
+
+def compare_backends(paths: List[str], samples: int) -> None:
+    """
+    @brief Print a memory/latency comparison of the dictionary backends.
+    """
+    print(f"{'dictionary':<22} {'backend':<11} {'load ms':>9} {'memory MB':>10} "
+          f"{'has_word us':>12} {'has_seq us':>11} {'anagram ms':>11}")
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        words = read_words(path, samples)
+        misses = [w[::-1] + "Q" for w in words]
+        sequences = [w[1:4] for w in words if len(w) > 3]
+        racks = ["".join(random.Random(i).sample(w, min(7, len(w)))) for i, w in enumerate(words[:20]) if len(w) > 1]
+
+        for name, loader in BACKENDS.items():
+            dic, elapsed, size = measure_load(loader, path, data)
+            has_word = measure_calls(dic.has_word, words + misses)
+            has_seq = measure_calls(dic.has_sequence, sequences)
+            anagram = measure_calls(dic.find_anagrams, racks) / 1000
+            print(f"{os.path.basename(path):<22} {name:<11} {elapsed * 1000:>9.1f} {size / 2**20:>10.2f} "
+                  f"{has_word:>12.2f} {has_seq:>11.2f} {anagram:>11.2f}")
+
+def compare_sequences(paths: List[str], samples: int) -> None:
+    """
+    @brief Print the has_sequence latency with sequence roots and with a factor index.
+    """
+    print(f"{'dictionary':<22} {'factor nodes':>13} {'build s':>8} {'roots us':>9} {'factors us':>11} {'speedup':>8}")
+    for path in paths:
+        words = read_words(path, samples)
+        rng = random.Random(0)
+        sequences = [w[i:i + rng.randint(2, 4)] for w in words for i in [rng.randrange(len(w))]]
+        # Mostly absent, as most letters tried by the cross-checks are
+        sequences += ["".join(rng.choice(w) for _ in range(3)) for w in words]
+
+        dic = PackedDictionary("benchmark").load_mmap(path)
+        roots = measure_calls(dic.has_sequence, sequences)
+
+        start = time.perf_counter()
+        all_words: List[str] = []
+        dic.each_word(all_words.append)
+        factor_index = FactorIndex("benchmark").build(all_words)
+        build = time.perf_counter() - start
+
+        dic.set_factor_index(factor_index)
+        factors = measure_calls(dic.has_sequence, sequences)
+        print(f"{os.path.basename(path):<22} {len(factor_index):>13} {build:>8.1f} {roots:>9.1f} {factors:>11.1f} {roots / factors:>7.0f}x")
+
+def rack_tiles(letters: str) -> list:
+    """
+    @brief Tiles of an English rack, ' ' for a blank.
+    """
+    from game.globals import ALPH_ENGLISH, BLANK_LETTER, TILE
+    return [TILE(letter=letter, point=0 if letter == BLANK_LETTER else ALPH_ENGLISH[letter][1]) for letter in letters]
+
+def english_board(dict_path: str, backend: str) -> object:
+    """
+    @brief Empty board playing an English dictionary with a backend of DictionaryBackend.
+    The board engine depends on this package, so it is only imported when a game is played.
+    """
+    from game.components import Board, DictionaryWrapper
+    from game.globals import ALPH_ENGLISH, LANGUAGE
+    return Board(DictionaryWrapper(LANGUAGE(ALPH_ENGLISH, dict_path), backend))
+
+def play_positions(dict_path: str, turns: int, seed: int = 0) -> List[Tuple[List[Tuple[int, int, str]], str]]:
+    """
+    @brief Play a reproducible game, the best move every turn, and record its positions.
+    @param dict_path: path of the .dict file
+    @param turns: number of turns
+    @param seed: seed of the bag and of the opening play
+    @return: list of (tiles placed since the previous turn as (row, col, letter), rack), one per turn
+    """
+    from game.globals import ALPH_ENGLISH, BLANK_LETTER, RACK_CAPACITY, TILE
+    from game.enums import DictionaryBackend
+
+    bag = [letter for letter, (count, *_) in ALPH_ENGLISH.items() for _ in range(count)] + [BLANK_LETTER] * 2
+    random.Random(seed).shuffle(bag)
+    board = english_board(dict_path, DictionaryBackend.PACKED)
+    positions = []
+    placed: List[Tuple[int, int, str]] = []
+    rack: List[str] = []
+    for turn in range(turns):
+        rack += [bag.pop() for _ in range(min(RACK_CAPACITY - len(rack), len(bag)))]
+        positions.append((placed, "".join(rack)))
+        random.seed(seed + turn)  # The opening play picks its direction at random
+        with contextlib.redirect_stdout(StringIO()):  # and prints its word
+            moves = board.get_possible_moves(rack_tiles(rack))
+        if not moves or not moves[0].word:
+            break
+        new_tiles = [tile for tile in moves[0].word if board.is_empty(tile.row, tile.col)]
+        for tile in new_tiles:
+            rack.remove(BLANK_LETTER if tile.is_blank else tile.letter)
+        placed = [(tile.row, tile.col, tile.letter) for tile in new_tiles]
+        board.place_word([TILE(row, col, letter) for row, col, letter in placed])
+    return positions
+
+def measure_moves(dict_path: str, backend: str, positions: List[Tuple[List[Tuple[int, int, str]], str]], seed: int = 0) -> float:
+    """
+    @brief Replay the positions of play_positions on a new board, timing move generation.
+    @return: average time of get_possible_moves in milliseconds
+    """
+    from game.globals import TILE
+
+    board = english_board(dict_path, backend)
+    elapsed = 0.0
+    for turn, (placed, rack) in enumerate(positions):
+        board.place_word([TILE(row, col, letter) for row, col, letter in placed])
+        random.seed(seed + turn)
+        with contextlib.redirect_stdout(StringIO()):
+            start = time.perf_counter()
+            board.get_possible_moves(rack_tiles(rack))
+            elapsed += time.perf_counter() - start
+    return elapsed / max(1, len(positions)) * 1000
+
+def compare_layouts(paths: List[str], samples: int, repeat: int, turns: int) -> None:
+    """
+    @brief Print the latency of lookups, traversals and move generation with
+    the node table of the .dict file and with it laid out depth first.
+    """
+    from game.enums import DictionaryBackend
+    move_backends = {"LetterNode": DictionaryBackend.OBJECT_GRAPH, "Packed": DictionaryBackend.PACKED}
+
+    print(f"{'dictionary':<22} {'backend':<11} {'layout':<7} {'has_word us':>12} {'anagram ms':>11} {'walk ms':>8} {'moves ms':>9}")
+    for path in paths:
+        with open(path, "rb") as f:
+            letters, info = read_node_table(f)
+        layouts = {"file": write_node_table(letters, info), "dfs": write_node_table(*depth_first_layout(letters, info))}
+        words = read_words(path, samples)
+        inputs = words + [w[::-1] + "Q" for w in words]
+        racks = ["".join(random.Random(i).sample(w, min(7, len(w)))) + " " for i, w in enumerate(words[:20]) if len(w) > 1]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Boards load their dictionary from a file, next to the factor index of the original
+            layout_paths = {}
+            for layout, data in layouts.items():
+                layout_paths[layout] = os.path.join(tmp, layout + ".dict")
+                with open(layout_paths[layout], "wb") as f:
+                    f.write(data)
+                if is_cache_fresh(FactorIndex.path_for(path), path):
+                    shutil.copyfile(FactorIndex.path_for(path), FactorIndex.path_for(layout_paths[layout]))
+            positions = play_positions(layout_paths["file"], turns)
+
+            for name, loader in BACKENDS.items():
+                if name == "Mapped":
+                    continue
+                for layout, data in layouts.items():
+                    dic = loader(path, data)
+                    has_word = min(measure_calls(dic.has_word, inputs) for _ in range(repeat))
+                    anagram = min(measure_calls(dic.find_anagrams, racks) for _ in range(repeat)) / 1000
+                    walk = best_of(lambda: sum(1 for _ in dic.iter_words(max_len=5)), repeat)
+                    del dic
+                    moves = min(measure_moves(layout_paths[layout], move_backends[name], positions) for _ in range(repeat))
+                    print(f"{os.path.basename(path):<22} {name:<11} {layout:<7} {has_word:>12.2f} {anagram:>11.2f} {walk:>8.1f} {moves:>9.0f}")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m externals.dictionary.benchmark", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backends = subparsers.add_parser("backends", help="compare LetterNode, packed and mapped backends")
+    backends.add_argument("dictionaries", nargs="*", default=DEFAULT_DICTIONARIES)
+    backends.add_argument("--samples", type=int, default=2000, help="number of sampled words")
+
+    decode = subparsers.add_parser("decode", help="compare node-by-node and vectorized DAWG decoding")
+    decode.add_argument("dictionaries", nargs="*", default=DEFAULT_DICTIONARIES)
+    decode.add_argument("--repeat", type=int, default=5, help="number of runs, the best is reported")
+
+    sequences = subparsers.add_parser("sequences", help="compare has_sequence with sequence roots and with a factor index")
+    sequences.add_argument("dictionaries", nargs="*", default=DEFAULT_DICTIONARIES)
+    sequences.add_argument("--samples", type=int, default=2000, help="number of sampled words")
+
+    layout = subparsers.add_parser("layout", help="compare the node order of the .dict files with a depth first layout")
+    layout.add_argument("dictionaries", nargs="*", default=DEFAULT_DICTIONARIES)
+    layout.add_argument("--samples", type=int, default=2000, help="number of sampled words")
+    layout.add_argument("--repeat", type=int, default=5, help="number of runs, the best is reported")
+    layout.add_argument("--turns", type=int, default=8, help="number of turns of the game whose positions are replayed")
+
+    args = parser.parse_args(argv)
+    if args.command == "backends":
+        compare_backends(args.dictionaries, args.samples)
+    elif args.command == "decode":
+        compare_decoders(args.dictionaries, args.repeat)
+    elif args.command == "sequences":
+        compare_sequences(args.dictionaries, args.samples)
+    elif args.command == "layout":
+        compare_layouts(args.dictionaries, args.samples, args.repeat, args.turns)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Iterable, List
+
+from .dawg_codec import write_node_table, read_dawg_section
+from .packed_dictionary import PackedDictionary
+
+def is_cache_fresh(cache_path: str, dict_path: str) -> bool:
+    """
+    @brief Does a file derived from a `.dict` file exist and is it at least as recent?
+    """
+    return os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(dict_path)
+
+def write_cache_file(path: str, data: bytes) -> None:
+    """
+    @brief Write a file derived from a `.dict` file atomically. The data goes to
+    a temporary file in the same directory, renamed over path once complete,
+    so other processes open or map either the former file or the new one,
+    never a partial one, and live mappings of the former file stay valid.
+
+    @param path: path of the file
+    @param data: content of the file
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class CachedAutomaton(PackedDictionary, ABC):
+    """
+    @class CachedAutomaton
+    @brief Automaton derived from the words of a `.dict` file and cached
+    next to it in the same node table format.
+
+    @description Subclasses set EXTENSION and SECTION and implement build().
+    A v2 `.dict` file may embed the automaton in the section tagged SECTION,
+    which is then used as is. Otherwise the first load_or_build() builds the
+    automaton from the dictionary words and saves it; later calls
+    memory-map the saved file, so processes share its pages.
+    """
+
+    EXTENSION = '.automaton'
+    SECTION = b'AUTO'
+
+    @abstractmethod
+    def build(self, words: Iterable[str]) -> 'CachedAutomaton':
+        """
+        @brief Build the automaton from a word list.
+        @param words: words to be added, in any order
+        @return: this
+        """
+
+    def to_bytes(self) -> bytes:
+        """
+        @brief Encode the node table in the v1 `.dict` format, as saved in the cache file and in SECTION.
+        """
+        return write_node_table(self.letters, self.info)
+
+    def save(self, path: str) -> None:
+        """
+        @brief Save the node table in the `.dict` format, atomically (see write_cache_file).
+        """
+        write_cache_file(path, self.to_bytes())
+
+    @classmethod
+    def path_for(cls, dict_path: str) -> str:
+        """
+        @brief Path of the automaton cached next to a `.dict` file.
+        """
+        return os.path.splitext(dict_path)[0] + cls.EXTENSION
+
+    @classmethod
+    def load_or_build(cls, dict_path: str) -> 'CachedAutomaton':
+        """
+        @brief Load the automaton embedded in a `.dict` file, or else map the
+        one cached next to it, building and saving it first if it is missing
+        or older than the dictionary.
+
+        @param dict_path: path of the `.dict` file
+        @return: automaton of the dictionary
+        """
+        name = os.path.splitext(os.path.basename(dict_path))[0]
+        section = read_dawg_section(dict_path, cls.SECTION)
+        if section is not None:
+            return cls(name).load_dawg(BytesIO(section))
+
+        cache_path = cls.path_for(dict_path)
+        if not is_cache_fresh(cache_path, dict_path):
+            dictionary = PackedDictionary(name).load_mmap(dict_path)
+            words: List[str] = []
+            dictionary.each_word(words.append)
+            automaton = cls(name).build(words)
+            try:
+                automaton.save(cache_path)
+            except OSError:
+                # Read-only installation: keep the automaton in memory only
+                return automaton
+        return cls(name).load_mmap(cache_path)
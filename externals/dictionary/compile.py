@@ -0,0 +1,148 @@
+"""
+@brief Compile a word list into a `.dict` DAWG, as compress.js does.
+
+Usage:
+    python -m externals.dictionary.compile in.txt out.dict
+    python -m externals.dictionary.compile --index factors --index alphagrams in.txt out.dict
+    python -m externals.dictionary.compile --format 2 --index factors in.txt out.dict
+    python -m externals.dictionary.compile --layout dfs in.txt out.dict
+    python -m externals.dictionary.compile --language tr --alphabet ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZ in.txt out.dict
+"""
+import sys
+import time
+import argparse
+from typing import Dict, Iterable, List, Optional, Union
+
+from .dawg_builder import DawgBuilder
+from .dawg_codec import write_dawg_file, write_node_table
+from .layout import LAYOUTS, depth_first_layout
+from .gaddag import Gaddag
+from .factor_index import FactorIndex
+from .alphagram_index import AlphagramIndex
+from .cached_automaton import write_cache_file
+
+# Indexes that can be embedded in a v2 file, or saved next to a v1 file
+INDEXES = ("factors", "gaddag", "alphagrams")
+
+# Letters whose upper case depends on the language, which str.upper() does not know
+CASE_MAPPINGS = {
+    "tr": str.maketrans({'i': 'İ', 'ı': 'I'}),
+    "az": str.maketrans({'i': 'İ', 'ı': 'I'}),
+}
+
+def read_lexicon(path: str, language: Optional[str] = None, alphabet: Optional[str] = None) -> List[str]:
+    """
+    @brief Read a word list: one word per line, anything after the first
+    whitespace ignored, blank lines skipped. Words are upper-cased.
+
+    @param path: path of the word list, UTF-8 with or without a byte order mark
+    @param language: ISO 639-1 code of the language, for its upper case rules (see CASE_MAPPINGS)
+    @param alphabet: letters of the game, words using other letters are skipped; None for any
+    @return: the words, sorted and without duplicates
+    """
+    mapping = CASE_MAPPINGS.get(language, {})
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        words = {line.split(maxsplit=1)[0].translate(mapping).upper() for line in f if line.strip()}
+    if alphabet is not None:
+        letters = set(alphabet)
+        words = {word for word in words if letters.issuperset(word)}
+    return sorted(words)
+
+def compile_lexicon(words: List[str], version: int = 1, indexes: Iterable[str] = (),
+                    alphagram_length: int = 7, layout: str = "bfs") -> bytes:
+    """
+    @brief Build the minimal DAWG of a word list.
+
+    @param words: the words, in any order
+    @param version: `.dict` format version, 1 as compress.js and `make -C dictionaries`, or 2
+    @param indexes: indexes to embed in a v2 file, among INDEXES
+    @param alphagram_length: length of the longest words in the alphagram index
+    @param layout: node order, among LAYOUTS: breadth first as compress.js, or depth first (see depth_first_layout)
+    @return: the DAWG in the `.dict` format
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Dictionary: unknown layout '{layout}'")
+    words = sorted(set(words))
+    builder = DawgBuilder().add_all(words)
+    table = builder.encode()
+    if layout == "dfs":
+        table = depth_first_layout(*table)
+    if version == 1:
+        if indexes:
+            raise ValueError("Dictionary: indexes can only be embedded in a v2 DAWG")
+        return write_node_table(*table)
+    if version != 2:
+        raise ValueError(f"Dictionary: unsupported DAWG version {version}")
+
+    sections: Dict[bytes, bytes] = {}
+    for index in indexes:
+        built = build_index(index, words, alphagram_length)
+        sections[built.SECTION] = built.to_bytes()
+    return write_dawg_file(*table, builder.number_of_words, sections)
+
+def build_index(index: str, words: List[str], alphagram_length: int = 7) -> Union[FactorIndex, Gaddag, AlphagramIndex]:
+    """
+    @brief Build one of INDEXES from a word list.
+    @param index: name of the index
+    @param words: the words, in any order
+    @param alphagram_length: length of the longest words in the alphagram index
+    @return: the index
+    """
+    if index == "factors":
+        return FactorIndex("factors").build(words)
+    if index == "gaddag":
+        return Gaddag("gaddag").build(words)
+    if index == "alphagrams":
+        return AlphagramIndex(alphagram_length).build(words)
+    raise ValueError(f"Dictionary: unknown index '{index}'")
+
+def save_indexes(words: List[str], dict_path: str, indexes: Iterable[str], alphagram_length: int = 7) -> List[str]:
+    """
+    @brief Save indexes next to a `.dict` file, in the cache files their
+    load_or_build maps, so that no process has to build them. Unlike the
+    sections of a v2 file, they are used in place and their pages shared.
+
+    @param words: the words of the dictionary
+    @param dict_path: path of the `.dict` file, to be written first
+    @param indexes: indexes to save, among INDEXES
+    @param alphagram_length: length of the longest words in the alphagram index
+    @return: paths of the files written
+    """
+    paths = []
+    for index in indexes:
+        built = build_index(index, words, alphagram_length)
+        path = built.path_for(dict_path)
+        write_cache_file(path, built.to_bytes())
+        paths.append(path)
+    return paths
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m externals.dictionary.compile", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("lexicon", help="word list, one word per line")
+    parser.add_argument("output", help="DAWG to be written")
+    parser.add_argument("--format", type=int, choices=(1, 2), default=1, help="`.dict` format version")
+    parser.add_argument("--index", action="append", choices=INDEXES, default=[],
+                        help="index to embed in a v2 file, or to save next to a v1 file")
+    parser.add_argument("--alphagram-length", type=int, default=7, help="length of the longest words in the alphagram index")
+    parser.add_argument("--language", help="ISO 639-1 code of the language, for its upper case rules")
+    parser.add_argument("--alphabet", help="letters of the game, words using other letters are skipped")
+    parser.add_argument("--layout", choices=LAYOUTS, default="bfs", help="node order of the DAWG")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    words = read_lexicon(args.lexicon, args.language, args.alphabet)
+    embedded = args.index if args.format == 2 else []
+    data = compile_lexicon(words, args.format, embedded, args.alphagram_length, args.layout)
+    with open(args.output, 'wb') as f:
+        f.write(data)
+    if args.format == 1:
+        # After the .dict file, so the indexes are not older than it
+        for path in save_indexes(words, args.output, args.index, args.alphagram_length):
+            print(f"{path}: saved")
+    elapsed = time.perf_counter() - start
+    print(f"{args.output}: {len(words)} words, {len(data)} bytes in {elapsed:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .letter_node import LetterNode
+from .dawg_codec import write_node_table
+
+class BuilderState:
+    """
+    @brief State of the automaton under construction.
+    Arcs are kept in the order they are added, which is sorted since the
+    builder only accepts words in sorted order.
+    """
+    __slots__ = ('final', 'letters', 'targets', 'id')
+
+    def __init__(self):
+        self.final: bool = False                    # Does a word end here?
+        self.letters: List[str] = []                # Letters of the outgoing arcs
+        self.targets: List['BuilderState'] = []     # Targets of the outgoing arcs
+        self.id: int = -1                           # Index in the register, -1 until registered
+
+    def signature(self) -> Tuple:
+        """
+        @brief Key identifying the right language of a state whose targets
+        are all registered.
+        """
+        return (self.final, tuple(self.letters), tuple(t.id for t in self.targets))
+
+class DawgBuilder:
+    """
+    @class DawgBuilder
+    @brief Build a minimal DAWG incrementally from words added in sorted order.
+
+    @description Implements the incremental construction of Daciuk et al.:
+    once a word is added, the part of the previous word that is not shared
+    with it can never change again, so its states are replaced by an
+    equivalent registered state, found through a hash table keyed by the
+    state signature (finality, arc letters, registered targets), or are
+    registered themselves. Only the path of the last word is ever kept
+    unminimized, so memory stays proportional to the minimal automaton.
+
+    The result is encoded in the node table layout of compress.js: each
+    state with outgoing arcs becomes a contiguous chain of letter nodes,
+    and the chain of the root state starts at index 0.
+    """
+
+    def __init__(self, prefix_closed: bool = False):
+        """
+        @brief Initialize the builder.
+        @param prefix_closed: accept every prefix of the words added, which
+        lets states merge regardless of where words end
+        """
+        self.prefix_closed: bool = prefix_closed
+        self.root: BuilderState = BuilderState()
+        self.register: Dict[Tuple, BuilderState] = {}
+        self.number_of_words: int = 0
+        self.__previous: str = ""
+        self.__unchecked: List[Tuple[BuilderState, BuilderState]] = []  # (parent, child) along the last word
+        self.__finished: bool = False
+
+    def add(self, word: str) -> bool:
+        """
+        @brief Add a word. Words must be added in sorted order.
+
+        @param word: word to be added
+        @return: true if the word was added, false if it was empty or repeated
+        """
+        if self.__finished:
+            raise ValueError("DawgBuilder: cannot add words after finish()")
+        if len(word) == 0 or word == self.__previous:
+            return False
+        if word < self.__previous:
+            raise ValueError(f"DawgBuilder: '{word}' is not in sorted order after '{self.__previous}'")
+
+        common = 0
+        limit = min(len(word), len(self.__previous))
+        while common < limit and word[common] == self.__previous[common]:
+            common += 1
+
+        self.__minimize(common)
+
+        node = self.__unchecked[-1][1] if self.__unchecked else self.root
+        for letter in word[common:]:
+            child = BuilderState()
+            child.final = self.prefix_closed
+            node.letters.append(letter)
+            node.targets.append(child)
+            self.__unchecked.append((node, child))
+            node = child
+        node.final = True
+
+        self.__previous = word
+        self.number_of_words += 1
+        return True
+
+    def add_all(self, words: Iterable[str]) -> 'DawgBuilder':
+        """
+        @brief Add words in sorted order.
+        @return: this
+        """
+        for word in words:
+            self.add(word)
+        return self
+
+    def finish(self) -> 'DawgBuilder':
+        """
+        @brief Minimize the path of the last word. No more words can be added.
+        @return: this
+        """
+        if not self.__finished:
+            self.__minimize(0)
+            self.__finished = True
+        return self
+
+    def __minimize(self, down_to: int) -> None:
+        while len(self.__unchecked) > down_to:
+            parent, child = self.__unchecked.pop()
+            key = child.signature()
+            existing = self.register.get(key)
+            if existing is not None:
+                parent.targets[-1] = existing
+            else:
+                child.id = len(self.register)
+                self.register[key] = child
+
+    @property
+    def number_of_states(self) -> int:
+        return len(self.register) + 1
+
+    def encode(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        @brief Encode the automaton as a node table.
+        Chains are numbered breadth first from the root chain.
+
+        @return: Tuple of (code points, encoded node information) as uint32 arrays
+        """
+        self.finish()
+
+        chain_of: Dict[int, int] = {}   # Registered state id -> index of its chain
+        states: List[BuilderState] = []
+        queue = deque([self.root])
+        allocated = len(self.root.letters)
+        while queue:
+            state = queue.popleft()
+            states.append(state)
+            for target in state.targets:
+                if target.letters and target.id not in chain_of:
+                    chain_of[target.id] = allocated
+                    allocated += len(target.letters)
+                    queue.append(target)
+
+        if allocated > LetterNode.CHILD_INDEX_BIT_MASK:
+            raise ValueError("Too many nodes remain for integer encoding")
+
+        letters = np.zeros(allocated, dtype=np.uint32)
+        info = np.zeros(allocated, dtype=np.uint32)
+        i = 0
+        for state in states:
+            last = len(state.letters) - 1
+            for k, (letter, target) in enumerate(zip(state.letters, state.targets)):
+                numb = chain_of.get(target.id, 0) << LetterNode.CHILD_INDEX_SHIFT
+                if target.final:
+                    numb |= LetterNode.END_OF_WORD_BIT_MASK
+                if k == last:
+                    numb |= LetterNode.END_OF_LIST_BIT_MASK
+                letters[i] = ord(letter)
+                info[i] = numb
+                i += 1
+        return letters, info
+
+    def to_bytes(self) -> bytes:
+        """
+        @brief Encode the automaton in the `.dict` format.
+        """
+        return write_node_table(*self.encode())
@@ -0,0 +1,233 @@
+import zlib
+from io import BytesIO
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .letter_node import LetterNode
+
+@dataclass(frozen=True)
+class NodeTable:
+    """
+    @brief Decoded node table of a DAWG, one entry per node.
+    """
+    letters: np.ndarray         # Code point of each node (uint32)
+    is_end_of_word: np.ndarray  # Does the node end a valid word? (bool)
+    is_end_of_list: np.ndarray  # Is the node the last of its sibling chain? (bool)
+    child: np.ndarray           # Index of the first child, 0 for none (uint32)
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+DAWG_MAGIC = b'DAWG'  # Starts a v2 file; a v1 file starts with its node count, always below 2**30
+DAWG_VERSION = 2
+
+@dataclass
+class DawgFile:
+    """
+    @brief Content of a `.dict` file.
+
+    @description v1 files, as generated by compress.js, are a big-endian
+    node count followed by one (code point, info) pair of 32-bit words per
+    node. v2 files, all integers big-endian, are laid out as:
+
+        magic 'DAWG', version (u16), flags (u16, reserved)
+        alphabet size (u16), code point of each letter (u32 each), sorted
+        word count (u32), node count (u32)
+        letter index bits (u8), child index bits (u8)
+        node records
+        section count (u16), then for each: tag (4 bytes), length (u32), payload
+        CRC-32 of everything before it (u32)
+
+    A node record holds `letter index << (child bits + 2) | info`, info
+    being the v1 child index and flags, in the fewest whole bytes. Sections
+    carry precomputed indexes in the format of their cache file, keyed by
+    tag (e.g. FactorIndex.SECTION).
+    """
+    letters: np.ndarray                 # Code point of each node (uint32)
+    info: np.ndarray                    # Encoded node information (uint32)
+    version: int = 1
+    alphabet: Optional[List[str]] = None         # Letters of the DAWG, v2 only
+    number_of_words: Optional[int] = None        # v2 only
+    sections: Dict[bytes, bytes] = field(default_factory=dict)
+
+def read_node_table(data: BytesIO) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    @brief Read the node table of a DAWG. A v1 table, as generated by
+    compress.js, is read with a single np.frombuffer call.
+
+    @param data: the DAWG data, v1 or v2
+    @return: Tuple of (code points, encoded node information); for v1,
+             big-endian uint32 views of the data
+    """
+    dawg = read_dawg_file(data)
+    return dawg.letters, dawg.info
+
+def read_dawg_file(data: BytesIO) -> DawgFile:
+    """
+    @brief Read a `.dict` file of either version.
+
+    @param data: the DAWG data
+    @return: its content
+    """
+    head = data.read(4)
+    if head == DAWG_MAGIC:
+        return parse_dawg_v2(head + data.read())
+    number_of_nodes = int.from_bytes(head, 'big')
+    table = np.frombuffer(data.read(number_of_nodes * 8), dtype='>u4')
+    if len(table) != number_of_nodes * 2:
+        raise ValueError(f"Dictionary: truncated DAWG, expected {number_of_nodes} nodes")
+    return DawgFile(table[0::2], table[1::2])
+
+def parse_dawg_v2(buffer, decode_table: bool = True) -> DawgFile:
+    """
+    @brief Parse a v2 `.dict` file held in memory, checking its CRC.
+
+    @param buffer: the whole file (bytes or a read-only mmap)
+    @param decode_table: decode the node records; if false, letters and info are left empty
+    @return: its content
+    """
+    if len(buffer) < 8 or buffer[0:4] != DAWG_MAGIC:
+        raise ValueError("Dictionary: not a v2 DAWG")
+    version = int.from_bytes(buffer[4:6], 'big')
+    if version != DAWG_VERSION:
+        raise ValueError(f"Dictionary: unsupported DAWG version {version}")
+    if len(buffer) < 12 or zlib.crc32(memoryview(buffer)[:-4]) != int.from_bytes(buffer[-4:], 'big'):
+        raise ValueError("Dictionary: DAWG checksum mismatch, the file is corrupt or truncated")
+
+    offset = 8
+    def read_int(size: int) -> int:
+        nonlocal offset
+        value = int.from_bytes(buffer[offset:offset + size], 'big')
+        offset += size
+        return value
+
+    alphabet_size = read_int(2)
+    code_points = np.frombuffer(buffer, dtype='>u4', count=alphabet_size, offset=offset).astype(np.uint32)
+    offset += alphabet_size * 4
+    number_of_words = read_int(4)
+    number_of_nodes = read_int(4)
+    letter_bits = read_int(1)
+    child_bits = read_int(1)
+    record_size = (letter_bits + child_bits + 2 + 7) // 8
+
+    letters = np.zeros(0, dtype=np.uint32)
+    info = np.zeros(0, dtype=np.uint32)
+    if decode_table and number_of_nodes > 0:
+        raw = np.frombuffer(buffer, dtype=np.uint8, count=number_of_nodes * record_size, offset=offset)
+        raw = raw.reshape(number_of_nodes, record_size)
+        records = np.zeros(number_of_nodes, dtype=np.uint64)
+        for k in range(record_size):
+            records = (records << np.uint64(8)) | raw[:, k]
+        info = (records & np.uint64((1 << (child_bits + 2)) - 1)).astype(np.uint32)
+        indices = (records >> np.uint64(child_bits + 2)).astype(np.intp)
+        if indices.max() >= alphabet_size:
+            raise ValueError("Dictionary: DAWG letter index out of its alphabet")
+        letters = code_points[indices]
+    offset += number_of_nodes * record_size
+
+    sections: Dict[bytes, bytes] = {}
+    for _ in range(read_int(2)):
+        tag = bytes(buffer[offset:offset + 4])
+        offset += 4
+        length = read_int(4)
+        sections[tag] = bytes(buffer[offset:offset + length])
+        offset += length
+
+    return DawgFile(letters, info, version, [chr(c) for c in code_points.tolist()], number_of_words, sections)
+
+def write_node_table(letters: np.ndarray, info: np.ndarray) -> bytes:
+    """
+    @brief Encode a node table in the v1 format.
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @return: the DAWG data
+    """
+    table = np.empty(len(letters) * 2, dtype='>u4')
+    table[0::2] = letters
+    table[1::2] = info
+    return len(letters).to_bytes(4, 'big') + table.tobytes()
+
+def write_dawg_file(letters: np.ndarray, info: np.ndarray, number_of_words: int,
+                    sections: Optional[Dict[bytes, bytes]] = None) -> bytes:
+    """
+    @brief Encode a node table in the v2 format (see DawgFile).
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @param number_of_words: number of words in the DAWG
+    @param sections: payload of each optional section, by 4-byte tag
+    @return: the DAWG data
+    """
+    code_points, indices = np.unique(np.asarray(letters, dtype=np.uint32), return_inverse=True)
+    info = np.asarray(info, dtype=np.uint64)
+    child = (info >> np.uint64(LetterNode.CHILD_INDEX_SHIFT)) & np.uint64(LetterNode.CHILD_INDEX_BIT_MASK)
+    letter_bits = max(1, (len(code_points) - 1).bit_length())
+    child_bits = max(1, int(child.max()).bit_length() if len(child) > 0 else 1)
+    record_size = (letter_bits + child_bits + 2 + 7) // 8
+
+    records = (indices.astype(np.uint64) << np.uint64(child_bits + 2)) | info
+    raw = np.empty((len(records), record_size), dtype=np.uint8)
+    for k in range(record_size):
+        raw[:, k] = (records >> np.uint64(8 * (record_size - 1 - k))) & np.uint64(0xFF)
+
+    out = BytesIO()
+    out.write(DAWG_MAGIC)
+    out.write(DAWG_VERSION.to_bytes(2, 'big'))
+    out.write((0).to_bytes(2, 'big'))
+    out.write(len(code_points).to_bytes(2, 'big'))
+    out.write(code_points.astype('>u4').tobytes())
+    out.write(number_of_words.to_bytes(4, 'big'))
+    out.write(len(records).to_bytes(4, 'big'))
+    out.write(bytes([letter_bits, child_bits]))
+    out.write(raw.tobytes())
+    sections = sections or {}
+    out.write(len(sections).to_bytes(2, 'big'))
+    for tag, payload in sections.items():
+        if len(tag) != 4:
+            raise ValueError(f"Dictionary: section tag {tag!r} is not 4 bytes long")
+        out.write(tag)
+        out.write(len(payload).to_bytes(4, 'big'))
+        out.write(payload)
+    data = out.getvalue()
+    return data + zlib.crc32(data).to_bytes(4, 'big')
+
+def read_dawg_section(path: str, tag: bytes) -> Optional[bytes]:
+    """
+    @brief Read an optional section of a `.dict` file without decoding its node table.
+
+    @param path: path of the `.dict` file
+    @param tag: 4-byte tag of the section
+    @return: payload of the section, None for a v1 file or a missing section
+    """
+    with open(path, 'rb') as f:
+        if f.read(4) != DAWG_MAGIC:
+            return None
+        f.seek(0)
+        return parse_dawg_v2(f.read(), decode_table=False).sections.get(tag)
+
+def decode_node_table(letters: np.ndarray, info: np.ndarray) -> NodeTable:
+    """
+    @brief Vectorized equivalent of LetterNode.decode over a whole node table.
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @return: decoded node table
+    """
+    info = info.astype(np.uint32)
+    return NodeTable(
+        letters=letters.astype(np.uint32),
+        is_end_of_word=(info & LetterNode.END_OF_WORD_BIT_MASK) != 0,
+        is_end_of_list=(info & LetterNode.END_OF_LIST_BIT_MASK) != 0,
+        child=(info >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK)
+
+def decode_dawg(data: BytesIO) -> NodeTable:
+    """
+    @brief Read and decode the node table of a DAWG.
+
+    @param data: the DAWG data
+    @return: decoded node table
+    """
+    return decode_node_table(*read_node_table(data))
@@ -1,8 +1,18 @@
+import gc
 from io import BytesIO
-from typing import List, Callable, Dict, Optional
+from typing import List, Callable, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
 from collections import defaultdict
 
+import numpy as np
+
 from .letter_node import LetterNode
+from .dawg_codec import decode_dawg
+from .anagram import find_anagrams_in_nodes
+from .word_iterator import WordFilter, iter_words_in_nodes
+from .pattern import Pattern, match_in_nodes
+
+if TYPE_CHECKING:
+    from .factor_index import FactorIndex
 
 class Dictionary:
     """
@@ -15,7 +25,6 @@ class Dictionary:
     alphabet of code points sorted in the same order as that used to
     generate the DAWG.
     """
-    cache = []  # Cache of dictionaries
 
     def __init__(self, name: str):
         """
@@ -24,34 +33,62 @@ class Dictionary:
         self.root: LetterNode = None  # First node in the dictionary
         self.sequence_roots: Dict[chr, List[LetterNode]] = None  # List of valid start points
         self.name: str = name  # Name of the dictionary
+        self.frozen: bool = False  # Is the dictionary shared and read-only?
+        self.factor_index: Optional['FactorIndex'] = None  # Index of every sequence found in a word
+        self.linked: bool = False  # Have the pre-/post- links been built?
+        self.link_counts: Optional[Dict[int, int]] = None  # Number of `child` and `next` links to each node, by id
 
     def load_dawg(self, data: BytesIO) -> 'Dictionary':
         """
-        @brief Load a DAWG, as generated by dictionary_compressor.js.
+        @brief Load a DAWG, as generated by dictionary_compressor.js (v1)
+        or externals.dictionary.compile (v1 or v2).
         @description  This is destructive; anything already in the 
         dictionary will be discarded.
         
         @param data: the DAWG data.
         @return: this
         """
-        number_of_nodes = int.from_bytes(data.read(4), 'big')
+        self._check_mutable()
+        table = decode_dawg(data)
 
-        nodes = []
+        # The cyclic garbage collector would otherwise run over and over
+        # while hundreds of thousands of nodes are being allocated
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            nodes = list(map(LetterNode, map(chr, table.letters.tolist())))
 
-        for i in range(number_of_nodes):
-            letter = int.from_bytes(data.read(4), 'big')
-            node = LetterNode(chr(letter))
-            node.decode(i, int.from_bytes(data.read(4), 'big'))
-            nodes.append(node)
+            for i in np.flatnonzero(table.is_end_of_word).tolist():
+                nodes[i].isEndOfWord = True
 
-        # Convert node indices to pointers
-        for i, node in enumerate(nodes):
-            if isinstance(node.next, int):
-                node.next = nodes[node.next]
-            if isinstance(node.child, int):
-                node.child = nodes[node.child]
+            # Convert node indices to pointers
+            for i in np.flatnonzero(~table.is_end_of_list).tolist():
+                nodes[i].next = nodes[i + 1]
+            children = np.flatnonzero(table.child)
+            for i, child in zip(children.tolist(), table.child[children].tolist()):
+                nodes[i].child = nodes[child]
+        finally:
+            if gc_enabled:
+                gc.enable()
 
-        self.root = nodes[0]
+        self.root = nodes[0] if len(nodes) > 0 else None
+        self.sequence_roots = None
+        self.factor_index = None
+        self.linked = False
+        self.link_counts = None
+        return self
+
+    def set_factor_index(self, factor_index: Optional['FactorIndex']) -> 'Dictionary':
+        """
+        @brief Use a factor index, built from the same words, to answer
+        has_sequence in time proportional to the length of the sequence.
+        It is dropped as soon as a word is added.
+
+        @param factor_index: the factor index, None to go back to sequence roots
+        @return: this
+        """
+        self._check_mutable()
+        self.factor_index = factor_index
         return self
     
     def add_links(self) -> 'Dictionary':
@@ -63,8 +100,30 @@ class Dictionary:
         """
         if self.root is not None:
             self.root.build_lists()
+        self.linked = True
         return self
 
+    def freeze(self) -> 'Dictionary':
+        """
+        @brief Mark the dictionary as read-only so it can be shared, e.g.
+        by DictionaryRegistry. Links and sequence roots are built now,
+        since they can no longer be invalidated.
+
+        @return: this
+        """
+        self.add_links()
+        if self.sequence_roots is None:
+            self.create_sequence_roots()
+        self.frozen = True
+        return self
+
+    def _check_mutable(self) -> None:
+        """
+        @brief Raise if the dictionary has been frozen.
+        """
+        if self.frozen:
+            raise ValueError(f"Dictionary: '{self.name}' is frozen and cannot be modified")
+
     def each_word(self, callback: callable):
         """
         @brief Apply the callback to each of the words represented in the DAWG
@@ -72,8 +131,33 @@ class Dictionary:
 
         @param callback: function
         """
-        if self.root is not None:
-            return self.root.each_word("", callback)
+        for word in self.iter_words():
+            callback(word)
+
+    def iter_words(self, prefix: str = "", min_len: int = 0, max_len: Optional[int] = None,
+                   letters: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """
+        @brief Generate the words of the DAWG in sorted order, one at a
+        time as they are consumed, without recursion.
+
+        @param prefix: only words starting with the prefix
+        @param min_len: only words of at least min_len letters
+        @param max_len: only words of at most max_len letters, None for any length
+        @param letters: only words made of these letters, None for any letter
+        @return: generator of the words
+        """
+        word_filter = WordFilter(prefix, min_len, max_len, letters)
+        if self.root is None or not word_filter.accepts_prefix():
+            return
+        first = self.root
+        if len(prefix) > 0:
+            node = self.match(prefix)
+            if node is None:
+                return
+            if node.isEndOfWord and word_filter.accepts_word(prefix):
+                yield prefix
+            first = node.child
+        yield from iter_words_in_nodes(first, word_filter)
 
     def match(self, chars: str) -> (LetterNode | None):
         """
@@ -98,6 +182,38 @@ class Dictionary:
         m = self.root.match(chars, 0) if self.root is not None else None
         return m is not None and m.isEndOfWord
 
+    def has_words(self, words: List[str]) -> List[bool]:
+        """
+        @brief Check a batch of words. The words are sorted and deduplicated
+        so that each one only walks the letters it does not share with the
+        word checked before it.
+
+        @param words: words to check
+        @return: for each word, true if it is found
+        """
+        found: Dict[str, bool] = {}
+        path: List[LetterNode] = []  # Nodes matching the first letters of the previous word
+        previous = ""
+        for word in sorted(set(words)):
+            common = 0
+            limit = min(len(word), len(path))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            del path[common:]
+
+            node = path[-1].child if path else self.root
+            for letter in word[common:]:
+                while node is not None and node.letter != letter:
+                    node = node.next
+                if node is None:
+                    break
+                path.append(node)
+                node = node.child
+
+            found[word] = len(word) > 0 and len(path) == len(word) and path[-1].isEndOfWord
+            previous = word
+        return [found[word] for word in words]
+
     def find_anagrams(self, the_chars: str) -> List[str]:
         """
         @brief Find anagrams of a set of letters. An anagram is defined as any
@@ -112,12 +228,7 @@ class Dictionary:
         if len(the_chars) < 2:
             raise ValueError(f"Dictionary: '{the_chars}' is too short to find anagrams")
         
-        # Sort the list of characters for easier debugging
-        ac = list(the_chars)
-        found_words = {}
-        if self.root is not None:
-            self.root.find_words_that_use(ac, "", "", found_words)
-        return found_words
+        return find_anagrams_in_nodes(self.root, the_chars)
 
     def find_hangmen(self, the_chars: str) -> List[str]:
         """
@@ -129,11 +240,21 @@ class Dictionary:
         @param the_chars: the letters, ' ' for an any-letter wildcard.
         @return: the list of words that matched.
         """
-        the_chars = the_chars.upper()
-        list_of_matches = []
-        if self.root is not None:
-            self.root.hangmen(the_chars, 0, "", list_of_matches)
-        return list_of_matches
+        return list(match_in_nodes(self.root, Pattern.hangman(the_chars)))
+
+    def find_pattern(self, pattern: str | Pattern, min_len: int = 0, max_len: Optional[int] = None) -> Iterator[str]:
+        """
+        @brief Generate, in sorted order, the words matching a pattern such
+        as "?AT*", "[AEIOU]?S" or "Q?{2,5}" (see Pattern for the syntax).
+
+        @param pattern: the pattern, as text or compiled
+        @param min_len: only words of at least min_len letters
+        @param max_len: only words of at most max_len letters, None for any length
+        @return: generator of the words
+        """
+        if not isinstance(pattern, Pattern):
+            pattern = Pattern(pattern)
+        return match_in_nodes(self.root, pattern, min_len, max_len)
 
     def create_sequence_roots(self) -> None:
         """
@@ -167,43 +288,199 @@ class Dictionary:
             self.create_sequence_roots()
         return self.sequence_roots.get(ch, [])
 
-    def _add_word(self, word: str) -> bool:
+    def get_letters(self) -> List[str]:
         """
-        @brief Do the work of adding a word, but don't do anything about
-        pre-/post- links or sequence roots.
+        @brief Letters used by the words of the dictionary, sorted.
+        """
+        if self.sequence_roots is None:
+            self.create_sequence_roots()
+        return sorted(self.sequence_roots)
 
-        @param word: Word to be added to the root
-        @return: true if word added to the root, false otherwise
+    def __count_links(self) -> Dict[int, int]:
         """
-        if len(word) == 0:
-            return False
-        if self.root is None:
-            self.root = LetterNode(word[0])
-        elif self.has_word(word):
-            return False
-        
-        self.root.add(word)
-        return True
+        @brief Count the `child` and `next` links to each node of the DAWG, by id.
+        """
+        refs: Dict[int, int] = defaultdict(int)
+        # Every node is visited once, whatever the number of paths to it
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            for linked in (node.child, node.next):
+                if linked is not None:
+                    refs[id(linked)] += 1
+                    if refs[id(linked)] == 1:
+                        stack.append(linked)
+        return refs
+
+    def __unlink(self, node: LetterNode, orphans: List[LetterNode]) -> None:
+        """
+        @brief Remove a link to a node, and the links from the nodes no longer reachable.
+
+        @param node: node that lost a link
+        @param orphans: list the nodes no longer reachable are added to
+        """
+        refs = self.link_counts
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            refs[id(node)] -= 1
+            if refs[id(node)] == 0:
+                del refs[id(node)]
+                orphans.append(node)
+                stack.extend(linked for linked in (node.child, node.next) if linked is not None)
+
+    def __own_chain(self, parent: Optional[LetterNode], created: List[LetterNode],
+                    orphans: List[LetterNode]) -> Optional[LetterNode]:
+        """
+        @brief Make sure the child chain of a node on a path reached from the
+        root only, or the root chain, shares no node with any other chain,
+        copying it if it does, so that it can be changed without adding
+        words below other nodes. Chains may share the nodes of their tails.
 
-    def add_word(self, word: str):
+        @param parent: node whose child chain is about to change, None for the root chain
+        @param created: list the copied nodes are added to
+        @param orphans: list the nodes no longer reachable are added to
+        @return: first node of the chain
         """
-        @brief Add a word to the dictionary. No attempt is made at compression.
-        Note that previously retrieved sequence roots will no longer
-        be valid after the word is added and will need to be recomputed.
+        first = self.root if parent is None else parent.child
+        refs = self.link_counts
+        node = first
+        shared = first is not None and refs[id(first)] > (0 if parent is None else 1)
+        while node is not None and not shared:
+            node = node.next
+            shared = node is not None and refs[id(node)] > 1
+        if not shared:
+            return first
+
+        copies: List[LetterNode] = []
+        node = first
+        while node is not None:
+            copy = LetterNode(node.letter)
+            copy.isEndOfWord = node.isEndOfWord
+            copy.child = node.child
+            if copy.child is not None:
+                refs[id(copy.child)] += 1
+            if self.linked:
+                copy.preNodes = node.preNodes[:] if parent is None else [parent]
+                copy.preLetters = node.preLetters[:] if parent is None else [parent.letter]
+                copy.postNodes = node.postNodes[:]
+                copy.postLetters = node.postLetters[:]
+                # The node may be about to be released, the copy is as good a way back
+                for post in copy.postNodes:
+                    if post.preNodes and post.preNodes[0] is node:
+                        post.preNodes[0] = copy
+            if copies:
+                copies[-1].next = copy
+            refs[id(copy)] = 1
+            copies.append(copy)
+            node = node.next
+
+        # The copies link to the children first, so that they are not released
+        if parent is None:
+            self.root = copies[0]
+            refs[id(copies[0])] = 0
+            refs[id(first)] = 1  # The old root, as if linked from the root
+            self.__unlink(first, orphans)
+        else:
+            self.__unlink(first, orphans)
+            parent.child = copies[0]
+            if self.linked:
+                parent.postNodes = copies[:]
+                parent.postLetters = [copy.letter for copy in copies]
+        created.extend(copies)
+        return copies[0]
+
+    def __insert(self, word: str, created: List[LetterNode], orphans: List[LetterNode]) -> None:
+        """
+        @brief Add a word that is not in the dictionary, sharing no node
+        changed on its path with any other path.
+
+        @param word: word to be added
+        @param created: list the new and copied nodes are added to
+        @param orphans: list the nodes no longer reachable are added to
+        """
+        refs = self.link_counts
+        parent: Optional[LetterNode] = None
+        for letter in word:
+            first = self.__own_chain(parent, created, orphans)
+
+            # Chains are sorted by letter
+            before: Optional[LetterNode] = None
+            node = first
+            position = 0
+            while node is not None and node.letter < letter:
+                before, node = node, node.next
+                position += 1
+            if node is None or node.letter != letter:
+                new = LetterNode(letter)
+                new.next = node
+                refs[id(new)] = 1
+                if before is not None:
+                    before.next = new
+                elif parent is None:
+                    self.root = new
+                    refs[id(new)] = 0
+                    if node is not None:
+                        refs[id(node)] += 1
+                else:
+                    parent.child = new
+                if self.linked and parent is not None:
+                    new.preNodes = [parent]
+                    new.preLetters = [parent.letter]
+                    parent.postNodes.insert(position, new)
+                    parent.postLetters.insert(position, letter)
+                created.append(new)
+                node = new
+            parent = node
+        parent.isEndOfWord = True
+
+    def add_words(self, words: Iterable[str]) -> int:
+        """
+        @brief Add words to the dictionary. No attempt is made at compression.
+        @description The DAWG shares the nodes of common suffixes, so the
+        chains changed on the path of a new word are first copied if other
+        nodes link to them. Pre-/post- links are built over the whole
+        dictionary the first time only: afterwards they, and the sequence
+        roots if created, are only updated on the nodes added or copied.
+        The factor index is dropped since it does not hold the new sequences.
         Note that we support single character words here, but
         word games are limited to 2 letter or more. It's up to
         the caller to enforce such constraints.
 
+        @param words: words to be added, in any order
+        @return: number of words that needed to be added
+        """
+        self._check_mutable()
+        words = [word for word in dict.fromkeys(words) if len(word) > 0]
+        words = [word for word, found in zip(words, self.has_words(words)) if not found]
+        if len(words) == 0:
+            return 0
+
+        if self.link_counts is None:
+            self.link_counts = self.__count_links()
+        created: List[LetterNode] = []
+        orphans: List[LetterNode] = []
+        for word in words:
+            self.__insert(word, created, orphans)
+
+        if self.sequence_roots is not None:
+            for node in created:
+                self.sequence_roots.setdefault(node.letter, []).append(node)
+            unreachable = {id(node) for node in orphans}
+            for letter in {node.letter for node in orphans}:
+                self.sequence_roots[letter] = [node for node in self.sequence_roots[letter] if id(node) not in unreachable]
+        if not self.linked:
+            self.add_links()
+        self.factor_index = None
+        return len(words)
+
+    def add_word(self, word: str) -> bool:
+        """
+        @brief Add a word to the dictionary (see add_words).
+
         @return: true if the word needed to be added, false if it was empty or already there.
         """
-        if self._add_word(word):
-            # Don't recreate, that will be done on demand
-            self.sequence_roots = None
-            
-            if self.root is not None:
-                self.root.build_lists()
-            return True
-        return False
+        return self.add_words([word]) == 1
 
     def find_sequence(self, seq: str) -> Optional['LetterNode']:
         """
@@ -219,6 +496,9 @@ class Dictionary:
         @param seq: letter sequence
         @return: node found, or undefined 
         """
+        if self.factor_index is not None and not self.has_sequence(seq):
+            return None
+
         if self.sequence_roots is None:
             self.create_sequence_roots()
         
@@ -244,4 +524,10 @@ class Dictionary:
         @param seq: letter sequence
         @return: true if a start node exists
         """
+        if self.factor_index is not None:
+            if self.factor_index.has_sequence(seq):
+                return True
+            if not self.factor_index.has_letter(seq[0]):
+                raise ValueError(f"Dictionary: '{seq}' has no roots")
+            return False
         return self.find_sequence(seq) is not None
@@ -0,0 +1,37 @@
+"""
+@brief Explore a dictionary for many words at once over a pool of processes.
+Each input line is one word, rack or pattern; each output line is the input,
+a tab, and the words found for it separated by spaces, in input order.
+
+Usage:
+    python -m externals.dictionary.explore anagrams dictionaries/CSW2021_English.dict racks.txt
+    python -m externals.dictionary.explore patterns dictionaries/CSW2021_English.dict - --workers 4 < patterns.txt
+"""
+import sys
+import argparse
+from typing import List
+
+from .explorer import Explorer
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m externals.dictionary.explore", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=sorted(Explorer.MODES))
+    parser.add_argument("dictionary", help="path of the .dict file")
+    parser.add_argument("input", help="file of words, one per line, - for standard input")
+    parser.add_argument("--workers", type=int, default=None, help="number of processes, all CPUs by default")
+    parser.add_argument("--chunk-size", type=int, default=256, help="number of words sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, 'r', encoding='utf-8-sig')
+    try:
+        words = (line.strip() for line in source if line.strip())
+        for word, found in Explorer.batch(args.dictionary, args.mode, words, args.workers, args.chunk_size):
+            print(f"{word}\t{' '.join(found)}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
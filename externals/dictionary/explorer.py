@@ -1,5 +1,42 @@
-from typing import List
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
 from .dictionary import Dictionary
+from .packed_dictionary import PackedDictionary
+from .factor_index import FactorIndex
+from .pattern import Pattern
+
+# Dictionary of a batch worker process, mapped once by init_batch_worker
+_batch_dictionary: Optional[PackedDictionary] = None
+
+def init_batch_worker(dict_path: str) -> None:
+    """
+    @brief Map the dictionary of a batch worker process. The node table and
+    the factor index are memory-mapped, so every worker shares their pages
+    instead of receiving a copy.
+    """
+    global _batch_dictionary
+    _batch_dictionary = PackedDictionary(os.path.basename(dict_path)).load_mmap(dict_path)
+    _batch_dictionary.set_factor_index(FactorIndex.load_or_build(dict_path))
+
+def explore_batch_chunk(mode: str, words: List[str]) -> List[List[str]]:
+    """
+    @brief Explore the dictionary of the worker for each word of a chunk.
+    @return: the words reported for each word, none if it was rejected with a ValueError
+    """
+    explore = Explorer.MODES[mode]
+    results: List[List[str]] = []
+    for word in words:
+        found: List[str] = []
+        try:
+            explore(_batch_dictionary, [word], found.append)
+        except ValueError:
+            found = []
+        results.append(found)
+    return results
 
 class Explorer:
     """
@@ -18,7 +55,7 @@ class Explorer:
         will be called each time a matching word is found, passing the word
         as a string.
         """
-        if not isinstance(dictionary, Dictionary):
+        if not isinstance(dictionary, (Dictionary, PackedDictionary)):
             raise ValueError("Not a Dictionary")
         
         for word in words:
@@ -60,8 +97,25 @@ class Explorer:
             raise ValueError("Need letters to find hangman matches for")
 
         for word in words:
-            matches = dictionary.find_hangmen(word.replace('.', ' '))
-            for w in matches:
+            for w in dictionary.find_pattern(Pattern.hangman(word.replace('.', ' '))):
+                report(w)
+
+    @staticmethod
+    def patterns(dictionary: Dictionary, words: str, report: callable):
+        """
+        @brief Find words that match patterns such as `?AT*`, `[AEIOU]?S`
+        or `Q?{2,5}` (see Pattern for the syntax).
+        @param dictionary dawg to explore
+        @param words list of patterns to check
+        @param report reporter function(word). This function
+        will be called each time a matching word is found, passing the word
+        as a string.
+        """
+        if not words or len(words) == 0:
+            raise ValueError("Need patterns to find matches for")
+
+        for word in words:
+            for w in dictionary.find_pattern(word):
                 report(w)
     
     @staticmethod
@@ -95,20 +149,73 @@ class Explorer:
                        will be called once for each word in the dictionary.
         """
         if not words or len(words) == 0:
-            dictionary.each_word(lambda word: report(word))
+            for word in dictionary.iter_words():
+                report(word)
             return
         
         biglist = set()
         for word in words:
             word = word.upper()
-            node = dictionary.match(word)
-            if node:
-                root = {'word': word, 'node': node}
-                list_ = []
-                biglist.add(root['word'])
-                root['node'].child.eachWord(root['word'], lambda w: list_.append(w))
-
-                list_ = [w for w in list_ if w not in biglist]
-                for w in list_:
+            biglist.add(word)
+            for w in dictionary.iter_words(prefix=word, min_len=len(word) + 1):
+                if w not in biglist:
                     biglist.add(w)
                     report(w)
+
+    # Exploration of each batch mode, called with (dictionary, [word], report)
+    MODES = {
+        "sequences": sequences,
+        "anagrams": anagrams,
+        "hangmen": hangmen,
+        "patterns": patterns,
+        "arrangements": arrangements,
+        "list": list,
+    }
+
+    @staticmethod
+    def batch(dict_path: str, mode: str, words: Iterable[str], workers: Optional[int] = None,
+              chunk_size: int = 256) -> Iterator[Tuple[str, List[str]]]:
+        """
+        @brief Explore a dictionary for many words over a pool of processes.
+        @description The words are sent to the workers in chunks, and each
+        worker maps the `.dict` file and its factor index, built beforehand
+        if needed, once (see init_batch_worker) rather than being sent the
+        dictionary. Results are generated in the order
+        of the words as soon as they are ready, with a bounded number of
+        chunks in flight, so the words may come from an unbounded stream.
+
+        @param dict_path: path of the `.dict` file
+        @param mode: one of MODES
+        @param words: words to explore, each on its own, e.g. racks for `anagrams`
+        @param workers: number of processes, os.cpu_count() if None; 1 explores in this process
+        @param chunk_size: number of words sent to a worker at a time
+        @return: generator of (word, words reported for it); a word rejected
+                 with a ValueError, such as a one-letter rack, reports nothing
+        """
+        if mode not in Explorer.MODES:
+            raise ValueError(f"Unknown exploration mode '{mode}'")
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}")
+        workers = workers or os.cpu_count() or 1
+        words = iter(words)
+        chunks = iter(lambda: list(islice(words, chunk_size)), [])
+
+        if workers == 1:
+            init_batch_worker(dict_path)
+            for chunk in chunks:
+                yield from zip(chunk, explore_batch_chunk(mode, chunk))
+            return
+
+        # Build the factor index once, before the workers start, so that they only map the saved file
+        FactorIndex.load_or_build(dict_path)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                 initargs=(dict_path,)) as executor:
+            pending: Deque[Tuple[List[str], Future]] = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(explore_batch_chunk, mode, chunk)))
+                if len(pending) >= workers * 2:
+                    chunk, future = pending.popleft()
+                    yield from zip(chunk, future.result())
+            while pending:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
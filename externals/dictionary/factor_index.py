@@ -0,0 +1,55 @@
+from typing import Iterable
+
+from .dawg_builder import DawgBuilder
+from .cached_automaton import CachedAutomaton
+
+class FactorIndex(CachedAutomaton):
+    """
+    @class FactorIndex
+    @brief Factor automaton of a word list: it has a path for every
+    sequence of letters found anywhere in a word.
+
+    @description Built as the minimal prefix-closed automaton of all word
+    suffixes, so `has_sequence` is a single walk from the root chain and
+    takes time proportional to the length of the sequence, however many
+    nodes of the dictionary hold its first letter. It is cached next to the
+    dictionary as a `.factors` file.
+    """
+
+    EXTENSION = '.factors'
+    SECTION = b'FACT'
+
+    def build(self, words: Iterable[str]) -> 'FactorIndex':
+        """
+        @brief Build the factor automaton of a word list.
+        @description Suffixes are built one first letter at a time to avoid
+        holding every suffix of the word list in memory at once.
+
+        @param words: words to be added, in any order
+        @return: this
+        """
+        words = sorted(set(words))
+        builder = DawgBuilder(prefix_closed=True)
+        for first in sorted({ch for word in words for ch in word}):
+            suffixes = set()
+            for word in words:
+                i = word.find(first)
+                while i >= 0:
+                    suffixes.add(word[i:])
+                    i = word.find(first, i + 1)
+            builder.add_all(sorted(suffixes))
+        letters, info = builder.encode()
+        return self._set_table(letters, info)
+
+    def has_letter(self, letter: str) -> bool:
+        """
+        @brief Does the letter appear in any word?
+        """
+        return len(self.letters) > 0 and self.match_index(letter) >= 0
+
+    def has_sequence(self, seq: str) -> bool:
+        """
+        @brief Does the sequence appear in any word?
+        @param seq: letter sequence
+        """
+        return len(self.letters) > 0 and self.match_index(seq) >= 0
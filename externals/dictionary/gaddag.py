@@ -0,0 +1,100 @@
+from typing import Iterable, List, Tuple
+
+from .letter_node import LetterNode
+from .dawg_builder import DawgBuilder
+from .cached_automaton import CachedAutomaton
+
+class Gaddag(CachedAutomaton):
+    """
+    @class Gaddag
+    @brief GADDAG (Gordon, 1994) of a word list, held as a packed node table.
+
+    @description For every word `xy` with a non-empty prefix `x`, the GADDAG
+    holds the path `REV(x) SEPARATOR y`, and `REV(w)` for the word itself.
+    A move generator can therefore start at any letter of a word, read the
+    letters to its left backwards, cross the separator and read the letters
+    to its right: one traversal per anchor covers every word through it.
+
+    The automaton is minimized with DawgBuilder and cached next to the
+    dictionary as a `.gaddag` file.
+    """
+
+    SEPARATOR = '^'    # Marks the change from going left to going right
+    EXTENSION = '.gaddag'
+    SECTION = b'GADD'
+
+    @staticmethod
+    def paths_of(word: str) -> List[str]:
+        """
+        @brief GADDAG paths of a word.
+        """
+        paths = [word[::-1]]
+        for i in range(1, len(word)):
+            paths.append(word[i - 1::-1] + Gaddag.SEPARATOR + word[i:])
+        return paths
+
+    def build(self, words: Iterable[str]) -> 'Gaddag':
+        """
+        @brief Build the GADDAG of a word list.
+        @description Paths start with the letter they are anchored on, so
+        they are built one first letter at a time to avoid holding every
+        path of the word list in memory at once.
+
+        @param words: words to be added, in any order
+        @return: this
+        """
+        words = sorted(set(words))
+        builder = DawgBuilder()
+        for first in sorted({ch for word in words for ch in word}):
+            paths = set()
+            for word in words:
+                if first in word:
+                    paths.update(path for path in Gaddag.paths_of(word) if path[0] == first)
+            builder.add_all(sorted(paths))
+        letters, info = builder.encode()
+        return self._set_table(letters, info)
+
+    def find(self, chain: int, letter: str) -> int:
+        """
+        @brief Find the node of a letter in a sibling chain.
+
+        @param chain: index of the first node of the chain, 0 for the root chain
+        @param letter: letter to find
+        @return: index of the node, -1 if not found
+        """
+        if len(self.letters) == 0:
+            return -1
+        return self.match_index(letter, 0, chain)
+
+    def arcs(self, chain: int) -> List[Tuple[str, int]]:
+        """
+        @brief Letters and node indices of a sibling chain.
+
+        @param chain: index of the first node of the chain, 0 for the root chain
+        """
+        letters = self.letters
+        info = self.info
+        out: List[Tuple[str, int]] = []
+        if len(letters) == 0:
+            return out
+        i = chain
+        while True:
+            out.append((chr(letters.item(i)), i))
+            if info.item(i) & LetterNode.END_OF_LIST_BIT_MASK:
+                return out
+            i += 1
+
+    def is_end_of_word(self, i: int) -> bool:
+        """
+        @brief Does the path ending at node i spell a word?
+        """
+        return bool(self.info.item(i) & LetterNode.END_OF_WORD_BIT_MASK)
+
+    def has_word(self, chars: str) -> bool:
+        """
+        @brief Is the word in the GADDAG? Follows the path `REV(chars)`.
+        """
+        if len(self.letters) == 0 or len(chars) == 0:
+            return False
+        i = self.match_index(chars[::-1])
+        return i >= 0 and self.is_end_of_word(i)
@@ -0,0 +1,86 @@
+from typing import Dict, Tuple
+
+from .letter_index import LetterIndex
+
+class HookIndex:
+    """
+    @class HookIndex
+    @brief Letters that complete a word, or a sequence, between a left and
+    a right fragment, as masks of a LetterIndex.
+
+    @description This is what a board cross-check asks: which letters L
+    make `left + L + right` a word. For words of up to max_length letters
+    the answers are precomputed from the dictionary: each word w gives the
+    letter w[i] to the pair (w[:i], w[i+1:]), which includes its front
+    hook ("", w[1:]) and back hook (w[:-1], ""). Pairs of longer fragments
+    are answered with one has_words call for all the letters, and
+    remembered. Sequences (see has_sequence) are only remembered.
+    """
+
+    def __init__(self, dictionary, letter_index: LetterIndex, max_length: int = 4, capacity: int = 65536):
+        """
+        @param dictionary: dictionary offering iter_words, has_words and has_sequence
+        @param letter_index: numbering of the letters of the masks
+        @param max_length: length of the longest words whose hooks are precomputed
+        @param capacity: number of pairs remembered beyond the precomputed ones, before they are forgotten
+        """
+        self.dictionary = dictionary
+        self.letter_index: LetterIndex = letter_index
+        self.max_length: int = max_length
+        self.capacity: int = capacity
+        self.hooks: Dict[Tuple[str, str], int] = {}      # Letters completing a word of up to max_length letters
+        self.words: Dict[Tuple[str, str], int] = {}      # Letters completing a longer word, remembered
+        self.sequences: Dict[Tuple[str, str], int] = {}  # Letters completing a sequence, remembered
+
+        indices = letter_index.indices
+        hooks = self.hooks
+        for word in dictionary.iter_words(max_len=max_length):
+            for i, letter in enumerate(word):
+                index = indices.get(letter)
+                if index is not None:
+                    key = (word[:i], word[i + 1:])
+                    hooks[key] = hooks.get(key, 0) | 1 << index
+
+    def word_mask(self, left: str, right: str) -> int:
+        """
+        @brief Letters L for which left + L + right is a word.
+        @param left: letters before the gap
+        @param right: letters after the gap
+        @return: mask of the letters
+        """
+        key = (left, right)
+        if len(left) + len(right) < self.max_length:
+            return self.hooks.get(key, 0)
+        mask = self.words.get(key)
+        if mask is None:
+            letters = self.letter_index.letters
+            found = self.dictionary.has_words([left + letter + right for letter in letters])
+            mask = sum(1 << i for i, is_word in enumerate(found) if is_word)
+            self.__remember(self.words, key, mask)
+        return mask
+
+    def sequence_mask(self, left: str, right: str) -> int:
+        """
+        @brief Letters L for which left + L + right is found in a word (see has_sequence).
+        @param left: letters before the gap
+        @param right: letters after the gap
+        @return: mask of the letters
+        """
+        key = (left, right)
+        mask = self.sequences.get(key)
+        if mask is None:
+            mask = 0
+            for i, letter in enumerate(self.letter_index.letters):
+                try:
+                    if self.dictionary.has_sequence(left + letter + right):
+                        mask |= 1 << i
+                except ValueError:
+                    # No word holds the first letter of the sequence
+                    pass
+            self.__remember(self.sequences, key, mask)
+        return mask
+
+    def __remember(self, masks: Dict[Tuple[str, str], int], key: Tuple[str, str], mask: int) -> None:
+        if len(masks) >= self.capacity:
+            masks.clear()
+        masks[key] = mask
@@ -0,0 +1,88 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from .letter_node import LetterNode
+
+# Node orders of a node table
+LAYOUTS = ("bfs", "dfs")
+
+def depth_first_layout(letters: np.ndarray, info: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    @brief Reorder a node table so that the chains met along a word sit
+    next to each other.
+
+    @description Chains are the runs of sibling nodes ending with an end of
+    list flag; they are moved as a whole, so a child index pointing into the
+    middle of a chain, as compress.js writes them for shared tails, stays
+    valid. Chains are laid out depth first from the root chain, and the
+    children of a chain are visited by decreasing number of words below
+    them: the path of most words then runs forward through the table
+    instead of jumping between breadth-first levels. Sibling chains stay
+    contiguous and the root chain stays at index 0.
+
+    @param letters: code point of each node
+    @param info: encoded node information (see LetterNode.decode)
+    @return: Tuple of (code points, encoded node information), reordered
+    """
+    n = len(letters)
+    if n == 0:
+        return letters, info
+    info = info.astype(np.uint32)
+    child_mask = np.uint32(LetterNode.CHILD_INDEX_BIT_MASK << LetterNode.CHILD_INDEX_SHIFT)
+    ends = np.flatnonzero(info & LetterNode.END_OF_LIST_BIT_MASK)
+    if len(ends) == 0 or ends[-1] != n - 1:
+        ends = np.append(ends, n - 1)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    chain_of = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    child = ((info >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK).tolist()
+    is_end_of_word = ((info & LetterNode.END_OF_WORD_BIT_MASK) != 0).tolist()
+    starts_list, ends_list, chain_list = starts.tolist(), ends.tolist(), chain_of.tolist()
+
+    # Number of words spelt from each node to the end of its chain, chains after the chains they point to
+    below = [0] * n
+    visited = [False] * len(starts_list)
+    stack: List[Tuple[int, bool]] = [(0, False)]
+    while stack:
+        k, expanded = stack.pop()
+        if not expanded:
+            if not visited[k]:
+                visited[k] = True
+                stack.append((k, True))
+                stack.extend((chain_list[child[i]], False) for i in range(starts_list[k], ends_list[k] + 1)
+                             if child[i] and not visited[chain_list[child[i]]])
+            continue
+        total = 0
+        for i in range(ends_list[k], starts_list[k] - 1, -1):
+            total += is_end_of_word[i] + (below[child[i]] if child[i] else 0)
+            below[i] = total
+
+    # Chains in depth first order, the child with the most words below first
+    order: List[int] = []
+    placed = [False] * len(starts_list)
+    stack = [0]
+    while stack:
+        k = stack.pop()
+        if placed[k]:
+            continue
+        placed[k] = True
+        order.append(k)
+        targets = sorted((child[i] for i in range(starts_list[k], ends_list[k] + 1) if child[i]),
+                         key=lambda c: below[c])
+        stack.extend(chain_list[c] for c in targets)
+    # Chains no word reaches are kept, after the others
+    order.extend(k for k in range(len(starts_list)) if not placed[k])
+
+    order = np.array(order)
+    lengths = (ends - starts + 1)[order]
+    new_starts = np.empty(len(starts), dtype=np.int64)
+    new_starts[order] = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    position = new_starts[chain_of] + (np.arange(n) - starts[chain_of])
+
+    children = np.array(child, dtype=np.int64)
+    moved = np.where(children > 0, position[children], 0).astype(np.uint32)
+    new_letters = np.empty_like(letters)
+    new_info = np.empty(n, dtype=np.uint32)
+    new_letters[position] = letters
+    new_info[position] = (info & ~child_mask) | (moved << np.uint32(LetterNode.CHILD_INDEX_SHIFT))
+    return new_letters, new_info
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Tuple
+
+class LetterIndex:
+    """
+    @class LetterIndex
+    @brief Dense numbering of the letters of an alphabet.
+
+    @description Letters are numbered 0..n-1 in the order they are given,
+    e.g. the order of an ALPHABET table, whatever their code points: 'Ç',
+    'Ğ' or 'İ' get small indices next to 'C', 'G' and 'I'. A set of letters
+    is then the integer whose bit i is set for letter i, so that the letters
+    allowed by a rack, a cross-check and a dictionary node are found with
+    `&` rather than by comparing strings. Letters are translated to indices
+    when they enter the engine and back when they leave it.
+    """
+
+    def __init__(self, letters: Iterable[str]):
+        """
+        @param letters: letters of the alphabet, in index order
+        """
+        self.letters: Tuple[str, ...] = tuple(dict.fromkeys(letters))  # Letter of each index
+        self.indices: Dict[str, int] = {letter: i for i, letter in enumerate(self.letters)}  # Index of each letter
+        self.full_mask: int = (1 << len(self.letters)) - 1  # Mask of every letter
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    def __contains__(self, letter: str) -> bool:
+        return letter in self.indices
+
+    def index(self, letter: str) -> int:
+        """
+        @brief Index of a letter.
+        """
+        i = self.indices.get(letter)
+        if i is None:
+            raise ValueError(f"LetterIndex: '{letter}' is not in the alphabet")
+        return i
+
+    def encode(self, word: str) -> List[int]:
+        """
+        @brief Indices of the letters of a word.
+        """
+        return [self.index(letter) for letter in word]
+
+    def decode(self, indices: Iterable[int]) -> str:
+        """
+        @brief Word spelt by a sequence of indices.
+        """
+        letters = self.letters
+        return "".join(letters[i] for i in indices)
+
+    def mask(self, letters: Iterable[str]) -> int:
+        """
+        @brief Mask of a set of letters. Letters that are not in the alphabet are ignored,
+        as none of them can be played.
+        """
+        indices = self.indices
+        out = 0
+        for letter in letters:
+            i = indices.get(letter)
+            if i is not None:
+                out |= 1 << i
+        return out
+
+    def letters_of(self, mask: int) -> List[str]:
+        """
+        @brief Letters of a mask, in index order.
+        """
+        letters = self.letters
+        out: List[str] = []
+        while mask:
+            low = mask & -mask
+            out.append(letters[low.bit_length() - 1])
+            mask ^= low
+        return out
+
+    def missing(self, letters: Iterable[str]) -> List[str]:
+        """
+        @brief Letters that are not in the alphabet, sorted.
+        """
+        return sorted(set(letters).difference(self.indices))
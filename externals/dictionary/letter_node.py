@@ -102,8 +102,8 @@ class LetterNode:
 
     def add(self, word: str) -> bool:
         """
-        @brief Add a letter sequence to this node. This is used to add
-        whitelist nodes to a DAG.
+        @brief Add a letter sequence to this node, in a tree. The nodes of a
+        DAWG are shared between words, use Dictionary.add_words there.
         
         @param word: word being added
         @return: true if the word was added, false if it was already there
@@ -0,0 +1,207 @@
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .dictionary import Dictionary
+from .gaddag import Gaddag
+from .letter_node import LetterNode
+from .packed_dictionary import PackedDictionary, PackedNode
+from .pattern import Pattern
+
+class OverlayDictionary:
+    """
+    @class OverlayDictionary
+    @brief Words added to and removed from a shared dictionary, e.g. by
+    house rules, without changing or copying it.
+
+    @description The words added are held in a small Dictionary of their
+    own, a plain trie, and the words removed in a set. Lookups ask the
+    shared dictionary and the trie and drop the removed words, so the
+    memory held by an overlay is proportional to the number of words it
+    adds and removes. Sequences are the union of those of both
+    dictionaries: the sequences of removed words are still reported,
+    which is safe as long as whole words are checked with has_word.
+    """
+
+    def __init__(self, base: Dictionary | PackedDictionary, name: Optional[str] = None):
+        """
+        @param base: shared dictionary, left unchanged
+        @param name: name of the overlay, that of the base by default
+        """
+        self.base = base
+        self.name: str = name if name is not None else base.name
+        self.added: Dictionary = Dictionary(f"{self.name}+")  # Words added, none of them in base
+        self.removed: Set[str] = set()                         # Words of base or added that are no longer valid
+        self.frozen: bool = False                              # Is the overlay shared and read-only?
+        self.gaddag: Optional[Gaddag] = None                   # GADDAG of the words added, built on demand
+
+    def _check_mutable(self) -> None:
+        """
+        @brief Raise if the overlay has been frozen.
+        """
+        if self.frozen:
+            raise ValueError(f"Dictionary: overlay '{self.name}' is frozen and cannot be modified")
+
+    def freeze(self) -> 'OverlayDictionary':
+        """
+        @brief Mark the overlay as read-only so it can be shared.
+        @return: this
+        """
+        self.added.freeze()
+        self.frozen = True
+        return self
+
+    def copy(self) -> 'OverlayDictionary':
+        """
+        @brief Mutable overlay over the same base, with the same words added and removed.
+        """
+        other = OverlayDictionary(self.base, self.name)
+        other.added.add_words(self.added.iter_words())
+        other.removed = set(self.removed)
+        return other
+
+    def add_words(self, words: Iterable[str]) -> int:
+        """
+        @brief Add words, or bring removed words back.
+        @param words: words to be added, in any order
+        @return: number of words that needed to be added
+        """
+        self._check_mutable()
+        words = [word for word in dict.fromkeys(words) if len(word) > 0]
+        words = [word for word, found in zip(words, self.has_words(words)) if not found]
+        self.removed.difference_update(words)
+        new = [word for word, found in zip(words, self.base.has_words(words)) if not found]
+        if self.added.add_words(new) > 0:
+            self.gaddag = None
+        return len(words)
+
+    def remove_words(self, words: Iterable[str]) -> int:
+        """
+        @brief Remove words.
+        @param words: words to be removed, in any order
+        @return: number of words that needed to be removed
+        """
+        self._check_mutable()
+        words = [word for word in dict.fromkeys(words) if len(word) > 0]
+        words = [word for word, found in zip(words, self.has_words(words)) if found]
+        self.removed.update(words)
+        return len(words)
+
+    def has_word(self, chars: str) -> bool:
+        """
+        @brief Check if a word is in the dictionary
+        @param chars: a word to check
+        @return: true if the word is found, false otherwise
+        """
+        return chars not in self.removed and (self.base.has_word(chars) or self.added.has_word(chars))
+
+    def has_words(self, words: List[str]) -> List[bool]:
+        """
+        @brief Check a batch of words (see Dictionary.has_words).
+        @param words: words to check
+        @return: for each word, true if it is found
+        """
+        removed = self.removed
+        return [(in_base or in_added) and word not in removed
+                for word, in_base, in_added in zip(words, self.base.has_words(words), self.added.has_words(words))]
+
+    def has_sequence(self, seq: str) -> bool:
+        """
+        @brief Return true if the sequence is found in a word of the base or of the words added.
+        @param seq: letter sequence
+        @return: true if a start node exists
+        """
+        added = len(self.added.get_sequence_roots(seq[0])) > 0
+        try:
+            found = self.base.has_sequence(seq)
+        except ValueError:
+            # No word of the base has the first letter, the words added may
+            if not added:
+                raise
+            found = False
+        return found or (added and self.added.has_sequence(seq))
+
+    def get_sequence_roots(self, ch: str) -> List[LetterNode | PackedNode]:
+        """
+        @brief Get the nodes of ch in the base and in the words added (see Dictionary.get_sequence_roots).
+        Words spelt from the nodes of the base may have been removed.
+        @param ch: character to find roots for
+        @return: list of the roots
+        """
+        return self.base.get_sequence_roots(ch) + self.added.get_sequence_roots(ch)
+
+    def get_letters(self) -> List[str]:
+        """
+        @brief Letters used by the words of the dictionary, sorted.
+        """
+        return sorted(set(self.base.get_letters()).union(self.added.get_letters()))
+
+    def get_gaddag(self) -> Gaddag:
+        """
+        @brief GADDAG of the words added, to be walked along the one of the base.
+        Words of the base walked in its GADDAG may have been removed.
+        """
+        if self.gaddag is None:
+            self.gaddag = Gaddag(f"{self.name}+").build(self.added.iter_words())
+        return self.gaddag
+
+    def merge_anagrams(self, the_chars: str, found: Dict[str, str]) -> Dict[str, str]:
+        """
+        @brief Apply the overlay to anagrams found in the base, e.g. by its AlphagramIndex.
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @param found: anagrams found in the base
+        @return: a map of actual words, in sorted order, to the letter
+                sequence (using ' ' for blanks) that matched.
+        """
+        if self.added.root is not None:
+            found = {**found, **self.added.find_anagrams(the_chars)}
+        removed = self.removed
+        return {word: found[word] for word in sorted(found) if word not in removed}
+
+    def find_anagrams(self, the_chars: str) -> Dict[str, str]:
+        """
+        @brief Find anagrams of a set of letters (see Dictionary.find_anagrams).
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @return: a map of actual words to the letter
+                sequence (using ' ' for blanks) that matched.
+        """
+        return self.merge_anagrams(the_chars, self.base.find_anagrams(the_chars))
+
+    def __merge(self, base: Iterable[str], added: Iterable[str]) -> Iterator[str]:
+        removed = self.removed
+        for word in heapq.merge(base, added):
+            if word not in removed:
+                yield word
+
+    def find_hangmen(self, the_chars: str) -> List[str]:
+        """
+        @brief Find hangman matches for a set of letters (see Dictionary.find_hangmen).
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @return: the list of words that matched.
+        """
+        return list(self.__merge(self.base.find_hangmen(the_chars), self.added.find_hangmen(the_chars)))
+
+    def find_pattern(self, pattern: str | Pattern, min_len: int = 0, max_len: Optional[int] = None) -> Iterator[str]:
+        """
+        @brief Generate, in sorted order, the words matching a pattern (see Dictionary.find_pattern).
+        """
+        if not isinstance(pattern, Pattern):
+            pattern = Pattern(pattern)
+        return self.__merge(self.base.find_pattern(pattern, min_len, max_len),
+                            self.added.find_pattern(pattern, min_len, max_len))
+
+    def iter_words(self, prefix: str = "", min_len: int = 0, max_len: Optional[int] = None,
+                   letters: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """
+        @brief Generate the words in sorted order (see Dictionary.iter_words).
+        """
+        if letters is not None:
+            letters = frozenset(letters)
+        return self.__merge(self.base.iter_words(prefix, min_len, max_len, letters),
+                            self.added.iter_words(prefix, min_len, max_len, letters))
+
+    def each_word(self, callback: callable):
+        """
+        @brief Apply the callback to each of the words, in sorted order.
+        """
+        for word in self.iter_words():
+            callback(word)
@@ -0,0 +1,534 @@
+import mmap
+from io import BytesIO
+from typing import List, Dict, Iterable, Iterator, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .letter_node import LetterNode
+from .dawg_codec import read_node_table, parse_dawg_v2, DAWG_MAGIC
+from .anagram import find_anagrams_in_table
+from .word_iterator import WordFilter, iter_words_in_table
+from .pattern import Pattern, match_in_table
+
+if TYPE_CHECKING:
+    from .factor_index import FactorIndex
+
+class PackedNode:
+    """
+    @class PackedNode
+    @brief Lightweight view of a single node in a PackedDictionary.
+
+    @description A PackedNode only holds the dictionary and the index of the
+    node in the node table; every attribute is decoded on demand from the
+    packed arrays. It exposes the same attributes as LetterNode
+    (`letter`, `isEndOfWord`, `next`, `child`, `preNodes`, `preLetters`,
+    `postNodes`, `postLetters`) so that the board engine can walk either
+    representation without knowing which one it has been given.
+    """
+    __slots__ = ('dictionary', 'index')
+
+    def __init__(self, dictionary: 'PackedDictionary', index: int):
+        self.dictionary: PackedDictionary = dictionary  # Dictionary owning the node table
+        self.index: int = index                          # Index of the node in the node table
+
+    @property
+    def letter(self) -> str:
+        return chr(self.dictionary.letters.item(self.index))
+
+    @property
+    def isEndOfWord(self) -> bool:
+        return (self.dictionary.info.item(self.index) & LetterNode.END_OF_WORD_BIT_MASK) != 0
+
+    @property
+    def next(self) -> Optional['PackedNode']:
+        i = self.dictionary.next_index(self.index)
+        return PackedNode(self.dictionary, i) if i >= 0 else None
+
+    @property
+    def child(self) -> Optional['PackedNode']:
+        i = self.dictionary.child_index(self.index)
+        return PackedNode(self.dictionary, i) if i > 0 else None
+
+    @property
+    def postNodes(self) -> List['PackedNode']:
+        return [PackedNode(self.dictionary, i) for i in self.dictionary.child_indices(self.index)]
+
+    @property
+    def postLetters(self) -> List[str]:
+        letters = self.dictionary.letters
+        return [chr(letters.item(i)) for i in self.dictionary.child_indices(self.index)]
+
+    @property
+    def preNodes(self) -> List['PackedNode']:
+        i = self.dictionary.parent_index(self.index)
+        return [PackedNode(self.dictionary, i)] if i >= 0 else []
+
+    @property
+    def preLetters(self) -> List[str]:
+        i = self.dictionary.parent_index(self.index)
+        return [chr(self.dictionary.letters.item(i))] if i >= 0 else []
+
+    def match(self, chars: str, index: int) -> Optional['PackedNode']:
+        """
+        @brief Find the node at the end of the subtree that matches the
+        last character in chars, starting from this node's chain.
+
+        @param chars: a string of characters that may be the root of a word
+        @param index: index into chars
+        @return: node found, or None
+        """
+        i = self.dictionary.match_index(chars, index, self.index)
+        return PackedNode(self.dictionary, i) if i >= 0 else None
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PackedNode) and self.dictionary is other.dictionary and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.dictionary), self.index))
+
+    def __str__(self) -> str:
+        return f'{self.letter}'
+
+class PackedDictionary:
+    """
+    @class PackedDictionary
+    @brief Dictionary backend that keeps the DAWG generated by compress.js as
+    flat NumPy arrays instead of a graph of LetterNode objects.
+
+    @description The node table is held in two `uint32` arrays:
+    `letters` holds the code point of each node and `info` holds the packed
+    child index and end-of-word/end-of-list flags exactly as they are stored
+    in the `.dict` file (see LetterNode.decode). Sibling chains are
+    contiguous in the table, so the `next` node of `i` is simply `i + 1`
+    unless `i` ends its list.
+
+    Backward links are kept as a single `parents` array built by
+    `add_links()`; forward links are read straight from the child chains.
+    The public API mirrors Dictionary, and nodes are handed out as
+    PackedNode views, so DictionaryWrapper and Board can use either backend.
+    The dictionary is immutable once loaded.
+    """
+
+    def __init__(self, name: str):
+        """
+        @brief Initialize the dictionary with a name.
+        """
+        self.name: str = name  # Name of the dictionary
+        self.letters: np.ndarray = np.zeros(0, dtype=np.uint32)  # Code point of each node
+        self.info: np.ndarray = np.zeros(0, dtype=np.uint32)     # Packed child index and flags of each node
+        self.parents: Optional[np.ndarray] = None                  # Index of the node linking to each node, -1 for none
+        self.sequence_roots: Optional[Dict[str, np.ndarray]] = None  # Node indices of each letter
+        self.factor_index: Optional['FactorIndex'] = None            # Index of every sequence found in a word
+
+    @property
+    def root(self) -> Optional[PackedNode]:
+        return PackedNode(self, 0) if len(self.letters) > 0 else None
+
+    def __len__(self) -> int:
+        return len(self.letters)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        @brief Number of bytes held by the node table and its indices.
+        """
+        total = self.letters.nbytes + self.info.nbytes
+        if self.parents is not None:
+            total += self.parents.nbytes
+        if self.sequence_roots is not None:
+            total += sum(roots.nbytes for roots in self.sequence_roots.values())
+        return total
+
+    def load_dawg(self, data: BytesIO) -> 'PackedDictionary':
+        """
+        @brief Load a DAWG, as generated by dictionary_compressor.js (v1)
+        or externals.dictionary.compile (v1 or v2).
+        @description This is destructive; anything already in the
+        dictionary will be discarded.
+
+        @param data: the DAWG data.
+        @return: this
+        """
+        letters, info = read_node_table(data)
+        return self._set_table(letters.astype(np.uint32), info.astype(np.uint32))
+
+    def load_mmap(self, path: str) -> 'PackedDictionary':
+        """
+        @brief Map a `.dict` file read-only and use it in place.
+        @description The node table is not copied: `letters` and `info`
+        are big-endian views straight into the mapping, so every process
+        mapping the same file shares the same physical pages. Only the
+        indices built on demand (`parents`, `sequence_roots`) are private.
+        The bit-packed records of a v2 file cannot be used in place, so
+        they are decoded into private arrays: files meant to be shared
+        between processes are compiled as v1.
+
+        @param path: path of the `.dict` file
+        @return: this
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if mapping[0:4] == DAWG_MAGIC:
+            dawg = parse_dawg_v2(mapping)
+            mapping.close()
+            return self._set_table(dawg.letters, dawg.info)
+
+        number_of_nodes = int.from_bytes(mapping[0:4], 'big')
+        if len(mapping) < 4 + number_of_nodes * 8:
+            raise ValueError(f"PackedDictionary: truncated DAWG, expected {number_of_nodes} nodes")
+        table = np.frombuffer(mapping, dtype='>u4', count=number_of_nodes * 2, offset=4)
+
+        return self._set_table(table[0::2], table[1::2])
+
+    def _set_table(self, letters: np.ndarray, info: np.ndarray) -> 'PackedDictionary':
+        """
+        @brief Replace the node table, discarding the indices built over the old one.
+        """
+        self.letters = letters
+        self.info = info
+        self.parents = None
+        self.sequence_roots = None
+        self.factor_index = None
+        return self
+
+    def set_factor_index(self, factor_index: Optional['FactorIndex']) -> 'PackedDictionary':
+        """
+        @brief Use a factor index, built from the same words, to answer
+        has_sequence in time proportional to the length of the sequence.
+
+        @param factor_index: the factor index, None to go back to sequence roots
+        @return: this
+        """
+        self.factor_index = factor_index
+        return self
+
+    def add_links(self) -> 'PackedDictionary':
+        """
+        @brief Record, for every node, a node that links forward to it so
+        that words can be followed backwards (see LetterNode.build_lists).
+
+        @return: this
+        """
+        number_of_nodes = len(self.letters)
+        parents = np.full(number_of_nodes, -1, dtype=np.int32)
+        if number_of_nodes > 0:
+            children = (self.info >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+            owners = np.nonzero(children)[0]
+            starts = children[owners].astype(np.int64)
+
+            # Every chain runs up to the first node carrying the end-of-list flag
+            list_ends = np.nonzero(self.info & LetterNode.END_OF_LIST_BIT_MASK)[0]
+            ends = list_ends[np.searchsorted(list_ends, starts)]
+
+            lengths = ends - starts + 1
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            parents[np.repeat(starts, lengths) + offsets] = np.repeat(owners, lengths)
+        self.parents = parents
+        return self
+
+    def freeze(self) -> 'PackedDictionary':
+        """
+        @brief Build all indices and make the arrays read-only so the
+        dictionary can be shared, e.g. by DictionaryRegistry.
+
+        @return: this
+        """
+        if self.parents is None:
+            self.add_links()
+        if self.sequence_roots is None:
+            self.create_sequence_roots()
+        for array in [self.letters, self.info, self.parents, *self.sequence_roots.values()]:
+            array.flags.writeable = False
+        return self
+
+    def child_index(self, i: int) -> int:
+        """
+        @brief Index of the first child of node i, 0 if it has none.
+        """
+        return (self.info.item(i) >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+
+    def next_index(self, i: int) -> int:
+        """
+        @brief Index of the next sibling of node i, -1 if it ends its list.
+        """
+        return -1 if self.info.item(i) & LetterNode.END_OF_LIST_BIT_MASK else i + 1
+
+    def parent_index(self, i: int) -> int:
+        """
+        @brief Index of the node linking forward to node i, -1 if there is none.
+        """
+        if self.parents is None:
+            self.add_links()
+        return self.parents.item(i)
+
+    def child_indices(self, i: int) -> List[int]:
+        """
+        @brief Indices of all nodes in the child chain of node i.
+        """
+        info = self.info
+        out: List[int] = []
+        c = (info.item(i) >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+        if c == 0:
+            return out
+        while True:
+            out.append(c)
+            if info.item(c) & LetterNode.END_OF_LIST_BIT_MASK:
+                return out
+            c += 1
+
+    def match_index(self, chars: str, index: int = 0, start: int = 0) -> int:
+        """
+        @brief Follow chars from the chain starting at `start`.
+
+        @param chars: a string of characters that may be the root of a word
+        @param index: index into chars of the first character to match
+        @param start: index of the first node of the chain to search
+        @return: index of the node matching the last character, -1 if not found
+        """
+        letters = self.letters
+        info = self.info
+        last = len(chars) - 1
+        i = start
+        while index <= last:
+            code = ord(chars[index])
+            while letters.item(i) != code:
+                if info.item(i) & LetterNode.END_OF_LIST_BIT_MASK:
+                    return -1
+                i += 1
+            if index == last:
+                return i
+            i = (info.item(i) >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+            if i == 0:
+                return -1
+            index += 1
+        return -1
+
+    def each_word(self, callback: callable):
+        """
+        @brief Apply the callback to each of the words represented in the DAWG
+        (potentially huge!)
+
+        @param callback: function
+        """
+        for word in self.iter_words():
+            callback(word)
+
+    def iter_words(self, prefix: str = "", min_len: int = 0, max_len: Optional[int] = None,
+                   letters: Optional[Iterable[str]] = None) -> Iterator[str]:
+        """
+        @brief Generate the words of the DAWG in sorted order, one at a
+        time as they are consumed, without recursion.
+
+        @param prefix: only words starting with the prefix
+        @param min_len: only words of at least min_len letters
+        @param max_len: only words of at most max_len letters, None for any length
+        @param letters: only words made of these letters, None for any letter
+        @return: generator of the words
+        """
+        word_filter = WordFilter(prefix, min_len, max_len, letters)
+        if len(self.letters) == 0 or not word_filter.accepts_prefix():
+            return
+        first = 0
+        if len(prefix) > 0:
+            i = self.match_index(prefix)
+            if i < 0:
+                return
+            if self.info.item(i) & LetterNode.END_OF_WORD_BIT_MASK and word_filter.accepts_word(prefix):
+                yield prefix
+            first = self.child_index(i) or -1
+        yield from iter_words_in_table(self.letters, self.info, first, word_filter)
+
+    def match(self, chars: str) -> Optional[PackedNode]:
+        """
+        @brief Return the node that matches the last character
+        in chars, starting from the root / first character.
+
+        @param chars: characters that may be the root of a word
+        @return: node found, or None
+        """
+        if len(self.letters) == 0 or len(chars) == 0:
+            return None
+        i = self.match_index(chars)
+        return PackedNode(self, i) if i >= 0 else None
+
+    def has_word(self, chars: str) -> bool:
+        """
+        @brief Check if a word is in the dictionary
+
+        @param chars: a word to check
+        @return: true if the word is found, false otherwise
+        """
+        if not isinstance(chars, str): raise ValueError("chars is not string!")
+        if len(self.letters) == 0 or len(chars) == 0:
+            return False
+
+        i = self.match_index(chars)
+        return i >= 0 and (self.info.item(i) & LetterNode.END_OF_WORD_BIT_MASK) != 0
+
+    def has_words(self, words: List[str]) -> List[bool]:
+        """
+        @brief Check a batch of words, sharing the walk over common
+        prefixes (see Dictionary.has_words).
+
+        @param words: words to check
+        @return: for each word, true if it is found
+        """
+        letters = self.letters
+        info = self.info
+        found: Dict[str, bool] = {}
+        path: List[int] = []  # Nodes matching the first letters of the previous word
+        previous = ""
+        for word in sorted(set(words)):
+            common = 0
+            limit = min(len(word), len(path))
+            while common < limit and word[common] == previous[common]:
+                common += 1
+            del path[common:]
+
+            # Index of the chain to search next, -1 if there is none
+            if path:
+                i = self.child_index(path[-1]) or -1
+            else:
+                i = 0 if len(letters) > 0 else -1
+            for letter in word[common:]:
+                if i < 0:
+                    break
+                code = ord(letter)
+                while letters.item(i) != code:
+                    if info.item(i) & LetterNode.END_OF_LIST_BIT_MASK:
+                        i = -1
+                        break
+                    i += 1
+                if i < 0:
+                    break
+                path.append(i)
+                i = self.child_index(i) or -1
+
+            found[word] = (len(word) > 0 and len(path) == len(word)
+                           and (info.item(path[-1]) & LetterNode.END_OF_WORD_BIT_MASK) != 0)
+            previous = word
+        return [found[word] for word in words]
+
+    def find_anagrams(self, the_chars: str) -> Dict[str, str]:
+        """
+        @brief Find anagrams of a set of letters. An anagram is defined as any
+        complete (2 or more characters) word that uses all or some of the
+        letters passed in.
+
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @return: a map of actual words to the letter
+                sequence (using ' ' for blanks) that matched.
+        """
+        the_chars = the_chars.upper()
+        if len(the_chars) < 2:
+            raise ValueError(f"Dictionary: '{the_chars}' is too short to find anagrams")
+
+        return find_anagrams_in_table(self.letters, self.info, the_chars)
+
+    def find_hangmen(self, the_chars: str) -> List[str]:
+        """
+        @brief Find hangman matches for a set of letters. A hangman match is any
+        word(s) that match against an ordered set of letters, using a space
+        for an any-letter wildcard. For example, "EXAMPLE" is a hangman match
+        for "E AM LE".
+
+        @param the_chars: the letters, ' ' for an any-letter wildcard.
+        @return: the list of words that matched.
+        """
+        return list(match_in_table(self.letters, self.info, Pattern.hangman(the_chars)))
+
+    def find_pattern(self, pattern: str | Pattern, min_len: int = 0, max_len: Optional[int] = None) -> Iterator[str]:
+        """
+        @brief Generate, in sorted order, the words matching a pattern such
+        as "?AT*", "[AEIOU]?S" or "Q?{2,5}" (see Pattern for the syntax).
+
+        @param pattern: the pattern, as text or compiled
+        @param min_len: only words of at least min_len letters
+        @param max_len: only words of at most max_len letters, None for any length
+        @return: generator of the words
+        """
+        if not isinstance(pattern, Pattern):
+            pattern = Pattern(pattern)
+        return match_in_table(self.letters, self.info, pattern, min_len, max_len)
+
+    def create_sequence_roots(self) -> None:
+        """
+        @brief For each letter of the alphabet, establish a list of valid
+        start points, such that at least one start point must match()
+        for any sequence of chars, or there can't possibly be a word.
+        """
+        self.sequence_roots = {}
+        codes, inverse = np.unique(self.letters, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(codes)))
+        start = 0
+        for code, end in zip(codes.tolist(), bounds.tolist()):
+            self.sequence_roots[chr(code)] = order[start:end]
+            start = end
+
+    def get_sequence_roots(self, ch: str) -> List[PackedNode]:
+        """
+        @brief Get a list of the sequence roots for ch. The sequence roots
+        are all those nodes that represent the character in any word.
+        From a sequence root we can follow post or pre to extend the
+        word in either direction.
+
+        @param ch: character to find roots for
+        @return: list of the roots
+        """
+        if self.sequence_roots is None:
+            self.create_sequence_roots()
+        roots = self.sequence_roots.get(ch)
+        return [] if roots is None else [PackedNode(self, i) for i in roots.tolist()]
+
+    def get_letters(self) -> List[str]:
+        """
+        @brief Letters used by the words of the dictionary, sorted.
+        """
+        if self.sequence_roots is not None:
+            return sorted(self.sequence_roots)
+        return [chr(code) for code in np.unique(self.letters).tolist()]
+
+    def find_sequence(self, seq: str) -> Optional[PackedNode]:
+        """
+        @brief Find start node for the character sequence in the sequence
+        index i.e. it forms a valid sub-part of a word in the
+        dictionary (see Dictionary.find_sequence).
+
+        @param seq: letter sequence
+        @return: node found, or None
+        """
+        if self.factor_index is not None and not self.has_sequence(seq):
+            return None
+
+        if self.sequence_roots is None:
+            self.create_sequence_roots()
+
+        roots = self.sequence_roots.get(seq[0])
+        if roots is None or len(roots) <= 0:
+            raise ValueError(f"Dictionary: '{seq}' has no roots")
+        if len(seq) == 1:
+            return PackedNode(self, roots.item(0))
+        for root in roots.tolist():
+            child = self.child_index(root)
+            if child and self.match_index(seq, 1, child) >= 0:
+                return PackedNode(self, root)
+        return None
+
+    def has_sequence(self, seq: str) -> bool:
+        """
+        @brief Return true if a start node for the character sequence is found
+        in the sequence index i.e. it forms a valid sub-part of a word
+        in the dictionary (see Dictionary.has_sequence).
+
+        @param seq: letter sequence
+        @return: true if a start node exists
+        """
+        if self.factor_index is not None:
+            if self.factor_index.has_sequence(seq):
+                return True
+            if not self.factor_index.has_letter(seq[0]):
+                raise ValueError(f"Dictionary: '{seq}' has no roots")
+            return False
+        return self.find_sequence(seq) is not None
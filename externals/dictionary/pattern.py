@@ -0,0 +1,268 @@
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .letter_node import LetterNode
+
+ANY_LETTER = -1  # Bitmask with every code point set
+
+class Pattern:
+    """
+    @class Pattern
+    @brief Word pattern compiled for matching against a DAWG.
+
+    @description Syntax, letters being case-insensitive:
+        A        the letter A
+        ? . ' '  any letter
+        [AEIOU]  any of the letters, [^AEIOU] any letter but them
+        *        any number of letters, including none
+        {m,n}    after a letter, wildcard or class: m to n of them;
+                 {m} exactly m, {m,} at least m
+
+    The pattern is compiled into a sequence of positions, each holding the
+    bitmask of the code points it accepts and whether it must be matched
+    once, may be skipped, or may be repeated. The set of positions reached
+    is kept as the bits of an integer, and each set met is numbered as a
+    state of a deterministic automaton whose transitions are computed the
+    first time a letter is met, then looked up in `rows`, so walking a
+    DAWG node costs one dictionary lookup.
+    """
+
+    ONE = 0       # Must be matched once
+    OPTIONAL = 1  # May be matched once or skipped
+    STAR = 2      # May be matched any number of times
+
+    def __init__(self, text: str):
+        """
+        @brief Compile a pattern.
+        @param text: the pattern
+        """
+        self.text: str = text
+        self.masks: List[int] = []  # Code points accepted at each position
+        self.kinds: List[int] = []  # ONE, OPTIONAL or STAR
+        self.__parse(text.upper())
+        self.__compile()
+
+    @classmethod
+    def hangman(cls, the_chars: str) -> 'Pattern':
+        """
+        @brief Pattern of a hangman query, every character standing for itself but ' ' for any letter.
+        """
+        pattern = cls.__new__(cls)
+        pattern.text = the_chars
+        pattern.masks = [ANY_LETTER if ch == ' ' else 1 << ord(ch) for ch in the_chars.upper()]
+        pattern.kinds = [Pattern.ONE] * len(the_chars)
+        pattern.__compile()
+        return pattern
+
+    def __parse(self, text: str) -> None:
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            i += 1
+            if ch == '*':
+                self.masks.append(ANY_LETTER)
+                self.kinds.append(Pattern.STAR)
+                continue
+            if ch in '?. ':
+                mask = ANY_LETTER
+            elif ch == '[':
+                end = text.find(']', i)
+                if end < 0:
+                    raise ValueError(f"Pattern: unclosed '[' in '{self.text}'")
+                letters = text[i:end]
+                negated = letters.startswith('^')
+                if negated:
+                    letters = letters[1:]
+                if len(letters) == 0:
+                    raise ValueError(f"Pattern: empty letter class in '{self.text}'")
+                mask = 0
+                for letter in letters:
+                    mask |= 1 << ord(letter)
+                if negated:
+                    mask = ~mask
+                i = end + 1
+            elif ch in ']{}':
+                raise ValueError(f"Pattern: unexpected '{ch}' in '{self.text}'")
+            else:
+                mask = 1 << ord(ch)
+
+            low, high = 1, 1
+            if i < len(text) and text[i] == '{':
+                end = text.find('}', i)
+                if end < 0:
+                    raise ValueError(f"Pattern: unclosed '{{' in '{self.text}'")
+                low, high = self.__parse_range(text[i + 1:end])
+                i = end + 1
+            self.masks.extend([mask] * low)
+            self.kinds.extend([Pattern.ONE] * low)
+            if high is None:
+                self.masks.append(mask)
+                self.kinds.append(Pattern.STAR)
+            else:
+                self.masks.extend([mask] * (high - low))
+                self.kinds.extend([Pattern.OPTIONAL] * (high - low))
+
+    def __parse_range(self, text: str) -> Tuple[int, Optional[int]]:
+        low, comma, high = text.partition(',')
+        try:
+            low = int(low)
+            high = int(high) if high.strip() else (None if comma else low)
+        except ValueError:
+            raise ValueError(f"Pattern: bad range '{{{text}}}' in '{self.text}'") from None
+        if low < 0 or (high is not None and high < low):
+            raise ValueError(f"Pattern: bad range '{{{text}}}' in '{self.text}'")
+        return low, high
+
+    def __compile(self) -> None:
+        n = len(self.masks)
+        # Letters that may still follow each position, sys.maxsize if unbounded
+        room: List[int] = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            room[i] = sys.maxsize if self.kinds[i] == Pattern.STAR or room[i + 1] == sys.maxsize else room[i + 1] + 1
+        self.__room = room
+        self.min_length: int = self.kinds.count(Pattern.ONE)
+        self.max_length: int = room[0]
+
+        # States are numbered sets of positions; state 0 matches nothing
+        self.__positions: List[int] = []       # Positions of each state, as bits
+        self.__numbers: Dict[int, int] = {}    # State number of each set of positions
+        self.rows: List[Dict[str, int]] = []   # State reached from each state on each letter, filled on demand
+        self.accepting: List[bool] = []        # Does the state match a whole word?
+        self.extendable: List[bool] = []       # May more letters follow the state?
+        self.__number(0)
+        self.start: int = self.__number(self.__closure(1))
+
+    def __number(self, positions: int) -> int:
+        state = self.__numbers.get(positions)
+        if state is None:
+            state = self.__numbers[positions] = len(self.__positions)
+            self.__positions.append(positions)
+            self.rows.append({})
+            self.accepting.append(bool(positions >> len(self.masks) & 1))
+            self.extendable.append(any(self.__room[i] > 0 for i in range(len(self.__room)) if positions >> i & 1))
+        return state
+
+    def __closure(self, positions: int) -> int:
+        # Positions that may be skipped let the next one be reached as well
+        for i in range(len(self.kinds)):
+            if positions >> i & 1 and self.kinds[i] != Pattern.ONE:
+                positions |= 1 << (i + 1)
+        return positions
+
+    def step(self, state: int, letter: str) -> int:
+        """
+        @brief State reached by matching a letter, as found in rows once computed.
+        @param state: state reached so far, start for none
+        @param letter: next letter
+        @return: state reached, 0 if the letter cannot be matched
+        """
+        following = self.rows[state].get(letter)
+        if following is None:
+            positions = self.__positions[state]
+            code = ord(letter)
+            reached = 0
+            for i, (mask, kind) in enumerate(zip(self.masks, self.kinds)):
+                if positions >> i & 1 and mask >> code & 1:
+                    reached |= 1 << (i if kind == Pattern.STAR else i + 1)
+            following = self.rows[state][letter] = self.__number(self.__closure(reached))
+        return following
+
+    def matches(self, word: str) -> bool:
+        """
+        @brief Does the whole word match the pattern?
+        """
+        state = self.start
+        for letter in word.upper():
+            state = self.step(state, letter)
+            if state == 0:
+                return False
+        return self.accepting[state]
+
+def match_in_nodes(root: Optional[LetterNode], pattern: Pattern, min_len: int = 0,
+                   max_len: Optional[int] = None) -> Iterator[str]:
+    """
+    @brief List, in sorted order, the words of a LetterNode graph matching a
+    pattern. Branches are left as soon as no position can match, or the
+    pattern or max_len allows no more letters.
+
+    @param root: first node of the dictionary
+    @param pattern: compiled pattern
+    @param min_len: shortest length listed
+    @param max_len: longest length listed, None for no limit
+    @return: generator of the words
+    """
+    max_len = min(max_len if max_len is not None else sys.maxsize, pattern.max_length)
+    if root is None or max_len == 0:
+        return
+    rows = pattern.rows
+    accepting = pattern.accepting
+    extendable = pattern.extendable
+    stack: List[Tuple[LetterNode, str, int]] = [(root, "", pattern.start)]
+    while stack:
+        node, above, state = stack.pop()
+        row = rows[state]  # Siblings are all matched from the same state
+        while node is not None:
+            following = node.next
+            letter = node.letter
+            reached = row.get(letter)
+            if reached is None:
+                reached = pattern.step(state, letter)
+            if reached:
+                word = above + letter
+                if node.isEndOfWord and accepting[reached] and len(word) >= min_len:
+                    yield word
+                child = node.child
+                if child is not None and extendable[reached] and len(word) < max_len:
+                    if following is not None:
+                        stack.append((following, above, state))
+                    node, above, state = child, word, reached
+                    row = rows[state]
+                    continue
+            node = following
+
+def match_in_table(letters: np.ndarray, info: np.ndarray, pattern: Pattern, min_len: int = 0,
+                   max_len: Optional[int] = None) -> Iterator[str]:
+    """
+    @brief List, in sorted order, the words of a packed node table (see
+    PackedDictionary) matching a pattern, as match_in_nodes does.
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @param pattern: compiled pattern
+    @param min_len: shortest length listed
+    @param max_len: longest length listed, None for no limit
+    @return: generator of the words
+    """
+    max_len = min(max_len if max_len is not None else sys.maxsize, pattern.max_length)
+    if len(letters) == 0 or max_len == 0:
+        return
+    rows = pattern.rows
+    accepting = pattern.accepting
+    extendable = pattern.extendable
+    end_of_list = LetterNode.END_OF_LIST_BIT_MASK
+    end_of_word = LetterNode.END_OF_WORD_BIT_MASK
+    stack: List[Tuple[int, str, int]] = [(0, "", pattern.start)]
+    while stack:
+        i, above, state = stack.pop()
+        row = rows[state]  # Siblings are all matched from the same state
+        while i >= 0:
+            numb = info.item(i)
+            following = -1 if numb & end_of_list else i + 1
+            letter = chr(letters.item(i))
+            reached = row.get(letter)
+            if reached is None:
+                reached = pattern.step(state, letter)
+            if reached:
+                word = above + letter
+                if numb & end_of_word and accepting[reached] and len(word) >= min_len:
+                    yield word
+                child = (numb >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+                if child and extendable[reached] and len(word) < max_len:
+                    if following >= 0:
+                        stack.append((following, above, state))
+                    i, above, state = child, word, reached
+                    row = rows[state]
+                    continue
+            i = following
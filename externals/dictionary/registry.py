@@ -0,0 +1,131 @@
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+@dataclass
+class RegistryEntry:
+    dictionary: Any          # Shared dictionary
+    references: int = 0      # Number of live users
+    last_released: float = 0.0  # Monotonic time the last user released it
+
+class DictionaryRegistry:
+    """
+    @class DictionaryRegistry
+    @brief Process-wide cache of loaded dictionaries.
+
+    @description Dictionaries are loaded once per key (typically the path of
+    the `.dict` file and the backend used to hold it) and the same object is
+    handed out to every user. Users must treat it as immutable. Each
+    `acquire` must be paired with a `release`; a dictionary nobody holds is
+    kept warm for `idle_timeout` seconds and then evicted on the next
+    registry access or explicit `evict_idle` call.
+    """
+
+    def __init__(self, idle_timeout: float = 600.0):
+        """
+        @brief Initialize the registry.
+        @param idle_timeout: seconds an unreferenced dictionary is kept before eviction
+        """
+        self.idle_timeout: float = idle_timeout
+        self.__entries: Dict[Hashable, RegistryEntry] = {}
+        # Reentrant: a finalizer releasing a dictionary may run while the lock is held
+        self.__lock = threading.RLock()
+        self.__loading: Dict[Hashable, threading.Lock] = {}  # Key -> lock held while its dictionary loads
+        self.hits: int = 0       # Acquisitions served from the registry
+        self.loads: int = 0      # Acquisitions that had to load the dictionary
+        self.evictions: int = 0  # Dictionaries evicted after being idle
+
+    def acquire(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        @brief Get the dictionary registered under key, loading it if needed,
+        and add a reference to it.
+        @param key: key of the dictionary
+        @param loader: function returning the fully prepared dictionary
+        @return: shared dictionary
+        """
+        with self.__lock:
+            self.__evict_idle(time.monotonic())
+            entry = self.__reference(key)
+            if entry is not None:
+                return entry.dictionary
+            loading = self.__loading.setdefault(key, threading.Lock())
+
+        # Loading under the lock of the key guarantees a single load per key, while
+        # other keys are acquired and released meanwhile (a GADDAG takes ~40 s to build)
+        with loading:
+            with self.__lock:
+                entry = self.__reference(key)
+                if entry is not None:
+                    return entry.dictionary
+            dictionary = loader()
+            with self.__lock:
+                self.__entries[key] = RegistryEntry(dictionary, references=1)
+                self.__loading.pop(key, None)
+                self.loads += 1
+                return dictionary
+
+    def __reference(self, key: Hashable) -> Optional[RegistryEntry]:
+        entry = self.__entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entry.references += 1
+        return entry
+
+    def release(self, key: Hashable) -> None:
+        """
+        @brief Drop a reference taken with acquire.
+        @param key: key of the dictionary
+        """
+        with self.__lock:
+            now = time.monotonic()
+            entry = self.__entries.get(key)
+            if entry is not None and entry.references > 0:
+                entry.references -= 1
+                if entry.references == 0:
+                    entry.last_released = now
+            self.__evict_idle(now)
+
+    def evict_idle(self) -> List[Hashable]:
+        """
+        @brief Evict the dictionaries that have not been referenced for idle_timeout seconds.
+        @return: keys of the evicted dictionaries
+        """
+        with self.__lock:
+            return self.__evict_idle(time.monotonic())
+
+    def __evict_idle(self, now: float) -> List[Hashable]:
+        evicted = [key for key, entry in list(self.__entries.items())
+                   if entry.references == 0 and now - entry.last_released >= self.idle_timeout]
+        evicted = [key for key in evicted if self.__entries.pop(key, None) is not None]
+        self.evictions += len(evicted)
+        return evicted
+
+    def references(self, key: Hashable) -> int:
+        """
+        @brief Number of live references to the dictionary registered under key.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry.references if entry is not None else 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        @brief Get the dictionary registered under key without taking a reference.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry.dictionary if entry is not None else None
+
+    def clear(self) -> None:
+        """
+        @brief Forget all dictionaries, whether referenced or not.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__entries
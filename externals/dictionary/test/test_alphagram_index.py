@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+
+from ..alphagram_index import AlphagramIndex
+from ..dictionary import Dictionary
+from game.utils import get_absolute_path
+
+class TestAlphagramIndex(unittest.TestCase):
+
+    def setUp(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(os.path.join(os.path.dirname(__file__), 'data', dict_path), 'rb') as f:
+            self.dic = Dictionary("test").load_dawg(BytesIO(f.read()))
+        words = []
+        self.dic.each_word(words.append)
+        self.index = AlphagramIndex(7).build(words)
+
+    def test_matches_dawg_anagrams(self):
+        for rack in ["LAZY", "QUICK", "E AM LE", "DOG  ", "HNGMNAE", "  ", "ZZ"]:
+            expected = self.dic.find_anagrams(rack)
+            found = self.index.find_anagrams(rack)
+            self.assertEqual(found, expected, rack)
+            self.assertEqual(list(found), sorted(expected), rack)
+
+        self.assertRaises(ValueError, self.index.find_anagrams, "A")
+        self.assertRaises(ValueError, self.index.find_anagrams, "ABCDEFGH")
+
+    def test_round_trips_bytes(self):
+        data = self.index.to_bytes()
+        loaded = AlphagramIndex.from_bytes(data)
+
+        self.assertEqual(loaded.max_length, 7)
+        self.assertEqual(len(loaded), len(self.index))
+        self.assertEqual(loaded.to_bytes(), data)
+        self.assertEqual(loaded.get("DGOS"), ("DOGS",))
+        self.assertEqual(loaded.get("DGO"), ())
+        self.assertEqual(loaded.find_anagrams("E AM LE"), self.index.find_anagrams("E AM LE"))
+        self.assertRaises(ValueError, AlphagramIndex.from_bytes, data[:16])
+        self.assertRaises(ValueError, AlphagramIndex.from_bytes, data[:-1])
+        self.assertRaises(ValueError, AlphagramIndex.from_bytes, data + b"\0")
+        self.assertRaises(ValueError, AlphagramIndex.from_bytes, b"DAWG" + data[4:])
+
+    def test_rebuilds_bad_caches(self):
+        data = self.index.to_bytes()
+        # Version 1 held the words as newline separated UTF-8
+        old_version = b"ALPH" + (1).to_bytes(4, 'big') + (7).to_bytes(4, 'big') + (1).to_bytes(4, 'big') + b"DOG"
+        with tempfile.TemporaryDirectory() as tmp:
+            dict_path = os.path.join(tmp, "dictionary.dict")
+            shutil.copyfile(get_absolute_path('externals/dictionary/test/data/dictionary.dict'), dict_path)
+            cache_path = AlphagramIndex.path_for(dict_path)
+
+            for cached in (old_version, b"", data[:20], data[:-1], data + b"\0"):
+                with open(cache_path, 'wb') as f:
+                    f.write(cached)
+                index = AlphagramIndex.load_or_build(dict_path, 7)
+                self.assertEqual(index.find_anagrams("E AM LE"), self.index.find_anagrams("E AM LE"), cached[:8])
+                with open(cache_path, 'rb') as f:
+                    self.assertEqual(f.read(), data)
+            self.assertEqual(sorted(os.listdir(tmp)), ["dictionary.alphagrams", "dictionary.dict"])
+
+if __name__ == "__main__":
+    unittest.main()
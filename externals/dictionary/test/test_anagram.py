@@ -0,0 +1,44 @@
+import os
+import unittest
+from io import BytesIO
+
+from ..anagram import RackCounts, find_anagrams_in_nodes, find_anagrams_in_table
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary
+from game.utils import get_absolute_path
+
+class TestAnagram(unittest.TestCase):
+
+    def setUp(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(os.path.join(os.path.dirname(__file__), 'data', dict_path), 'rb') as f:
+            self.data = f.read()
+
+    def test_rack_counts(self):
+        rack = RackCounts("AAB ")
+        self.assertEqual((rack.counts, rack.blanks, rack.remaining), ([2, 1], 1, 4))
+
+        self.assertEqual(rack.take("A"), "A")
+        self.assertEqual(rack.take("C"), " ")
+        self.assertIsNone(rack.take("C"))
+        self.assertEqual((rack.counts, rack.blanks, rack.remaining), ([1, 1], 0, 2))
+
+        rack.put_back(" ")
+        rack.put_back("A")
+        self.assertEqual((rack.counts, rack.blanks, rack.remaining), ([2, 1], 1, 4))
+
+    def test_matches_find_words_that_use(self):
+        dic = Dictionary("test").load_dawg(BytesIO(self.data))
+        packed = PackedDictionary("test").load_dawg(BytesIO(self.data))
+
+        for rack in ["LAZY", "QUICK", "E AM LE", "DOG  ", "HNGMNAE", "  "]:
+            expected = {}
+            dic.root.find_words_that_use(list(rack), "", "", expected)
+
+            self.assertEqual(find_anagrams_in_nodes(dic.root, rack), expected, rack)
+            self.assertEqual(find_anagrams_in_table(packed.letters, packed.info, rack), expected, rack)
+
+        self.assertEqual(find_anagrams_in_nodes(None, "AB"), {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from ..compile import read_lexicon, compile_lexicon, save_indexes
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary
+from ..factor_index import FactorIndex
+from ..alphagram_index import AlphagramIndex
+from ..dawg_codec import read_node_table, write_node_table
+from ..layout import depth_first_layout
+from game.utils import get_absolute_path
+
+class TestCompile(unittest.TestCase):
+
+    def test_read_lexicon(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+                f.write("dog\r\ncat a small feline\n\n  emu\nDOG\n")
+            self.assertEqual(read_lexicon(path), ["CAT", "DOG", "EMU"])
+
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("istanbul\nılık\nşişe\nwhisky\n")
+            self.assertEqual(read_lexicon(path, "tr", "ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZ"), ["ILIK", "İSTANBUL", "ŞİŞE"])
+
+    def test_compile_lexicon(self):
+        words = ["ZOO", "CAT", "CATS", "DO", "DOG", "DOGS", "CAT"]
+        for version in (1, 2):
+            data = compile_lexicon(words, version)
+            dic = Dictionary("test").load_dawg(BytesIO(data))
+
+            out = []
+            dic.each_word(out.append)
+            self.assertEqual(out, sorted(set(words)))
+            self.assertFalse(dic.has_word("CA"))
+        # v1 by default, as the command line and the Makefile
+        self.assertEqual(compile_lexicon(words), compile_lexicon(words, 1))
+        self.assertRaises(ValueError, compile_lexicon, words, 1, ["factors"])
+        self.assertRaises(ValueError, compile_lexicon, words, 2, ["suffixes"])
+
+    def test_layout(self):
+        words = ["ZOO", "CAT", "CATS", "DO", "DOG", "DOGS", "CATTLE", "CATTLES"]
+        bfs = compile_lexicon(words, 1)
+        dfs = compile_lexicon(words, 1, layout="dfs")
+        self.assertEqual(len(dfs), len(bfs))
+        self.assertNotEqual(dfs, bfs)
+        self.assertEqual(list(Dictionary("test").load_dawg(BytesIO(dfs)).iter_words()), sorted(words))
+        self.assertRaises(ValueError, compile_lexicon, words, 2, layout="random")
+
+        # The chain below C, which holds the most words, follows the root chain
+        letters, info = read_node_table(BytesIO(dfs))
+        self.assertEqual([chr(c) for c in letters[:4]], ["C", "D", "Z", "A"])
+
+        # compress.js shares chain tails, which must keep their offsets
+        with open(get_absolute_path('externals/dictionary/test/data/dictionary.dict'), 'rb') as f:
+            data = f.read()
+        letters, info = read_node_table(BytesIO(data))
+        relaid = write_node_table(*depth_first_layout(letters, info))
+        for backend in (Dictionary, PackedDictionary):
+            self.assertEqual(list(backend("test").load_dawg(BytesIO(relaid)).iter_words()),
+                             list(backend("test").load_dawg(BytesIO(data)).iter_words()))
+
+    def test_embeds_indexes(self):
+        words = ["ACT", "CAT", "CATS", "DOG", "GOD"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.dict")
+            with open(path, 'wb') as f:
+                f.write(compile_lexicon(words, 2, ["factors", "alphagrams"], 4))
+
+            self.assertTrue(PackedDictionary("test").load_mmap(path).has_word("GOD"))
+            self.assertTrue(FactorIndex.load_or_build(path).has_sequence("ATS"))
+            self.assertEqual(list(AlphagramIndex.load_or_build(path, 4).find_anagrams("TCA")), ["ACT", "CAT"])
+            # Nothing had to be cached next to the dictionary
+            self.assertEqual(os.listdir(tmp), ["words.dict"])
+
+    def test_saves_indexes(self):
+        words = ["ACT", "CAT", "CATS", "DOG", "GOD"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.dict")
+            with open(path, 'wb') as f:
+                f.write(compile_lexicon(words, 1))
+            saved = save_indexes(words, path, ["factors", "alphagrams"], 4)
+            self.assertEqual(saved, [os.path.join(tmp, "words.factors"), os.path.join(tmp, "words.alphagrams")])
+            mtimes = [os.path.getmtime(p) for p in saved]
+            self.assertEqual(sorted(os.listdir(tmp)), ["words.alphagrams", "words.dict", "words.factors"])
+
+            self.assertTrue(FactorIndex.load_or_build(path).has_sequence("ATS"))
+            self.assertEqual(list(AlphagramIndex.load_or_build(path, 4).find_anagrams("TCA")), ["ACT", "CAT"])
+            # The saved indexes were used, not rebuilt
+            self.assertEqual([os.path.getmtime(p) for p in saved], mtimes)
+            self.assertRaises(ValueError, save_indexes, words, path, ["suffixes"])
+
+if __name__ == '__main__':
+    unittest.main()
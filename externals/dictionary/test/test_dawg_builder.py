@@ -0,0 +1,51 @@
+import unittest
+
+from ..dawg_builder import DawgBuilder
+from ..packed_dictionary import PackedDictionary
+
+class TestDawgBuilder(unittest.TestCase):
+
+    def build(self, words):
+        builder = DawgBuilder().add_all(words)
+        dic = PackedDictionary("test")
+        dic._set_table(*builder.encode())
+        return builder, dic
+
+    def test_builds_word_list(self):
+        words = ["CAT", "CATS", "DOG", "DOGS", "DO", "ZOO"]
+        builder, dic = self.build(sorted(words))
+
+        out = []
+        dic.each_word(out.append)
+        self.assertEqual(sorted(out), sorted(words))
+        self.assertEqual(builder.number_of_words, len(words))
+        self.assertFalse(dic.has_word("CA"))
+        self.assertFalse(dic.has_word("DOGSS"))
+
+    def test_minimizes_shared_suffixes(self):
+        builder, dic = self.build(["BAT", "BATS", "CAT", "CATS", "HAT", "HATS"])
+
+        # Root chain B C H, then a single A T S path shared by all words
+        self.assertEqual(len(dic), 6)
+        self.assertEqual(builder.number_of_states, 5)
+
+    def test_requires_sorted_words(self):
+        builder = DawgBuilder()
+        builder.add("DOG")
+        self.assertFalse(builder.add("DOG"))
+        self.assertRaises(ValueError, builder.add, "CAT")
+
+        builder.finish()
+        self.assertRaises(ValueError, builder.add, "EMU")
+
+    def test_round_trips_dict_format(self):
+        from io import BytesIO
+        builder, dic = self.build(["ANT", "TAN"])
+
+        loaded = PackedDictionary("test").load_dawg(BytesIO(builder.to_bytes()))
+        self.assertTrue(loaded.has_word("ANT"))
+        self.assertTrue(loaded.has_word("TAN"))
+        self.assertEqual(len(loaded), len(dic))
+
+if __name__ == "__main__":
+    unittest.main()
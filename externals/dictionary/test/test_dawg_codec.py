@@ -0,0 +1,58 @@
+import os
+import unittest
+from io import BytesIO
+
+from ..dawg_codec import decode_dawg, read_dawg_file, write_dawg_file, read_node_table
+from ..dawg_builder import DawgBuilder
+from ..letter_node import LetterNode
+from game.utils import get_absolute_path
+
+class TestDawgCodec(unittest.TestCase):
+
+    def test_matches_node_decoder(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(os.path.join(os.path.dirname(__file__), 'data', dict_path), 'rb') as f:
+            data = f.read()
+
+        table = decode_dawg(BytesIO(data))
+        self.assertEqual(len(table), int.from_bytes(data[:4], 'big'))
+
+        for i in range(len(table)):
+            offset = 4 + i * 8
+            node = LetterNode(chr(int.from_bytes(data[offset:offset + 4], 'big')))
+            node.decode(i, int.from_bytes(data[offset + 4:offset + 8], 'big'))
+
+            self.assertEqual(chr(table.letters[i]), node.letter)
+            self.assertEqual(bool(table.is_end_of_word[i]), node.isEndOfWord)
+            self.assertEqual(bool(table.is_end_of_list[i]), node.next is None)
+            self.assertEqual(int(table.child[i]), node.child or 0)
+
+    def test_rejects_truncated_data(self):
+        data = (2).to_bytes(4, 'big') + (ord('A')).to_bytes(4, 'big') + (3).to_bytes(4, 'big')
+        self.assertRaises(ValueError, decode_dawg, BytesIO(data))
+
+    def test_round_trips_v2(self):
+        builder = DawgBuilder().add_all(["CAT", "CATS", "DOG", "ÇAY"])
+        letters, info = builder.encode()
+        data = write_dawg_file(letters, info, builder.number_of_words, {b'TEST': b'payload'})
+
+        dawg = read_dawg_file(BytesIO(data))
+        self.assertEqual(dawg.version, 2)
+        self.assertEqual(dawg.number_of_words, 4)
+        self.assertEqual(dawg.alphabet, ['A', 'C', 'D', 'G', 'O', 'S', 'T', 'Y', 'Ç'])
+        self.assertEqual(dawg.sections, {b'TEST': b'payload'})
+        self.assertTrue((dawg.letters == letters).all())
+        self.assertTrue((dawg.info == info).all())
+
+        # 4 bits of letter index, 4 of child index and 2 flags fit a record in 2 bytes, instead of 8 in v1
+        self.assertEqual(len(data), 8 + 2 + 9 * 4 + 8 + 2 + 2 * len(letters) + 2 + 4 + 4 + 7 + 4)
+
+    def test_rejects_corrupt_v2(self):
+        builder = DawgBuilder().add_all(["CAT", "DOG"])
+        data = bytearray(write_dawg_file(*builder.encode(), builder.number_of_words))
+        data[-6] ^= 0x01
+        self.assertRaises(ValueError, read_node_table, BytesIO(bytes(data)))
+        self.assertRaises(ValueError, read_node_table, BytesIO(bytes(data[:-4])))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,6 +71,26 @@ class TestDictionary(unittest.TestCase):
 
         self.assertTrue(dic.has_sequence("VAAR"))
 
+    def test_adds_words_to_a_dawg(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(dict_path, 'rb') as f:
+            dic = Dictionary("test").load_dawg(BytesIO(f.read()))
+        dic.add_links()
+        before = set(dic.iter_words())
+
+        # Suffixes are shared in the DAWG: adding below one path must not add below the others
+        words = ["LAZYS", "QUICKS", "AARDVAARK", "HANGMENZ", "HANG", ""]
+        self.assertEqual(dic.add_words(words), 5)
+        self.assertEqual(dic.add_words(["LAZYS", "LAZY"]), 0)
+        self.assertEqual(set(dic.iter_words()), before | set(words[:-1]))
+
+        node = dic.match("HANGMENZ")
+        self.assertTrue(node.isEndOfWord)
+        self.assertEqual(node.preLetters, ['N'])
+        self.assertEqual(dic.match("HANGMEN").postNodes, [node])
+        self.assertIn(node, dic.get_sequence_roots('Z'))
+        self.assertTrue(dic.has_sequence("MENZ"))
+
     def test_builds_links(self):
         dic = Dictionary("test")
         dic.add_word('A')
@@ -103,5 +123,28 @@ class TestDictionary(unittest.TestCase):
         self.assertEqual(dic.find_hangmen("H NGMEN"), ['HANGMEN', 'HUNGMEN'])
         self.assertEqual(dic.find_hangmen("H NGMENS"), [])
 
+    def test_has_words(self):
+        dic = Dictionary("test")
+        for word in ['A', 'ANT', 'ANTS', 'TAN', 'TANS']:
+            dic.add_word(word)
+
+        words = ['TANS', 'ANT', 'AN', '', 'ANTSY', 'ANT', 'TA', 'A', 'Z']
+        self.assertEqual(dic.has_words(words),
+                         [True, True, False, False, False, True, False, True, False])
+        self.assertEqual(Dictionary("empty").has_words(['A']), [False])
+
+    def test_iter_words(self):
+        dic = Dictionary("test")
+        for word in ['A', 'ANT', 'ANTS', 'TAN', 'TANS', 'TEA']:
+            dic.add_word(word)
+
+        self.assertEqual(list(dic.iter_words()), ['A', 'ANT', 'ANTS', 'TAN', 'TANS', 'TEA'])
+        self.assertEqual(list(dic.iter_words(prefix='ANT')), ['ANT', 'ANTS'])
+        self.assertEqual(list(dic.iter_words(prefix='TA', max_len=3)), ['TAN'])
+        self.assertEqual(list(dic.iter_words(min_len=4)), ['ANTS', 'TANS'])
+        self.assertEqual(list(dic.iter_words(letters='ANT')), ['A', 'ANT', 'TAN'])
+        self.assertEqual(list(dic.iter_words(prefix='S')), [])
+        self.assertEqual(list(Dictionary("empty").iter_words()), [])
+
 if __name__ == '__main__':
     unittest.main()
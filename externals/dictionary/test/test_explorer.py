@@ -0,0 +1,78 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from ..packed_dictionary import PackedDictionary
+from ..explorer import Explorer
+from ..factor_index import FactorIndex
+from ..explore import main
+from game.utils import get_absolute_path
+
+class TestExplorer(unittest.TestCase):
+
+    def setUp(self):
+        # Batch workers build the factor index next to the dictionary, keep it out of the source tree
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dict_path = os.path.join(self.tmp.name, 'dictionary.dict')
+        shutil.copyfile(get_absolute_path('externals/dictionary/test/data/dictionary.dict'), self.dict_path)
+        self.dictionary = PackedDictionary("test").load_mmap(self.dict_path)
+        self.words = ["TAC", "H.NGMEN", "SAT", "", "EROT", "A B"]
+
+    def tearDown(self):
+        self.dictionary = None
+        self.tmp.cleanup()
+
+    def explore(self, mode, word):
+        found = []
+        try:
+            Explorer.MODES[mode](self.dictionary, [word], found.append)
+        except ValueError:
+            pass
+        return found
+
+    def test_batch(self):
+        for mode in ("anagrams", "hangmen", "arrangements"):
+            expected = [(word, self.explore(mode, word)) for word in self.words]
+            for workers in (1, 2):
+                found = list(Explorer.batch(self.dict_path, mode, self.words, workers=workers, chunk_size=2))
+                self.assertEqual(found, expected, (mode, workers))
+        self.assertRaises(ValueError, lambda: list(Explorer.batch(self.dict_path, "unknown", self.words)))
+
+    def test_batch_cold_cache(self):
+        # The workers start before any factor index is saved next to the dictionary
+        words = ["UZZL", "TAC", "QQQ", "AN", "ING", "ZZZ"] * 4
+        expected = [(word, self.explore("sequences", word)) for word in words]
+
+        # Forked workers inherit the counting build, which logs the process building the index
+        builds_path = os.path.join(self.tmp.name, 'builds')
+        build = FactorIndex.build
+
+        def counting_build(index, words):
+            with open(builds_path, 'a') as f:
+                f.write(f"{os.getpid()}\n")
+            return build(index, words)
+
+        FactorIndex.build = counting_build
+        try:
+            found = list(Explorer.batch(self.dict_path, "sequences", words, workers=4, chunk_size=1))
+        finally:
+            FactorIndex.build = build
+        self.assertEqual(found, expected)
+        with open(builds_path) as f:
+            self.assertEqual(f.read().split(), [str(os.getpid())])
+        self.assertTrue(os.path.exists(FactorIndex.path_for(self.dict_path)))
+
+    def test_main(self):
+        output = io.StringIO()
+        input_path = get_absolute_path('externals/dictionary/test/data/racks.txt')
+        with redirect_stdout(output):
+            self.assertEqual(main(["anagrams", self.dict_path, input_path, "--workers", "1"]), 0)
+        lines = output.getvalue().splitlines()
+        self.assertEqual([line.split('\t')[0] for line in lines], ["TAC", "EROT"])
+        self.assertEqual(lines[0].split('\t')[1].split(), self.explore("anagrams", "TAC"))
+
+if __name__ == '__main__':
+    unittest.main()
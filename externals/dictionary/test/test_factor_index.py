@@ -0,0 +1,37 @@
+import unittest
+
+from ..dictionary import Dictionary
+from ..factor_index import FactorIndex
+
+class TestFactorIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["CARE", "CAR", "ARC", "RACE", "ACE", "ZOO"]
+        self.dic = Dictionary("test")
+        for word in self.words:
+            self.dic.add_word(word)
+        self.index = FactorIndex("test").build(self.words)
+
+    def test_matches_sequence_roots(self):
+        sequences = {word[i:j] for word in self.words
+                     for i in range(len(word)) for j in range(i + 1, len(word) + 1)}
+        sequences |= {"CC", "ERA", "OZ", "AZ", "RACER", "ARCE"}
+        for seq in sorted(sequences):
+            self.assertEqual(self.index.has_sequence(seq), self.dic.has_sequence(seq), seq)
+
+    def test_dictionary_uses_index(self):
+        self.dic.set_factor_index(self.index)
+
+        self.assertTrue(self.dic.has_sequence("AC"))
+        self.assertFalse(self.dic.has_sequence("CC"))
+        self.assertIsNone(self.dic.find_sequence("CC"))
+        self.assertEqual(self.dic.find_sequence("RAC").letter, "R")
+        self.assertRaises(ValueError, self.dic.has_sequence, "QA")
+
+        # The index no longer matches the words once one is added
+        self.dic.add_word("ACCRA")
+        self.assertIsNone(self.dic.factor_index)
+        self.assertTrue(self.dic.has_sequence("CC"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..dawg_builder import DawgBuilder
+from ..gaddag import Gaddag
+from ..cached_automaton import CachedAutomaton
+
+class TestGaddag(unittest.TestCase):
+
+    def setUp(self):
+        self.words = ["CARE", "CAR", "ARC", "RACE", "ACE"]
+        self.gaddag = Gaddag("test").build(self.words)
+
+    def test_paths_of(self):
+        self.assertEqual(Gaddag.paths_of("CAR"), ["RAC", "C^AR", "AC^R"])
+
+    def test_has_word(self):
+        for word in self.words:
+            self.assertTrue(self.gaddag.has_word(word))
+        self.assertFalse(self.gaddag.has_word("CA"))
+        self.assertFalse(self.gaddag.has_word("ERAC"))
+
+    def test_reaches_words_from_any_letter(self):
+        # Start on the R of CARE, go left over A and C, then right over E
+        node = self.gaddag.find(0, "R")
+        for letter in "AC" + Gaddag.SEPARATOR + "E":
+            node = self.gaddag.find(self.gaddag.child_index(node), letter)
+            self.assertGreaterEqual(node, 0)
+        self.assertTrue(self.gaddag.is_end_of_word(node))
+
+        letters = [letter for letter, _ in self.gaddag.arcs(0)]
+        self.assertEqual(letters, sorted(set("".join(self.words))))
+
+    def test_load_or_build_caches_next_to_dictionary(self):
+        folder = tempfile.mkdtemp()
+        try:
+            dict_path = os.path.join(folder, "words.dict")
+            with open(dict_path, 'wb') as f:
+                f.write(DawgBuilder().add_all(sorted(self.words)).to_bytes())
+
+            built = Gaddag.load_or_build(dict_path)
+            # Written through a temporary file renamed over the cache
+            self.assertEqual(sorted(os.listdir(folder)), ["words.dict", "words.gaddag"])
+
+            loaded = Gaddag.load_or_build(dict_path)
+            self.assertEqual(len(loaded), len(built))
+            self.assertEqual(len(loaded), len(self.gaddag))
+            self.assertTrue(all(loaded.has_word(word) for word in self.words))
+        finally:
+            shutil.rmtree(folder)
+
+    def test_build_is_abstract(self):
+        self.assertRaises(TypeError, CachedAutomaton, "test")
+
+if __name__ == "__main__":
+    unittest.main()
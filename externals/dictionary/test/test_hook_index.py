@@ -0,0 +1,40 @@
+import unittest
+from io import BytesIO
+
+from ..dictionary import Dictionary
+from ..hook_index import HookIndex
+from ..letter_index import LetterIndex
+from game.utils import get_absolute_path
+
+class TestHookIndex(unittest.TestCase):
+
+    def setUp(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(dict_path, 'rb') as f:
+            self.dictionary = Dictionary("test").load_dawg(BytesIO(f.read()))
+        self.letter_index = LetterIndex("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+    def test_masks(self):
+        hooks = HookIndex(self.dictionary, self.letter_index, max_length=3)
+        letters = self.letter_index.letters
+        for left, right in [("", "AT"), ("CA", ""), ("C", "T"), ("", "ZZZZZZ"), ("HANGM", "N"), ("", "ANGMEN"), ("QX", "")]:
+            words = [left + letter + right for letter in letters]
+            expected = self.letter_index.mask(l for l, w in zip(letters, words) if self.dictionary.has_word(w))
+            self.assertEqual(hooks.word_mask(left, right), expected, f"{left}_{right}")
+
+            expected = 0
+            for letter, word in zip(letters, words):
+                try:
+                    if self.dictionary.has_sequence(word):
+                        expected |= self.letter_index.mask(letter)
+                except ValueError:
+                    pass
+            self.assertEqual(hooks.sequence_mask(left, right), expected, f"{left}_{right}")
+
+        # Short words are precomputed, longer ones remembered once asked
+        self.assertEqual(self.letter_index.letters_of(hooks.hooks[("", "IG")]), ["B"])
+        self.assertIn(("HANGM", "N"), hooks.words)
+        self.assertEqual(self.letter_index.letters_of(hooks.word_mask("HANGM", "N")), ["A", "E"])
+
+if __name__ == '__main__':
+    unittest.main()
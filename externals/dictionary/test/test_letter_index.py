@@ -0,0 +1,37 @@
+import unittest
+from io import BytesIO
+
+from ..letter_index import LetterIndex
+from ..compile import compile_lexicon
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary
+
+class TestLetterIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LetterIndex("ABCÇDEFGĞHIİJKLMNOÖPRSŞTUÜVYZ")
+
+    def test_indices(self):
+        self.assertEqual(len(self.index), 29)
+        self.assertEqual(self.index.index('Ç'), 3)
+        self.assertEqual(self.index.encode("ŞİŞE"), [22, 11, 22, 5])
+        self.assertEqual(self.index.decode([22, 11, 22, 5]), "ŞİŞE")
+        self.assertNotIn('W', self.index)
+        self.assertRaises(ValueError, self.index.index, 'W')
+
+    def test_masks(self):
+        mask = self.index.mask("ZİAWA")  # W is ignored
+        self.assertEqual(mask, 1 << 0 | 1 << 11 | 1 << 28)
+        self.assertEqual(self.index.letters_of(mask), ['A', 'İ', 'Z'])
+        self.assertEqual(self.index.letters_of(self.index.full_mask), list(self.index.letters))
+        self.assertEqual(self.index.missing("WAXİ"), ['W', 'X'])
+
+    def test_dictionary_letters(self):
+        data = compile_lexicon(["ŞİŞE", "ÇAY", "AY"])
+        for dic in (Dictionary("test"), PackedDictionary("test")):
+            dic.load_dawg(BytesIO(data))
+            self.assertEqual(dic.get_letters(), ['A', 'E', 'Y', 'Ç', 'İ', 'Ş'])
+            self.assertEqual(self.index.missing(dic.get_letters()), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from io import BytesIO
+
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary
+from ..overlay import OverlayDictionary
+from game.utils import get_absolute_path
+
+class TestOverlay(unittest.TestCase):
+
+    def setUp(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(dict_path, 'rb') as f:
+            self.data = f.read()
+
+    def test_overlay(self):
+        for base in [Dictionary("test").load_dawg(BytesIO(self.data)).freeze(),
+                     PackedDictionary("test").load_dawg(BytesIO(self.data)).freeze()]:
+            words = list(base.iter_words())
+            overlay = OverlayDictionary(base)
+            self.assertEqual(overlay.add_words(["QXZ", "QXZS", "LAZY", ""]), 2)
+            self.assertEqual(overlay.remove_words(["LAZY", "HANGMEN", "ZXQ"]), 2)
+            expected = sorted(set(words).union(["QXZ", "QXZS"]).difference(["LAZY", "HANGMEN"]))
+
+            # The base is unchanged and the delta only holds the new words
+            self.assertEqual(list(base.iter_words()), words)
+            self.assertEqual(list(overlay.added.iter_words()), ["QXZ", "QXZS"])
+
+            self.assertEqual(list(overlay.iter_words()), expected)
+            self.assertEqual(overlay.has_words(["QXZ", "LAZY", "HANGMEN", "HUNGMEN"]), [True, False, False, True])
+            self.assertFalse(overlay.has_word("LAZY"))
+            self.assertTrue(overlay.has_sequence("QXZ"))
+            self.assertTrue(overlay.has_sequence("XZ"))
+            self.assertFalse(overlay.has_sequence("QXA"))
+            self.assertEqual(len(overlay.get_sequence_roots("X")), len(base.get_sequence_roots("X")) + 1)
+            self.assertEqual(list(overlay.find_pattern("Q??*")), [w for w in expected if w.startswith("Q") and len(w) >= 3])
+            self.assertEqual(overlay.find_hangmen("H NGMEN"), ["HUNGMEN"])
+            anagrams = overlay.find_anagrams("ZXQ YAL")
+            self.assertIn("QXZ", anagrams)
+            self.assertNotIn("LAZY", anagrams)
+            self.assertEqual(list(anagrams), sorted(anagrams))
+            self.assertTrue(overlay.get_gaddag().has_word("QXZS"))
+
+            # Words come back, and a frozen overlay rejects changes
+            self.assertEqual(overlay.add_words(["LAZY"]), 1)
+            self.assertTrue(overlay.has_word("LAZY"))
+            copy = overlay.copy()
+            overlay.freeze()
+            self.assertRaises(ValueError, overlay.add_words, ["ZXQ"])
+            self.assertRaises(ValueError, overlay.remove_words, ["QXZ"])
+            self.assertEqual(copy.remove_words(["QXZ"]), 1)
+            self.assertTrue(overlay.has_word("QXZ"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import unittest
+from io import BytesIO
+
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary, PackedNode
+from game.utils import get_absolute_path
+
+class TestPackedDictionary(unittest.TestCase):
+
+    def setUp(self):
+        self.dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(os.path.join(os.path.dirname(__file__), 'data', self.dict_path), 'rb') as f:
+            self.data = f.read()
+
+    def load(self) -> PackedDictionary:
+        return PackedDictionary("test").load_dawg(BytesIO(self.data))
+
+    def test_loads_a_dictionary(self):
+        dic = self.load()
+
+        self.assertTrue(dic.has_word('LAZY'))
+        self.assertFalse(dic.has_word('LAZ'))
+        self.assertFalse(dic.has_word(''))
+        self.assertFalse(dic.match("AXE"))
+        self.assertEqual(dic.match("LAZY").letter, 'Y')
+        self.assertTrue(dic.match("LAZY").isEndOfWord)
+
+    def test_maps_a_dictionary(self):
+        dic = PackedDictionary("test").load_mmap(self.dict_path)
+        loaded = self.load()
+
+        # The node table is used in place, not copied out of the mapping
+        self.assertFalse(dic.letters.flags.owndata)
+        self.assertFalse(dic.info.flags.writeable)
+        self.assertTrue((dic.letters == loaded.letters).all())
+        self.assertTrue((dic.info == loaded.info).all())
+
+        self.assertTrue(dic.has_word('LAZY'))
+        self.assertEqual(dic.find_hangmen("H NGMEN"), ['HANGMEN', 'HUNGMEN'])
+        self.assertEqual(dic.add_links().match("LAZ").postLetters, ['Y'])
+
+    def test_same_words_as_object_graph(self):
+        dic = self.load()
+        reference = Dictionary("test").load_dawg(BytesIO(self.data))
+
+        expected = []
+        reference.each_word(expected.append)
+        words = []
+        dic.each_word(words.append)
+        self.assertEqual(words, expected)
+
+        for word in expected:
+            self.assertTrue(dic.has_word(word))
+
+    def test_hangmen(self):
+        dic = self.load()
+
+        self.assertEqual(dic.find_hangmen("H NGM N"), ['HANGMAN', 'HANGMEN', 'HUNGMAN', 'HUNGMEN'])
+        self.assertEqual(dic.find_hangmen("H NGMEN"), ['HANGMEN', 'HUNGMEN'])
+        self.assertEqual(dic.find_hangmen("H NGMENS"), [])
+
+    def test_has_words(self):
+        dic = self.load()
+        reference = Dictionary("test").load_dawg(BytesIO(self.data))
+
+        words = ['LAZY', 'LAZ', 'LAZYS', 'QUICK', 'QUICKLY', '', 'HANGMEN', 'HANGMAN', 'ZZZ', 'A']
+        expected = [len(word) > 0 and reference.has_word(word) for word in words]
+        self.assertEqual(dic.has_words(words), expected)
+        self.assertEqual(reference.has_words(words), expected)
+        self.assertEqual(PackedDictionary("empty").has_words(['A']), [False])
+
+    def test_anagrams(self):
+        dic = self.load()
+        reference = Dictionary("test").load_dawg(BytesIO(self.data))
+
+        for rack in ["LAZY", "QUICK", "E AM LE", "DOG  ", "HNGMNAE"]:
+            self.assertEqual(dic.find_anagrams(rack), reference.find_anagrams(rack), rack)
+
+    def test_sequences(self):
+        dic = self.load()
+
+        self.assertTrue(dic.has_sequence("AZ"))
+        self.assertTrue(dic.has_sequence("UIC"))
+        self.assertFalse(dic.has_sequence("QX"))
+        self.assertRaises(ValueError, dic.has_sequence, "#")
+
+    def test_builds_links(self):
+        dic = self.load().add_links()
+
+        node = dic.match("LAZ")
+        self.assertEqual(node.postLetters, ['Y'])
+        self.assertEqual(node.postNodes[0], dic.match("LAZY"))
+
+        # Shared nodes link back to one of the nodes leading to them
+        leaf = dic.match("LAZY")
+        self.assertEqual(len(leaf.preNodes), 1)
+        self.assertIn(leaf, leaf.preNodes[0].postNodes)
+        self.assertEqual(leaf.preLetters, [leaf.preNodes[0].letter])
+        self.assertEqual(dic.root.preNodes, [])
+
+        roots = dic.get_sequence_roots('Z')
+        self.assertTrue(len(roots) > 0)
+        self.assertTrue(all(isinstance(root, PackedNode) and root.letter == 'Z' for root in roots))
+
+    def test_iter_words(self):
+        dic = self.load()
+        reference = Dictionary("test").load_dawg(BytesIO(self.data))
+
+        self.assertEqual(list(dic.iter_words()), list(reference.iter_words()))
+        for prefix, min_len, max_len, letters in [('LA', 0, None, None), ('', 7, 7, None), ('H', 0, None, 'HANGMEN'), ('QX', 0, None, None)]:
+            self.assertEqual(list(dic.iter_words(prefix, min_len, max_len, letters)),
+                             list(reference.iter_words(prefix, min_len, max_len, letters)))
+        self.assertIn('LAZY', dic.iter_words(prefix='LA', max_len=4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from io import BytesIO
+
+from ..pattern import Pattern
+from ..dictionary import Dictionary
+from ..packed_dictionary import PackedDictionary
+from ..explorer import Explorer
+from game.utils import get_absolute_path
+
+class TestPattern(unittest.TestCase):
+
+    def setUp(self):
+        dict_path = get_absolute_path('externals/dictionary/test/data/dictionary.dict')
+        with open(dict_path, 'rb') as f:
+            self.data = f.read()
+
+    def test_matches(self):
+        cases = {
+            "?AT*":      (["CAT", "BATS", "HATTER"], ["AT", "CART", "CAB"]),
+            "[AEIOU]?S": (["ASS", "ENS", "OPS"], ["BUS", "AS", "ABSS"]),
+            "[^AEIOU]{2}": (["BC", "ZZ"], ["AB", "B", "BCD"]),
+            "Q?{2,3}":   (["QAT", "QATS"], ["QA", "QUITS"]),
+            "A{2,}B":    (["AAB", "AAAAB"], ["AB", "AABB"]),
+            "*ING":      (["ING", "SINGING"], ["INGS"]),
+            "c*t":       (["CT", "CAT", "COUNT"], ["CA"]),
+            "":          ([""], ["A"]),
+        }
+        for text, (matching, others) in cases.items():
+            pattern = Pattern(text)
+            for word in matching:
+                self.assertTrue(pattern.matches(word), f"{text} {word}")
+            for word in others:
+                self.assertFalse(pattern.matches(word), f"{text} {word}")
+
+        self.assertEqual(Pattern("?A*").max_length > 100, True)
+        self.assertEqual((Pattern("A?{1,3}").min_length, Pattern("A?{1,3}").max_length), (2, 4))
+
+    def test_rejects_bad_patterns(self):
+        for text in ["[AB", "A{2", "A{3,1}", "A{X}", "[]", "A}", "{2}"]:
+            self.assertRaises(ValueError, Pattern, text)
+
+    def test_find_pattern(self):
+        dictionaries = [Dictionary("test").load_dawg(BytesIO(self.data)),
+                        PackedDictionary("test").load_dawg(BytesIO(self.data))]
+        words = list(dictionaries[0].iter_words())
+        for text in ["?AZY", "H*N", "[AEIOU]*", "*[^AEIOU]{3}", "L?{2,3}", "*"]:
+            pattern = Pattern(text)
+            expected = [word for word in words if pattern.matches(word)]
+            for dic in dictionaries:
+                self.assertEqual(list(dic.find_pattern(text)), expected)
+        for dic in dictionaries:
+            self.assertEqual(list(dic.find_pattern("*", min_len=3, max_len=3)), [w for w in words if len(w) == 3])
+            self.assertEqual(dic.find_hangmen("H NGMEN"), ['HANGMEN', 'HUNGMEN'])
+
+    def test_explorer(self):
+        dic = Dictionary("test").load_dawg(BytesIO(self.data))
+        found = []
+        Explorer.hangmen(dic, ["H.NGMEN"], found.append)
+        Explorer.patterns(dic, ["HUNG*N"], found.append)
+        self.assertEqual(found, ['HANGMEN', 'HUNGMEN', 'HUNGMAN', 'HUNGMEN'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import threading
+import unittest
+
+from ..dictionary import Dictionary
+from ..registry import DictionaryRegistry
+
+class TestDictionaryRegistry(unittest.TestCase):
+
+    def loader(self) -> Dictionary:
+        self.loads += 1
+        dic = Dictionary("test")
+        dic.add_word("ANT")
+        dic.add_word("TAN")
+        return dic.freeze()
+
+    def setUp(self):
+        self.loads = 0
+
+    def test_shares_dictionaries(self):
+        registry = DictionaryRegistry(idle_timeout=600)
+
+        first = registry.acquire("test", self.loader)
+        second = registry.acquire("test", self.loader)
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(registry.references("test"), 2)
+        self.assertEqual((registry.loads, registry.hits), (1, 1))
+
+        other = registry.acquire("other", self.loader)
+        self.assertIsNot(first, other)
+        self.assertEqual(self.loads, 2)
+
+    def test_shared_dictionary_is_frozen(self):
+        registry = DictionaryRegistry()
+        dic = registry.acquire("test", self.loader)
+
+        self.assertTrue(dic.has_word("ANT"))
+        self.assertEqual(len(dic.get_sequence_roots("N")), 2)
+        self.assertRaises(ValueError, dic.add_word, "NAT")
+
+    def test_keeps_referenced_dictionaries(self):
+        registry = DictionaryRegistry(idle_timeout=0)
+
+        registry.acquire("test", self.loader)
+        registry.acquire("test", self.loader)
+        registry.release("test")
+        self.assertEqual(registry.evict_idle(), [])
+        self.assertIn("test", registry)
+
+        registry.release("test")
+        self.assertNotIn("test", registry)
+        self.assertEqual(registry.evictions, 1)
+
+        # Releasing more than acquired is harmless
+        registry.release("test")
+        registry.acquire("test", self.loader)
+        self.assertEqual(self.loads, 2)
+
+    def test_keeps_idle_dictionaries_warm(self):
+        registry = DictionaryRegistry(idle_timeout=600)
+
+        first = registry.acquire("test", self.loader)
+        registry.release("test")
+        self.assertEqual(registry.evict_idle(), [])
+        self.assertIs(registry.get("test"), first)
+        self.assertIs(registry.acquire("test", self.loader), first)
+        self.assertEqual(self.loads, 1)
+
+    def test_release_while_loading(self):
+        registry = DictionaryRegistry(idle_timeout=0)
+        registry.acquire("other", self.loader)
+
+        def loader() -> Dictionary:
+            # As a finalizer run by the garbage collector during a load would
+            registry.release("other")
+            return self.loader()
+
+        registry.acquire("test", loader)
+        self.assertNotIn("other", registry)
+        self.assertIn("test", registry)
+
+    def test_loads_outside_the_lock(self):
+        registry = DictionaryRegistry()
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_loader() -> Dictionary:
+            started.set()
+            finish.wait(5)
+            return self.loader()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.acquire("slow", slow_loader))) for _ in range(2)]
+        threads[0].start()
+        started.wait(5)
+        threads[1].start()
+
+        # Other keys are served while the slow one loads
+        self.assertTrue(registry.acquire("test", self.loader).has_word("ANT"))
+        registry.release("test")
+        self.assertNotIn("slow", registry)
+
+        finish.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(registry.references("slow"), 2)
+        self.assertEqual(self.loads, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import sys
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .letter_node import LetterNode
+
+class WordFilter:
+    """
+    @class WordFilter
+    @brief Constraints on the words listed by iter_words.
+    """
+    __slots__ = ('prefix', 'min_len', 'max_len', 'allowed')
+
+    def __init__(self, prefix: str = "", min_len: int = 0, max_len: Optional[int] = None,
+                 letters: Optional[Iterable[str]] = None):
+        """
+        @param prefix: words must start with the prefix
+        @param min_len: shortest length listed
+        @param max_len: longest length listed, None for no limit
+        @param letters: letters words may be made of, None for any
+        """
+        self.prefix: str = prefix
+        self.min_len: int = min_len
+        self.max_len: int = max_len if max_len is not None else sys.maxsize
+        self.allowed: Optional[FrozenSet[str]] = frozenset(letters) if letters is not None else None
+
+    def accepts_prefix(self) -> bool:
+        """
+        @brief Can any word starting with the prefix pass the filter?
+        """
+        if len(self.prefix) > self.max_len:
+            return False
+        return self.allowed is None or all(ch in self.allowed for ch in self.prefix)
+
+    def accepts_word(self, word: str) -> bool:
+        """
+        @brief Does a word starting with the prefix pass the filter?
+        """
+        return self.min_len <= len(word) <= self.max_len
+
+def iter_words_in_nodes(first: Optional[LetterNode], word_filter: WordFilter) -> Iterator[str]:
+    """
+    @brief List, in sorted order, the words below a LetterNode chain.
+    The graph is walked depth first with an explicit stack of the siblings
+    still to be visited, each with the word spelt above it.
+
+    @param first: first node of the chain following the prefix, the root for no prefix
+    @param word_filter: constraints on the words
+    @return: generator of the words, prefix included
+    """
+    allowed = word_filter.allowed
+    min_len = word_filter.min_len
+    max_len = word_filter.max_len
+    if first is None or len(word_filter.prefix) >= max_len:
+        return
+    stack: List[Tuple[LetterNode, str]] = [(first, word_filter.prefix)]
+    while stack:
+        node, above = stack.pop()
+        while node is not None:
+            letter = node.letter
+            following = node.next
+            if allowed is not None and letter not in allowed:
+                node = following
+                continue
+            word = above + letter
+            if node.isEndOfWord and len(word) >= min_len:
+                yield word
+            child = node.child
+            if child is not None and len(word) < max_len:
+                if following is not None:
+                    stack.append((following, above))
+                node, above = child, word
+            else:
+                node = following
+
+def iter_words_in_table(letters: np.ndarray, info: np.ndarray, first: int, word_filter: WordFilter) -> Iterator[str]:
+    """
+    @brief List, in sorted order, the words below a chain of a packed node
+    table (see PackedDictionary), as iter_words_in_nodes does.
+
+    @param letters: code point of each node
+    @param info: encoded node information
+    @param first: index of the first node of the chain following the prefix, 0 for
+                  the root chain, -1 for none
+    @param word_filter: constraints on the words
+    @return: generator of the words, prefix included
+    """
+    allowed = word_filter.allowed
+    min_len = word_filter.min_len
+    max_len = word_filter.max_len
+    end_of_list = LetterNode.END_OF_LIST_BIT_MASK
+    end_of_word = LetterNode.END_OF_WORD_BIT_MASK
+    if first < 0 or len(letters) == 0 or len(word_filter.prefix) >= max_len:
+        return
+    stack: List[Tuple[int, str]] = [(first, word_filter.prefix)]
+    while stack:
+        i, above = stack.pop()
+        while i >= 0:
+            numb = info.item(i)
+            following = -1 if numb & end_of_list else i + 1
+            letter = chr(letters.item(i))
+            if allowed is not None and letter not in allowed:
+                i = following
+                continue
+            word = above + letter
+            if numb & end_of_word and len(word) >= min_len:
+                yield word
+            child = (numb >> LetterNode.CHILD_INDEX_SHIFT) & LetterNode.CHILD_INDEX_BIT_MASK
+            if child and len(word) < max_len:
+                if following >= 0:
+                    stack.append((following, above))
+                i, above = child, word
+            else:
+                i = following
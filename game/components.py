@@ -1,10 +1,10 @@
 import os
 import random
+import weakref
 import copy
 import heapq
 
-from io import BytesIO
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Set, Tuple, Optional
 from deprecated import deprecated
 from dataclasses import dataclass
 
@@ -12,7 +12,9 @@ import numpy as np
 
 from .globals import *
 from .utils import *
-from externals.dictionary import Dictionary, LetterNode
+from .enums import DictionaryBackend, MoveGenerator
+from externals.dictionary import Dictionary, LetterNode, PackedDictionary, PackedNode, DictionaryRegistry, Gaddag, FactorIndex, AlphagramIndex, LetterIndex, OverlayDictionary, HookIndex
+from externals.dictionary.compile import read_lexicon
 
 class TileBag:
     """
@@ -237,39 +239,282 @@ class Rack:
         """
         return str(self.__container)
 
+class RackVector:
+    """
+    @brief Tiles of a rack as counts indexed by a LetterIndex, plus a counter
+    of blanks, for the move generator.
+
+    @description A letter is played by decrementing its count and given back
+    by incrementing it when the search backtracks, so the rack is never
+    copied. A real tile is always preferred over a blank.
+    """
+    __slots__ = ('counts', 'points', 'blanks', 'blank_point', 'mask')
+
+    def __init__(self, rack_tiles: List[TILE], letter_index: LetterIndex):
+        """
+        @param rack_tiles: tiles of the rack
+        @param letter_index: numbering of the letters of the dictionary
+        """
+        self.counts: List[int] = [0] * len(letter_index)  # Number of tiles left for each letter
+        self.points: List[int] = [0] * len(letter_index)  # Point of the tiles of each letter
+        self.blanks: int = 0                               # Number of blanks left
+        self.blank_point: int = 0                          # Point of a blank
+        self.mask: int = 0                                 # Mask of the letters with tiles left
+        for tile in rack_tiles:
+            if tile.is_blank:
+                self.blanks += 1
+                self.blank_point = tile.point
+                continue
+            i = letter_index.indices.get(tile.letter)
+            if i is not None:
+                # Letters outside the alphabet can't be played
+                self.counts[i] += 1
+                self.points[i] = max(self.points[i], tile.point)
+                self.mask |= 1 << i
+
 class DictionaryWrapper:
     """
     @brief Class to represent the dictionary wrapper.
     The dictionary is loaded from a file and provides methods to check if a word exists,
     find anagrams, and get letter frequencies.
+    Dictionaries are shared between games through a process-wide registry; the
+    wrapper holds a reference to its dictionary until it is closed.
     """
-    def __init__(self, language: LANGUAGE):
-        self.__alphabet: ALPHABET = language.alphabet.copy()
-        self.__uri: str = get_absolute_path(language.uri)
+    registry: DictionaryRegistry = DictionaryRegistry(idle_timeout=DICTIONARY_IDLE_TIMEOUT)
+
+    def __init__(self, language: LANGUAGE, backend: DictionaryBackend=DictionaryBackend.OBJECT_GRAPH, memo_size: int=DICTIONARY_MEMO_SIZE):
+        self.__backend: DictionaryBackend = backend
+        self.__finalizer: Optional[weakref.finalize] = None
+        self.__gaddag: Optional[Gaddag] = None
+        self.__alphagrams: Optional[AlphagramIndex] = None
+        self.__hooks: Optional[HookIndex] = None
+        self.__private: bool = False  # Has the wrapper its own overlay, with words added or removed?
+        # Answers of the shared dictionary, dropped whenever the dictionary changes
+        self.__word_memo: LRUCache = LRUCache(memo_size)
+        self.__sequence_memo: LRUCache = LRUCache(memo_size)
+        self.load_language(language)
 
-        self.__dic = Dictionary("myDictionary")
+    @staticmethod
+    def __release(keys: List[Tuple]) -> None:
+        for key in keys:
+            DictionaryWrapper.registry.release(key)
 
-        with open(os.path.join(os.path.dirname(__file__), 'data', self.__uri), 'rb') as f:
-            data = f.read()
-        self.__dic.load_dawg(BytesIO(data))
+    @staticmethod
+    def __read_whitelist(path: str) -> List[str]:
+        """
+        @brief Read the words allowed by house rules, kept one per line next to the .dict file.
+        @param path: Path of the .dict file
+        @return: Words of the whitelist, none if there is no whitelist
+        """
+        whitelist_path = os.path.splitext(path)[0] + DICTIONARY_WHITELIST_EXTENSION
+        return read_lexicon(whitelist_path) if os.path.exists(whitelist_path) else []
+
+    def __load_dictionary(self, path: str) -> Dictionary | PackedDictionary | OverlayDictionary:
+        """
+        @brief Load the dictionary file with the selected backend
+        @param path: Path of the .dict file
+        @return: Frozen, fully linked Dictionary or PackedDictionary object, under a frozen
+        overlay of the words of the whitelist if there is one
+        """
+        if self.__backend == DictionaryBackend.MAPPED:
+            dic = PackedDictionary("myDictionary").load_mmap(path)
+        else:
+            dic = PackedDictionary("myDictionary") if self.__backend == DictionaryBackend.PACKED else Dictionary("myDictionary")
+            with open(path, 'rb') as f:
+                dic.load_dawg(f)
+
+        # Cross-checks ask has_sequence for every empty cell and letter
+        dic.set_factor_index(FactorIndex.load_or_build(path)).freeze()
+
+        whitelist = DictionaryWrapper.__read_whitelist(path)
+        if whitelist:
+            overlay = OverlayDictionary(dic)
+            overlay.add_words(whitelist)
+            return overlay.freeze()
+        return dic
 
     def load_language(self, language: LANGUAGE) -> None:
         """
         @brief Load a new language dictionary
         @param language: Language object
         """
+        uri = get_absolute_path(language.uri)
+        path = os.path.join(os.path.dirname(__file__), 'data', uri)
+        if not os.path.isfile(path):
+            # Keep the dictionary loaded so far
+            raise ValueError(f"Dictionary {language.uri} not found: {path}")
+
+        self.close()
+
         self.__alphabet: ALPHABET = language.alphabet.copy()
-        self.__uri: str = get_absolute_path(language.uri)
+        self.__uri: str = uri
+
+        self.__path: str = path
+        key = (self.__path, self.__backend)
+        self.__dic = self.__acquire(key, lambda: self.__load_dictionary(self.__path))
+        self.__private = False
+        self.__clear_memos()
+
+        # The board engine works on letter indices. Letters of the dictionary without tiles get none,
+        # and the words using them cannot be played
+        self.__letter_index: LetterIndex = LetterIndex(letter for letter in self.__alphabet if letter != BLANK_LETTER)
+        self.__unplayable_letters: Set[str] = set(self.__letter_index.missing(self.__dic.get_letters()))
+        if self.__unplayable_letters:
+            print(f"Dictionary {language.uri} uses letters that are not in the alphabet: {''.join(sorted(self.__unplayable_letters))}")
+
+    def close(self) -> None:
+        """
+        @brief Release the references to the shared dictionary and its indexes.
+        The wrapper keeps working, but the dictionary may be evicted from the registry.
+        """
+        if self.__finalizer is not None:
+            self.__finalizer()
+            self.__finalizer = None
+        self.__gaddag = None
+        self.__alphagrams = None
+        self.__hooks = None
+
+    def __acquire(self, key: Tuple, loader):
+        """
+        @brief Acquire an entry of the registry, to be released by close().
+        @param key: Registry key
+        @param loader: Function loading the entry if it is not in the registry
+        @return: Shared entry
+        """
+        entry = DictionaryWrapper.registry.acquire(key, loader)
+        if self.__finalizer is None:
+            # Keys of the registry entries held; released even if the wrapper is dropped without being closed
+            self.__keys: List[Tuple] = []
+            self.__finalizer = weakref.finalize(self, DictionaryWrapper.__release, self.__keys)
+        self.__keys.append(key)
+        return entry
+
+    def get_gaddag(self) -> Gaddag:
+        """
+        @brief Get the GADDAG of the dictionary, loading it on first use.
+        The GADDAG is cached next to the .dict file, built on first use unless
+        compile --index gaddag built it, and shared through the registry.
+        @return: Gaddag object
+        """
+        if self.__gaddag is None:
+            key = (self.__path, Gaddag.EXTENSION)
+            self.__gaddag = self.__acquire(key, lambda: Gaddag.load_or_build(self.__path))
+        return self.__gaddag
+
+    def get_gaddags(self) -> List[Gaddag]:
+        """
+        @brief Get the GADDAG of the dictionary, followed by the GADDAG of the words
+        added to it if there are any. Moves are found by walking each of them.
+        @return: List of Gaddag objects
+        """
+        gaddags = [self.get_gaddag()]
+        dic = self.__dic
+        if isinstance(dic, OverlayDictionary) and dic.added.root is not None:
+            gaddags.append(dic.get_gaddag())
+        return gaddags
+
+    def get_alphagrams(self) -> AlphagramIndex:
+        """
+        @brief Get the alphagram index of the words that fit on a rack, loading it on first use.
+        The index is cached next to the .dict file and shared through the registry.
+        @return: AlphagramIndex object
+        """
+        if self.__alphagrams is None:
+            key = (self.__path, AlphagramIndex.EXTENSION)
+            self.__alphagrams = self.__acquire(key, lambda: AlphagramIndex.load_or_build(self.__path, RACK_CAPACITY))
+        return self.__alphagrams
+
+    def get_hooks(self) -> HookIndex:
+        """
+        @brief Get the index of the letters completing a word between two fragments, building it on first use.
+        The index is shared through the registry until words are added or removed.
+        @return: HookIndex object
+        """
+        if self.__hooks is None:
+            if self.__private:
+                self.__hooks = HookIndex(self.__dic, self.__letter_index, HOOK_MAX_LENGTH)
+            else:
+                dic, letter_index = self.__dic, self.__letter_index
+                key = (self.__path, self.__backend, HookIndex.__name__, letter_index.letters)
+                self.__hooks = self.__acquire(key, lambda: HookIndex(dic, letter_index, HOOK_MAX_LENGTH))
+        return self.__hooks
+
+    def get_backend(self) -> DictionaryBackend:
+        """
+        @brief Get the backend holding the dictionary.
+        @return: DictionaryBackend value
+        """
+        return self.__backend
 
-        self.__dic = Dictionary("myDictionary")
+    def __clear_memos(self) -> None:
+        self.__word_memo.clear()
+        self.__sequence_memo.clear()
 
-        with open(os.path.join(os.path.dirname(__file__), 'data', self.__uri), 'rb') as f:
-            data = f.read()
-        self.__dic.load_dawg(BytesIO(data))
+    def get_memo_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        @brief Get the counters of the has_word and has_sequence memos.
+        @return: Dictionary of the counters of each memo, see LRUCache.stats
+        """
+        return {"has_word": self.__word_memo.stats(), "has_sequence": self.__sequence_memo.stats()}
 
-        #TODO Add whitelist (not applicable)
+    def __get_overlay(self) -> OverlayDictionary:
+        """
+        @brief Get the overlay of this wrapper, over the shared dictionary.
+        The first call puts an empty overlay, or a copy of the shared whitelist, over it.
+        @return: OverlayDictionary object
+        """
+        if not self.__private:
+            dic = self.__dic
+            self.__dic = dic.copy() if isinstance(dic, OverlayDictionary) else OverlayDictionary(dic)
+            self.__private = True
+            self.__hooks = None
+        return self.__dic
 
-        self.__dic.add_links()
+    def add_words(self, words: List[str]) -> int:
+        """
+        @brief Add words to the dictionary of this wrapper only, e.g. for house rules.
+        The shared dictionary is left unchanged: the words go to an overlay that only
+        holds the words added and removed.
+        @param words: Words to be added
+        @return: Number of words added, the others being empty or already there
+        """
+        for word in words:
+            missing = self.__letter_index.missing(word)
+            if missing:
+                raise ValueError(f"Word {word} uses letters that are not in the alphabet: {''.join(missing)}")
+        added = self.__get_overlay().add_words(words)
+        if added > 0:
+            self.__clear_memos()
+            self.__hooks = None
+        return added
+
+    def remove_words(self, words: List[str]) -> int:
+        """
+        @brief Remove words from the dictionary of this wrapper only, e.g. for house rules (see add_words).
+        @param words: Words to be removed
+        @return: Number of words removed, the others being empty or not there
+        """
+        removed = self.__get_overlay().remove_words(words)
+        if removed > 0:
+            self.__clear_memos()
+            self.__hooks = None
+        return removed
+
+    def has_removed_words(self) -> bool:
+        """
+        @brief Check if words of the shared dictionary have been removed. Walks of its
+        nodes or of its GADDAG may then spell words that are no longer valid.
+        @return: True if words have been removed
+        """
+        return isinstance(self.__dic, OverlayDictionary) and len(self.__dic.removed) > 0
+
+    def add_word(self, word: str) -> bool:
+        """
+        @brief Add a word to the dictionary of this wrapper only (see add_words).
+        @param word: Word to be added
+        @return: True if the word was added, False if it was empty or already there
+        """
+        return self.add_words([word]) == 1
 
     def has_word(self, word: str) -> bool:
         """
@@ -278,7 +523,25 @@ class DictionaryWrapper:
         @return: True if the word exists, False otherwise
         """
         if len(word) == 0: return False
-        return True if self.__dic.has_word(word) else False
+        found = self.__word_memo.get(word)
+        if found is LRUCache.MISSING:
+            found = True if self.__dic.has_word(word) else False
+            self.__word_memo.put(word, found)
+        return found
+
+    def has_words(self, words: List[str]) -> List[bool]:
+        """
+        @brief Check if each word exists in the dictionary, sharing the work between words with common prefixes.
+        @param words: Words to check
+        @return: List of True for the words that exist, False for the others
+        """
+        found = [self.__word_memo.get(word) if len(word) > 0 else False for word in words]
+        unknown = [i for i, f in enumerate(found) if f is LRUCache.MISSING]
+        if len(unknown) > 0:
+            for i, f in zip(unknown, self.__dic.has_words([words[i] for i in unknown])):
+                found[i] = f
+                self.__word_memo.put(words[i], f)
+        return found
 
     def has_sequence(self, word: str) -> bool:
         """
@@ -287,9 +550,14 @@ class DictionaryWrapper:
         @return: True if the word has a sequence, False otherwise
         """
         if len(word) == 0: return False
-        return True if self.__dic.has_sequence(word) else False
+        found = self.__sequence_memo.get(word)
+        if found is LRUCache.MISSING:
+            # Sequences starting with a letter no word contains raise, and are not remembered
+            found = True if self.__dic.has_sequence(word) else False
+            self.__sequence_memo.put(word, found)
+        return found
 
-    def get_sequence_roots(self, word: str) -> Optional[List[LetterNode]]:
+    def get_sequence_roots(self, word: str) -> Optional[List[LetterNode | PackedNode]]:
         """
         @brief Get the sequence roots for the given word.
         @param word: Word to check
@@ -301,10 +569,22 @@ class DictionaryWrapper:
     def find_anagrams(self, word: str) -> List[str]:
         """
         @brief Find anagrams for the given word.
+        Racks are looked up in the alphagram index, longer words are searched in the dictionary.
         @param word: Word to find anagrams for
         @return: List of anagrams
         """
-        return self.__dic.find_anagrams(word)
+        dic = self.__dic
+        if len(word) <= RACK_CAPACITY:
+            found = self.get_alphagrams().find_anagrams(word)
+            if isinstance(dic, OverlayDictionary):
+                found = dic.merge_anagrams(word, found)
+        else:
+            found = dic.find_anagrams(word)
+        if self.__unplayable_letters:
+            # A blank cannot stand for a letter without tiles
+            unplayable = self.__unplayable_letters
+            found = {w: seq for w, seq in found.items() if unplayable.isdisjoint(w)}
+        return found
 
     def get_alphabet(self) -> ALPHABET:
         """
@@ -313,6 +593,13 @@ class DictionaryWrapper:
         """
         return self.__alphabet
 
+    def get_letter_index(self) -> LetterIndex:
+        """
+        @brief Get the dense numbering of the letters of the alphabet, blank excluded.
+        @return: LetterIndex object
+        """
+        return self.__letter_index
+
     def get_vowels(self) -> List[LETTER]:
         """
         @brief Get the vowels from the alphabet.
@@ -502,20 +789,37 @@ class Board:
                  dictionary: DictionaryWrapper,
                  row=BOARD_ROW,
                  col=BOARD_COL, 
-                 premium_cells: Dict[CL, CT]=PREMIUM_CELLS):
+                 premium_cells: Dict[CL, CT]=PREMIUM_CELLS,
+                 move_generator: MoveGenerator=MoveGenerator.DAWG):
         self.__dictionary: DictionaryWrapper = dictionary
+        self.__move_generator: MoveGenerator = move_generator
         self.__row: int = row
         self.__col: int = col
         self.__cells = BoardContainer(self.__row, self.__col)  # [['' for _ in range(self.__col)] for _ in range(self.__row)]
         self.__premium_cells = copy.deepcopy(premium_cells)
 
-        self._cross_checks: List[List[List[List[str]]]] = []
+        self._cross_checks: Optional[np.ndarray] = None  # (rows, cols, 2) masks of the letters fitting each cell across and down, kept across turns
+        self.__pre_masks: Dict[LetterNode | PackedNode, int] = {}   # Mask of the preLetters of each dictionary node met
+        self.__post_masks: Dict[LetterNode | PackedNode, int] = {}  # Mask of the postLetters of each dictionary node met
+        self.__stale_cells: Set[Tuple[int, int]] = set()  # Cells whose cross-checks changed since they were computed
+        self.__letter_index: LetterIndex = dictionary.get_letter_index()
+        self.__hooks: Optional[HookIndex] = None  # Index the cross-checks were computed with
+        self.__rack: Optional[RackVector] = None  # Tiles left on the rack during a search
+        self.__word: List[Optional[TILE]] = [None] * (2 * max(row, col) + 1)  # Word being built, around the anchor in the middle
+        self.__moves: Optional[List] = None    # Moves kept by generate_moves, the best ones only in the greedy search when None
+        self.__top_k: Optional[int] = None     # Number of moves kept by generate_moves, all of them when None
+        self.__min_score: int = 0              # Lowest score of the moves kept by generate_moves
+        self.__move_count: int = 0             # Number of moves kept by generate_moves, to break ties in the order found
+        self.__move_keys: Set[MOVE_KEY] = set()  # Keys of the moves met during the search
         self.best_score: int = 0
         self.best_moves: List[MOVE] = []
 
         self.is_debug_enabled = False
         self.debug_time_start_ns: int = 0
         self.debug_total_move_count: int = 0
+        self.debug_duplicate_move_count: int = 0  # Moves found again through another dictionary node
+        self.debug_skipped_anchor_count: int = 0  # Anchors along a line that are not the first tile of their run
+        self.debug_pruned_back_count: int = 0     # Back-ups stopped at the tiles of an earlier run
 
         self.clear()
 
@@ -542,6 +846,20 @@ class Board:
         """
         return self.__dictionary
 
+    def get_move_generator(self) -> MoveGenerator:
+        """
+        @brief Get the algorithm used by get_possible_moves
+        @return: MoveGenerator value
+        """
+        return self.__move_generator
+
+    def set_move_generator(self, move_generator: MoveGenerator) -> None:
+        """
+        @brief Select the algorithm used by get_possible_moves
+        @param move_generator: MoveGenerator value
+        """
+        self.__move_generator = move_generator
+
     def get_locked_tiles(self) -> List[TILE]:
         """
         @brief Get all locked tiles on the board.
@@ -583,6 +901,7 @@ class Board:
             tile.point = 0 if tile.is_blank else tile.point
             tile.is_locked = True
             self.__cells.set(tile.row, tile.col, tile)
+            self.__invalidate_cross_checks(tile.row, tile.col)
             return tile
         else:
             # Cannot be placed since it is already occupied cell
@@ -696,6 +1015,15 @@ class Board:
         else:
             return (1, 1)
 
+    def __find_invalid_words(self, o_words: List[Dict[str, int]]) -> List[str]:
+        """
+        @brief Check the words created by a play with a single dictionary call
+        @param o_words: Words created by the play, as returned by score_play
+        @return: List of the words that are not in the dictionary
+        """
+        words = [o_word['word'] for o_word in o_words]
+        return [word for word, valid in zip(words, self.__dictionary.has_words(words)) if not valid]
+
     def calculate_points(self, word: WORD, check_center=True) -> int:
         """
         @brief Calculate the points of the word
@@ -728,12 +1056,10 @@ class Board:
             score, o_words = self.score_play(completed_word[-1].row, completed_word[-1].col, 0, 1, completed_word)
             #print(f"Horizontal Score: {score} words : {o_words}")
             # Check all founded words are valid
-            flag = True
-            for t_word in o_words:
-                flag &= self.__dictionary.has_word(t_word['word'])
-            if not flag: print(f"Some cross-checked words are invalid: {t_word['word']} completed_word: {completed_word}")
+            invalid = self.__find_invalid_words(o_words)
+            if invalid: print(f"Some cross-checked words are invalid: {invalid} completed_word: {completed_word}")
 
-            return score if flag else 0
+            return score if not invalid else 0
         elif (direction == Board.Direction.Vertical):
             sorted_ = sorted(word, key=lambda x: x.row, reverse=False)
 
@@ -744,12 +1070,10 @@ class Board:
             score, o_words = self.score_play(completed_word[-1].row, completed_word[-1].col, 1, 0, completed_word)
             #print(f"Vertical Score: {score} words : {o_words}")
             # Check all founded words are valid
-            flag = True
-            for t_word in o_words:
-                flag &= self.__dictionary.has_word(t_word['word'])
-            if not flag: print(f"Some cross-checked words are invalid: {t_word['word']} completed_word: {completed_word}")
+            invalid = self.__find_invalid_words(o_words)
+            if invalid: print(f"Some cross-checked words are invalid: {invalid} completed_word: {completed_word}")
 
-            return score if flag else 0
+            return score if not invalid else 0
         else:  # Undefined direction
             print(f"Undefined direction for word: {word}")
             return 0
@@ -759,6 +1083,7 @@ class Board:
         @brief Clear the board
         """
         self.__cells.clear()
+        self._cross_checks = None
 
     def serialize(self) -> Dict[str, LETTER]:
         """
@@ -865,11 +1190,24 @@ class Board:
         """
         self.is_debug_enabled = True
 
+    def reset_statistics(self) -> None:
+        """
+        @brief Reset the debug statistics before a search
+        """
+        self.debug_total_move_count = 0
+        self.debug_duplicate_move_count = 0
+        self.debug_skipped_anchor_count = 0
+        self.debug_pruned_back_count = 0
+        self.debug_time_start_ns = time.perf_counter_ns()
+
     def print_statistics(self) -> None:
         """
         @brief Print debug statistics
         """
         print(f"Total valid words: {self.debug_total_move_count}")
+        print(f"Duplicate words: {self.debug_duplicate_move_count}")
+        print(f"Skipped anchors: {self.debug_skipped_anchor_count}")
+        print(f"Pruned back-ups: {self.debug_pruned_back_count}")
         print(f"Total optimal words: {len(self.best_moves)}")
         print(f"Total duration (ms): {(time.perf_counter_ns()-self.debug_time_start_ns)/1000000}")
 
@@ -951,16 +1289,6 @@ class Board:
 
         return (word_score + cross_words_score, o_words)
 
-    @staticmethod
-    def intersection(a: List[str], b: List[str]) -> List[str]:
-        """
-        @brief Find the intersection of two lists
-        @param a: First list
-        @param b: Second list
-        @return: List of common elements
-        """
-        return [letter for letter in a if letter in b]
-
     def is_anchor(self, row: int, col: int) -> bool:
         """
         @brief Check if the cell is an anchor point for a word.
@@ -980,6 +1308,31 @@ class Board:
                     (row < self.__cells.rows - 1 and self.__cells.is_empty(row+1, col)))
         return False
 
+    def is_line_anchor(self, row: int, col: int, drow: int, dcol: int) -> bool:
+        """
+        @brief Check if the cell anchors the plays along a line.
+
+        Only the first tile of each run of tiles along the line is an anchor,
+        and the plays through it back up no further than the next run, so a
+        play through several runs is generated once, from its first run.
+
+        @param row: Row index
+        @param col: Column index
+        @param drow: 1 for the plays down
+        @param dcol: 1 for the plays across
+        @return: True if the cell is an anchor point along the line, False otherwise
+        """
+        if self.__cells.is_empty(row, col):
+            return False
+        prow, pcol = row - drow, col - dcol
+        if prow >= 0 and pcol >= 0:
+            return self.__cells.is_empty(prow, pcol)
+        # At the edge of the board, the run needs an empty cell after it
+        while row < self.rows and col < self.cols and not self.__cells.is_empty(row, col):
+            row += drow
+            col += dcol
+        return row < self.rows and col < self.cols
+
     def is_empty(self, row: int, col: int) -> bool:
         """
         @brief Check if the cell is empty
@@ -1098,218 +1451,431 @@ class Board:
                 
         return (min_distance, nearest_premium) if min_distance >= 0 else (None, None)
 
-    def _compute_cross_checks(self, available: List[LETTER]) -> None:
+    def _compute_cross_checks(self) -> None:
         """
         @brief Determine which letters can fit in each square and form a valid
-        horizontal or vertical cross word.
-        @param available: set of available letters
+        horizontal or vertical cross word. Each cell gets the masks (see
+        LetterIndex) of the letters fitting it across and down, whatever the rack,
+        in a (rows, cols, 2) array. The masks are kept across turns: only the cells next to the tiles placed
+        since the last call are computed again, unless the dictionary has changed.
+        """
+        # Letters are only ever compared as bits of the letter index of the dictionary
+        letter_index = self.__dictionary.get_letter_index()
+        hooks = self.__dictionary.get_hooks()
+        if self._cross_checks is None or letter_index is not self.__letter_index or hooks is not self.__hooks:
+            self.__letter_index = letter_index
+            self.__hooks = hooks
+            self.__pre_masks.clear()
+            self.__post_masks.clear()
+            # Python integers for alphabets too large for 64-bit masks
+            dtype = np.int64 if letter_index.full_mask < 1 << 63 else object
+            self._cross_checks = np.zeros((self.rows, self.cols, 2), dtype=dtype)
+            stale = [(row, col) for col in range(self.cols) for row in range(self.rows)]
+        else:
+            stale = self.__stale_cells
+        self.__stale_cells = set()
+
+        x_checks = self._cross_checks
+        full_mask = letter_index.full_mask
+        for row, col in stale:
+            if not self.__cells.is_empty(row, col):
+                x_checks[row, col] = letter_index.mask(self.at(row, col).letter)
+                continue
+
+            # Find the words above and below
+            word_above = ""
+            r = row - 1
+            while r >= 0 and not self.__cells.is_empty(r, col):
+                word_above = self.at(r, col).letter + word_above
+                r -= 1
+
+            word_below = ""
+            r = row + 1
+            while r < self.rows and not self.__cells.is_empty(r, col):
+                word_below += self.at(r, col).letter
+                r += 1
+
+            # Find the words left and right
+            word_left = ""
+            c = col - 1
+            while c >= 0 and not self.__cells.is_empty(row, c):
+                word_left = self.at(row, c).letter + word_left
+                c -= 1
+
+            word_right = ""
+            c = col + 1
+            while c < self.cols and not self.__cells.is_empty(row, c):
+                word_right += self.at(row, c).letter
+                c += 1
+
+            # Find which letters form a valid cross word; a letter alone always does
+            if word_left or word_right:
+                h_is_word = hooks.word_mask(word_left, word_right)
+                h_is_seq = h_is_word | hooks.sequence_mask(word_left, word_right) if col > 0 else h_is_word
+            else:
+                h_is_word = h_is_seq = full_mask
+
+            if word_above or word_below:
+                v_is_word = hooks.word_mask(word_above, word_below)
+                v_is_seq = v_is_word | hooks.sequence_mask(word_above, word_below) if row > 0 else v_is_word
+            else:
+                v_is_word = v_is_seq = full_mask
+
+            x_checks[row, col, 0] = h_is_word & v_is_seq
+            x_checks[row, col, 1] = v_is_word & h_is_seq
+
+    def __invalidate_cross_checks(self, row: int, col: int) -> None:
+        """
+        @brief Mark the cross-checks changed by a tile placed on a cell: its own, and those
+        of the empty cells ending the lines of tiles through it.
+        @param row: Row index of the tile
+        @param col: Column index of the tile
         """
-        x_checks: List[List[List[List[str]]]] = []
+        self.__stale_cells.add((row, col))
+        for drow, dcol in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+            r, c = row + drow, col + dcol
+            while 0 <= r < self.rows and 0 <= c < self.cols and not self.__cells.is_empty(r, c):
+                r += drow
+                c += dcol
+            if 0 <= r < self.rows and 0 <= c < self.cols:
+                self.__stale_cells.add((r, c))
 
-        for col in range(self.cols):
-            this_col = []
-            x_checks.append(this_col)
+    def _record_move(self, row: int, col: int, drow: int, dcol: int, word: List[TILE]) -> None:
+        """
+        @brief Score a complete play and keep it if it is the best so far.
+        @param row: Row index of the LAST letter
+        @param col: Column index of the LAST letter
+        @param drow: 1 if the word is being played down
+        @param dcol: 1 if the word is being played across
+        @param word: Tiles of the word, including the ones already on the board
+        """
+        # Nodes of a DAWG may spell the same sequence, and so the same move, more than once
+        key = MOVE.key_of(word)
+        if key in self.__move_keys:
+            if self.is_debug_enabled: self.debug_duplicate_move_count += 1
+            return
+        self.__move_keys.add(key)
 
-            for row in range(self.rows):
-                this_cell = [[], []]
-                this_col.append(this_cell)
-                
-                if not self.__cells.is_empty(row, col):
-                    this_cell[0].append(self.at(row, col).letter)
-                    this_cell[1].append(self.at(row, col).letter)
-                    continue
-
-                # Find the words above and below
-                word_above = ""
-                r = row - 1
-                while r >= 0 and not self.__cells.is_empty(r, col):
-                    word_above = self.at(r, col).letter + word_above
-                    r -= 1
-
-                word_below = ""
-                r = row + 1
-                while r < self.rows and not self.__cells.is_empty(r, col):
-                    word_below += self.at(r, col).letter
-                    r += 1
-
-                # Find the words left and right
-                word_left = ""
-                c = col - 1
-                while c >= 0 and not self.__cells.is_empty(row, c):
-                    word_left = self.at(row, c).letter + word_left
-                    c -= 1
-
-                word_right = ""
-                c = col + 1
-                while c < self.cols and not self.__cells.is_empty(row, c):
-                    word_right += self.at(row, c).letter
-                    c += 1
-
-                # Find which letters form a valid cross word
-                for letter in available:
-                    h = word_left + letter + word_right
-                    h_is_word = len(h) == 1 or self.__dictionary.has_word(h)
-                    h_is_seq = h_is_word or col > 0 and self.__dictionary.has_sequence(h)
-
-                    v = word_above + letter + word_below
-                    v_is_word = len(v) == 1 or self.__dictionary.has_word(v)
-                    v_is_seq = v_is_word or row > 0 and self.__dictionary.has_sequence(v)
-
-                    if h_is_word and v_is_seq:
-                        this_cell[0].append(letter)
-                    if v_is_word and h_is_seq:
-                        this_cell[1].append(letter)
-
-        self._cross_checks = x_checks[:]
+        if self.__dictionary.has_removed_words() and not self.__dictionary.has_word("".join(t.letter for t in word)):
+            # Spelt by the shared dictionary, but removed by the overlay
+            return
+
+        score, _ = self.score_play(row, col, drow, dcol, word)
+
+        if self.is_debug_enabled and score > 0: self.debug_total_move_count += 1
+
+        moves = self.__moves
+        if moves is not None:
+            # Collecting for generate_moves
+            if score < self.__min_score:
+                return
+            self.__move_count += 1
+            if self.__top_k is None:
+                moves.append(MOVE(score, word[:]))
+            elif len(moves) < self.__top_k:
+                heapq.heappush(moves, (score, -self.__move_count, MOVE(score, word[:])))
+            elif score > moves[0][0]:
+                # Better than the worst of the k best so far
+                heapq.heapreplace(moves, (score, -self.__move_count, MOVE(score, word[:])))
+            return
+
+        if score > self.best_score:
+            # This is best score so far
+            self.best_score = score
+            heapq.heappush(self.best_moves, MOVE(score, word[:]))
 
     def _forward(self, row: int, col: int, 
                 drow: int, dcol: int, 
-                rack_tiles: List[TILE], tiles_played: int, 
-                d_node: LetterNode, word_so_far: List[TILE]) -> None:
+                tiles_played: int, d_node: LetterNode, 
+                start: int, end: int) -> None:
         """
         @brief Recursively extend a word on the board by adding valid letters from the rack or existing tiles.
         @param row: Current row position on the board.
         @param col: Current column position on the board.
         @param drow: Direction of movement in rows (1 for down, 0 for across).
         @param dcol: Direction of movement in columns (1 for across, 0 for down).
-        @param rack_tiles: Tiles remaining on the rack.
         @param tiles_played: Number of tiles played so far.
-        @param current_node: Current node in the dictionary trie.
-        @param word_so_far: Letters of the word formed so far.
+        @param d_node: Current node in the dictionary trie.
+        @param start: Index of the first letter of the word so far in the word buffer.
+        @param end: Index past the last letter of the word so far in the word buffer.
         """
         # Square we're hopefully extending into
         erow = row + drow
         ecol = col + dcol
+        word = self.__word
 
         # Tail recursion
-        if (d_node.isEndOfWord and len(word_so_far) >= 2 and tiles_played > 0 and
+        if (d_node.isEndOfWord and end - start >= 2 and tiles_played > 0 and
             (ecol == self.cols or erow == self.rows or self.__cells.is_empty(erow, ecol))):
-            
-            score, _ = self.score_play(row, col, drow, dcol, word_so_far)
+            self._record_move(row, col, drow, dcol, word[start:end])
 
-            if self.is_debug_enabled and score > 0: self.debug_total_move_count += 1
+        if ecol >= self.cols or erow >= self.rows:
+            return
 
-            if score > self.best_score:
-                # This is best score so far
-                self.best_score = score
-                heapq.heappush(self.best_moves, MOVE(score, word_so_far[:]))
-
-                #self.print(word_so_far)
-                #
-                #print("*************")
-                #print("score:", score)
-                #print("word_so_far:", word_so_far)
-                #print("*************")
-        
-        available = []  # List of letters that can be extended with
-        played_tile = 0
-        
-        if ecol < self.cols and erow < self.rows:
-            if self.__cells.is_empty(erow, ecol):
-                have_blank = any(t.is_blank for t in rack_tiles)
-                xc = self._cross_checks[ecol][erow][dcol]
-
-                available = Board.intersection(d_node.postLetters,
-                                               xc if have_blank else Board.intersection([t.letter for t in rack_tiles], xc))
-                played_tile = 1
+        if not self.__cells.is_empty(erow, ecol):
+            # Non-empty square, use its letter
+            tile = self.at(erow, ecol)
+            word[end] = tile
+            for post in d_node.postNodes:
+                if post.letter == tile.letter:
+                    self._forward(erow, ecol, drow, dcol, tiles_played, post, start, end + 1)
+            return
+
+        rack = self.__rack
+        letter_index = self.__letter_index
+        xc = self._cross_checks.item(erow, ecol, dcol)
+        if rack.blanks == 0:
+            xc &= rack.mask
+
+        post_mask = self.__post_masks.get(d_node)
+        if post_mask is None:
+            post_mask = self.__post_masks[d_node] = letter_index.mask(d_node.postLetters)
+
+        letters = letter_index.letters
+        counts = rack.counts
+        available = post_mask & xc
+        while available:
+            low = available & -available
+            available ^= low
+            i = low.bit_length() - 1
+            letter = letters[i]
+
+            # Take the tile from the rack
+            blank = counts[i] == 0
+            if blank:
+                rack.blanks -= 1
+                word[end] = TILE(erow, ecol, letter, rack.blank_point, True)
             else:
-                available = [self.at(erow, ecol).letter]
-        else :
-            pass
+                counts[i] -= 1
+                if counts[i] == 0:
+                    rack.mask ^= low
+                word[end] = TILE(erow, ecol, letter, rack.points[i], False)
 
-        for letter in available:
-            shrunk_rack = rack_tiles[:]
-            
-            if played_tile > 0:
-                rack_tile = next((tile for tile in shrunk_rack if tile.letter == letter), 
-                                next((tile for tile in shrunk_rack if tile.is_blank), None))
-
-                word_so_far.append(TILE(erow, ecol, letter, rack_tile.point, rack_tile.is_blank))
-                shrunk_rack = [t for t in shrunk_rack if not t.is_similar(rack_tile)]
-            else:
-                word_so_far.append(self.at(erow, ecol))
-            
             for post in d_node.postNodes:
                 if post.letter == letter:
-                    self._forward(erow, ecol, 
-                                 drow, dcol, 
-                                 shrunk_rack, tiles_played + played_tile, 
-                                 post, word_so_far)
-            
-            word_so_far.pop()
+                    self._forward(erow, ecol, drow, dcol, tiles_played + 1, post, start, end + 1)
+
+            # Put it back
+            if blank:
+                rack.blanks += 1
+            else:
+                if counts[i] == 0:
+                    rack.mask ^= low
+                counts[i] += 1
 
     def _back(self, row: int, col: 
              int, drow: int, dcol: int, 
-             rack_tiles: List[TILE], tiles_played: int, anchor_node: LetterNode, 
-             d_node: LetterNode, word_so_far: List[TILE]):
+             tiles_played: int, anchor_node: LetterNode, 
+             d_node: LetterNode, start: int, end: int):
         """
         @brief Try to back up before extending the word in the given direction.
-        @param col: Column index of the last letter in the word so far
-        @param row: Row index of the last letter in the word so far
+        @param col: Column index of the first letter in the word so far
+        @param row: Row index of the first letter in the word so far
         @param dcol: Direction indicator for horizontal movement
         @param drow: Direction indicator for vertical movement
-        @param rack_tiles: List of available tiles from the player's rack
         @param tiles_played: Number of tiles used from the rack
         @param anchor_node: Starting dictionary node for backing up
         @param d_node: Current dictionary node
-        @param word_so_far: List of tiles forming the current word in reverse order
+        @param start: Index of the first letter of the word so far in the word buffer
+        @param end: Index past the last letter of the word so far in the word buffer
         """
         # Square we're hopefully extending into
         erow = row - drow
         ecol = col - dcol
-
-        available = []  # Set of possible candidate letters
-        played_tile = 0
+        word = self.__word
 
         # Check if we have an adjacent empty cell to back up into
         if ecol >= 0 and erow >= 0:
             if self.__cells.is_empty(erow, ecol):
                 # Find common letters between rack, cross-checks, and dictionary node prefixes
-                have_blank = any(tile.is_blank for tile in rack_tiles)
-                xc = self._cross_checks[ecol][erow][dcol]
-
-                available = Board.intersection(d_node.preLetters,
-                                               xc if have_blank else Board.intersection([t.letter for t in rack_tiles], xc))               
-                played_tile = 1
-            else:
-                # Non-empty square, use its letter
-                available = [self.at(erow, ecol).letter]
-        
-        # Head recursion to explore longer words first
-        for letter in available:
-            shrunk_rack = rack_tiles[:]
-            if played_tile > 0:
-                # Letter came from the rack
-                tile = next((t for t in shrunk_rack if t.letter == letter), None) or next((t for t in shrunk_rack if t.is_blank), None)
+                rack = self.__rack
+                letter_index = self.__letter_index
+                xc = self._cross_checks.item(erow, ecol, dcol)
+                if rack.blanks == 0:
+                    xc &= rack.mask
+
+                pre_mask = self.__pre_masks.get(d_node)
+                if pre_mask is None:
+                    pre_mask = self.__pre_masks[d_node] = letter_index.mask(d_node.preLetters)
+
+                # Head recursion to explore longer words first
+                letters = letter_index.letters
+                counts = rack.counts
+                available = pre_mask & xc
+                while available:
+                    low = available & -available
+                    available ^= low
+                    i = low.bit_length() - 1
+                    letter = letters[i]
+
+                    # Letter comes from the rack
+                    blank = counts[i] == 0
+                    if blank:
+                        rack.blanks -= 1
+                        word[start - 1] = TILE(erow, ecol, letter, rack.blank_point, True)
+                    else:
+                        counts[i] -= 1
+                        if counts[i] == 0:
+                            rack.mask ^= low
+                        word[start - 1] = TILE(erow, ecol, letter, rack.points[i], False)
 
-                #FIXME tile = next((t for t in shrunk_rack if t.letter == letter), 
-                #            next((t for t in shrunk_rack if t.is_blank), None))
+                    for pre in d_node.preNodes:
+                        if pre.letter == letter:
+                            self._back(erow, ecol, drow, dcol, tiles_played + 1, anchor_node, pre, start - 1, end)
 
-                # Placement is not used in score calculation
-                word_so_far.insert(0, TILE(erow, ecol, letter, tile.point, tile.is_blank))
-                shrunk_rack = [t for t in shrunk_rack if t.is_similar(tile)]
-            else:
-                # Letter already on the self
-                word_so_far.insert(0, self.at(erow, ecol))
-
-            for pre in d_node.preNodes:
-                if pre.letter == letter:
-                    self._back(erow, ecol, 
-                              drow, dcol, 
-                              shrunk_rack, tiles_played + played_tile, anchor_node, 
-                              pre, word_so_far)
-            
-            word_so_far.pop(0)
+                    if blank:
+                        rack.blanks += 1
+                    else:
+                        if counts[i] == 0:
+                            rack.mask ^= low
+                        counts[i] += 1
+            elif self.is_debug_enabled:
+                # The tiles of an earlier run anchor the plays through both runs
+                self.debug_pruned_back_count += 1
 
         # If this is the start of a valid word and we're at the board edge or an empty cell
-        #FIXME if not d_node.preNodes and (erow < 0 or ecol < 0 or self.__cells.is_empty(erow, ecol)):
         if len(d_node.preNodes) == 0 and (erow < 0 or ecol < 0 or self.__cells.is_empty(erow, ecol)):
-            self._forward(row + drow * (len(word_so_far) - 1),
-                         col + dcol * (len(word_so_far) - 1),
+            self._forward(row + drow * (end - start - 1),
+                         col + dcol * (end - start - 1),
                          drow, dcol,
-                         rack_tiles, tiles_played,
-                         anchor_node, word_so_far)
+                         tiles_played, anchor_node,
+                         start, end)
     
+    def _gaddag_candidates(self, gaddag: Gaddag, chain: int, 
+                           row: int, col: int, dcol: int, 
+                           rack_tiles: List[TILE]) -> List[Tuple[int, int, LETTER]]:
+        """
+        @brief Find the rack tiles that can be placed on an empty cell.
+        @param gaddag: GADDAG being traversed
+        @param chain: Index of the first node of the sibling chain to extend with
+        @param row: Row index of the empty cell
+        @param col: Column index of the empty cell
+        @param dcol: Direction indicator for horizontal movement
+        @param rack_tiles: List of available tiles from the player's rack
+        @return: List of (GADDAG node, index of the rack tile, letter); a blank is only used
+                 for letters that are not on the rack
+        """
+        xc = self._cross_checks.item(row, col, dcol)
+        indices = self.__letter_index.indices
+        blank = next((i for i, t in enumerate(rack_tiles) if t.is_blank), -1)
+        out = []
+        for letter, node in gaddag.arcs(chain):
+            index = indices.get(letter)  # None for the separator
+            if index is None or not xc >> index & 1:
+                continue
+            i = next((i for i, t in enumerate(rack_tiles) if not t.is_blank and t.letter == letter), blank)
+            if i >= 0:
+                out.append((node, i, letter))
+        return out
+
+    def _gaddag_left(self, gaddag: Gaddag, 
+                     row: int, col: int, 
+                     drow: int, dcol: int, 
+                     anchor_row: int, anchor_col: int, 
+                     rack_tiles: List[TILE], tiles_played: int, 
+                     node: int, reversed_word: List[TILE]) -> None:
+        """
+        @brief Extend the word backwards from the anchor, following the
+        reversed prefix part of the GADDAG paths.
+        @param row: Row index of the first letter of the word so far
+        @param col: Column index of the first letter of the word so far
+        @param drow: Direction of movement in rows (1 for down, 0 for across)
+        @param dcol: Direction of movement in columns (1 for across, 0 for down)
+        @param anchor_row: Row index of the anchor
+        @param anchor_col: Column index of the anchor
+        @param rack_tiles: Tiles remaining on the rack
+        @param tiles_played: Number of tiles played so far
+        @param node: GADDAG node of the first letter of the word so far
+        @param reversed_word: Tiles from the anchor back to the first letter
+        """
+        # Square we're hopefully extending into
+        erow = row - drow
+        ecol = col - dcol
+        is_edge = erow < 0 or ecol < 0
+        chain = gaddag.child_index(node)
+
+        if is_edge or self.__cells.is_empty(erow, ecol):
+            # The word can start here. It either ends at the anchor...
+            arow = anchor_row + drow
+            acol = anchor_col + dcol
+            if (gaddag.is_end_of_word(node) and len(reversed_word) >= 2 and tiles_played > 0 and
+                (acol == self.cols or arow == self.rows or self.__cells.is_empty(arow, acol))):
+                self._record_move(anchor_row, anchor_col, drow, dcol, reversed_word[::-1])
+
+            # ...or goes on after it
+            separator = gaddag.find(chain, Gaddag.SEPARATOR) if chain else -1
+            if separator >= 0:
+                self._gaddag_right(gaddag, 
+                                   anchor_row, anchor_col, 
+                                   drow, dcol, 
+                                   rack_tiles, tiles_played, 
+                                   separator, reversed_word[::-1])
+
+        if is_edge or chain == 0:
+            return
+
+        if not self.__cells.is_empty(erow, ecol):
+            # The tiles of an earlier run anchor the plays through both runs
+            if self.is_debug_enabled: self.debug_pruned_back_count += 1
+            return
+
+        for next_node, i, letter in self._gaddag_candidates(gaddag, chain, erow, ecol, dcol, rack_tiles):
+            rack_tile = rack_tiles.pop(i)
+            reversed_word.append(TILE(erow, ecol, letter, rack_tile.point, rack_tile.is_blank))
+            self._gaddag_left(gaddag, erow, ecol, drow, dcol, anchor_row, anchor_col, 
+                              rack_tiles, tiles_played + 1, next_node, reversed_word)
+            reversed_word.pop()
+            rack_tiles.insert(i, rack_tile)
+
+    def _gaddag_right(self, gaddag: Gaddag, 
+                      row: int, col: int, 
+                      drow: int, dcol: int, 
+                      rack_tiles: List[TILE], tiles_played: int, 
+                      node: int, word_so_far: List[TILE]) -> None:
+        """
+        @brief Extend the word forwards from the anchor, following the part
+        of the GADDAG paths after the separator.
+        @param row: Row index of the last letter of the word so far
+        @param col: Column index of the last letter of the word so far
+        @param drow: Direction of movement in rows (1 for down, 0 for across)
+        @param dcol: Direction of movement in columns (1 for across, 0 for down)
+        @param rack_tiles: Tiles remaining on the rack
+        @param tiles_played: Number of tiles played so far
+        @param node: GADDAG node of the last letter of the word so far
+        @param word_so_far: Tiles of the word formed so far
+        """
+        # Square we're hopefully extending into
+        erow = row + drow
+        ecol = col + dcol
+        is_edge = ecol == self.cols or erow == self.rows
+
+        if (gaddag.is_end_of_word(node) and len(word_so_far) >= 2 and tiles_played > 0 and
+            (is_edge or self.__cells.is_empty(erow, ecol))):
+            self._record_move(row, col, drow, dcol, word_so_far)
+
+        chain = gaddag.child_index(node)
+        if is_edge or chain == 0:
+            return
+
+        if not self.__cells.is_empty(erow, ecol):
+            # Letter already on the board
+            tile = self.at(erow, ecol)
+            next_node = gaddag.find(chain, tile.letter)
+            if next_node >= 0:
+                word_so_far.append(tile)
+                self._gaddag_right(gaddag, erow, ecol, drow, dcol, 
+                                   rack_tiles, tiles_played, next_node, word_so_far)
+                word_so_far.pop()
+            return
+
+        for next_node, i, letter in self._gaddag_candidates(gaddag, chain, erow, ecol, dcol, rack_tiles):
+            rack_tile = rack_tiles.pop(i)
+            word_so_far.append(TILE(erow, ecol, letter, rack_tile.point, rack_tile.is_blank))
+            self._gaddag_right(gaddag, erow, ecol, drow, dcol, 
+                               rack_tiles, tiles_played + 1, next_node, word_so_far)
+            word_so_far.pop()
+            rack_tiles.insert(i, rack_tile)
+
     def best_opening_play(self, rack_tiles: List[TILE]) -> Tuple[int, WORD]:
         """
         @brief Find the best opening play for the given rack tiles.
@@ -1364,57 +1930,74 @@ class Board:
         """
         return self.best_moves
     
+    def _search_anchors(self, rack_tiles: List[TILE]) -> Iterator[None]:
+        """
+        @brief Generate the moves through each anchor, handing them to _record_move.
+        @param rack_tiles: List of available tiles from the player's rack, sorted by point value and then by letter
+        @return: Iterator stepping once after each anchor explored, none if the board has no anchor
+        """
+        self.__move_keys.clear()
+        anchored = False
+        for col in range(self.cols):
+            for row in range(self.rows):
+                explored = False
+                for drow, dcol in ((0, 1), (1, 0)):
+                    # Plays along a line are anchored on the first tile of each run of tiles
+                    if not self.is_line_anchor(row, col, drow, dcol):
+                        if self.is_debug_enabled and self.is_anchor(row, col): self.debug_skipped_anchor_count += 1
+                        continue
+
+                    if not anchored:
+                        # What letters can be used to form a valid cross word? Only the cells
+                        # next to the tiles placed since the last turn are checked again.
+                        self._compute_cross_checks()
+                        anchored = True
+                        # Tiles are taken from and put back on a copy of the rack as counts
+                        self.__rack = RackVector(rack_tiles, self.__letter_index)
+
+                    explored = True
+                    anchor_tile = self.at(row, col)
+
+                    if self.__move_generator == MoveGenerator.GADDAG:
+                        # Every word through the anchor starts with its letter in the GADDAG
+                        for gaddag in self.__dictionary.get_gaddags():
+                            anchor_node = gaddag.find(0, anchor_tile.letter)
+                            if anchor_node >= 0:
+                                self._gaddag_left(gaddag, row, col, drow, dcol, row, col,
+                                                  rack_tiles, 0, anchor_node, [ anchor_tile ])
+                        continue
+
+                    # The anchor sits in the middle of the word buffer, with room to back up and to extend
+                    middle = len(self.__word) // 2
+                    self.__word[middle] = anchor_tile
+                    for anchor_node in self.__dictionary.get_sequence_roots(anchor_tile.letter):
+                        # Try and back up then forward through the dictionary to find longer sequences
+                        self._back(row, col, drow, dcol,
+                                   0, anchor_node, anchor_node,
+                                   middle, middle + 1)
+                if explored:
+                    yield
+
     def get_possible_moves(self, rack_tiles: List[TILE]) -> List[MOVE]:
         """
-        @brief Get all possible moves for the given rack tiles.
+        @brief Get the best move for the given rack tiles, with the moves it beat during the search
+        (see generate_moves for the k best moves or all of them).
         @param rack_tiles: List of available tiles from the player's rack
-        @return: List of possible moves.
+        @return: List of possible moves, the best one first.
         """
-        if self.is_debug_enabled:
-            self.debug_total_move_count = 0
-            self.debug_time_start_ns = time.perf_counter_ns()
+        if self.is_debug_enabled: self.reset_statistics()
 
         self.best_moves.clear()
         self.best_score = 0
-        self._cross_checks.clear()
+        self.__moves = None
 
         # Sort the rack tiles by point value and then by letter
         rack_tiles = sorted(rack_tiles, key=lambda t: (-t.point, t.letter))
 
-        best_score = 0
-        best_word: WORD = []
-        anchored = False
-                
-        # Has at least one anchor been explored? If there are no anchors, we need to compute an opening play
         anchored = False
-
-        for col in range(self.cols):
-            for row in range(self.rows):
-                # An anchor is any square that has a tile and has an
-                # adjacent blank that can be extended into to form a word
-                if self.is_anchor(row, col):
-                    if not anchored:
-                        # What letters can be used to form a valid cross word? 
-                        # The whole alphabet if the rack contains a blank, the rack otherwise.
-                        available = self.__dictionary.get_all_letters() if any(t.is_blank for t in rack_tiles) else [t.letter for t in rack_tiles]
-                        self._compute_cross_checks(available)
-                        anchored = True
-
-                    anchor_tile = self.at(row, col)
-
-                    roots = self.__dictionary.get_sequence_roots(anchor_tile.letter)
-                    for anchor_node in roots:
-                        # Try and back up then forward through the dictionary to find longer sequences across
-                        self._back(row, col, 0, 1,
-                                         rack_tiles, 0,
-                                         anchor_node, anchor_node,
-                                         [ anchor_tile ])
-
-                        # down
-                        self._back(row, col, 1, 0,
-                                         rack_tiles, 0,
-                                         anchor_node, anchor_node,
-                                         [ anchor_tile ])
+        for _ in self._search_anchors(rack_tiles):
+            # Has at least one anchor been explored? If there are no anchors, we need to compute an opening play
+            anchored = True
 
         if not anchored:
             best_score, best_word = self.best_opening_play(rack_tiles)
@@ -1424,3 +2007,74 @@ class Board:
             best_moves = self.get_best_moves()
             if self.is_debug_enabled: self.print_statistics()
             return best_moves
+
+    def generate_moves(self, rack_tiles: List[TILE], k: Optional[int] = None, min_score: int = 0) -> Iterator[MOVE]:
+        """
+        @brief Generate the legal moves for the given rack tiles, unlike get_possible_moves
+        which only keeps the moves that beat the best score found so far.
+
+        @description With k, the k best moves are kept in a min-heap while the board is searched,
+        and generated best first at the end. Without k, every move is generated as soon as the
+        anchor it goes through has been explored, so the board must not be searched again before
+        the moves have been consumed. Ties are kept in the order they were found.
+
+        @param rack_tiles: List of available tiles from the player's rack
+        @param k: Number of the best moves to generate, all of them when None
+        @param min_score: Lowest score of the moves to generate
+        @return: Iterator over the moves
+        """
+        if self.is_debug_enabled: self.reset_statistics()
+
+        # Sort the rack tiles by point value and then by letter
+        rack_tiles = sorted(rack_tiles, key=lambda t: (-t.point, t.letter))
+
+        self.__moves = moves = []
+        self.__top_k = k
+        self.__min_score = min_score
+        self.__move_count = 0
+        try:
+            anchored = False
+            for _ in self._search_anchors(rack_tiles):
+                anchored = True
+                if k is None:
+                    yield from moves
+                    moves.clear()
+            if not anchored:
+                self._opening_moves(rack_tiles)
+                if k is None:
+                    yield from moves
+            if k is not None:
+                moves.sort(reverse=True)
+                for _, _, move in moves:
+                    yield move
+        finally:
+            self.__moves = None
+
+    def _opening_moves(self, rack_tiles: List[TILE]) -> None:
+        """
+        @brief Hand every opening play, across and down through the centre cell, to _record_move.
+        @param rack_tiles: List of available tiles from the player's rack
+        """
+        ruck = "".join(t.letter if t.letter else " " for t in rack_tiles)
+
+        for choice in self.__dictionary.find_anagrams(ruck):
+            if len(choice) < 2:
+                continue
+            placements: List[TILE] = []
+            shrunk_rack = rack_tiles[:]
+            for c in choice:
+                rack_tile = next((t for t in shrunk_rack if t.letter == c), None) or next((t for t in shrunk_rack if t.is_blank), None)
+                placements.append(TILE(0, 0, c, rack_tile.point, rack_tile.is_blank))
+                shrunk_rack.remove(rack_tile)
+
+            for drow, dcol in ((0, 1), (1, 0)):
+                mid = self.midcol if dcol else self.midrow
+                size = self.cols if dcol else self.rows
+                # From the word covering the centre with its last letter to the one covering it with its first
+                for start in range(max(0, mid - len(choice) + 1), min(mid, size - len(choice)) + 1):
+                    word: WORD = []
+                    for i, tile in enumerate(placements):
+                        row = start + i if drow else self.midrow
+                        col = start + i if dcol else self.midcol
+                        word.append(TILE(row, col, tile.letter, tile.point, tile.is_blank))
+                    self._record_move(row, col, drow, dcol, word)
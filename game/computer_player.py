@@ -159,7 +159,11 @@ class ComputerPlayer(Player):
         @brief Choose the best move based on immediate reward and future considerations.
         @return Best move to play
         """
-        possible_moves = self.get_possible_moves()
+        if self._player_strategy == PlayerStrategy.GREEDY:
+            possible_moves = self.get_possible_moves()
+        else:
+            # The best moves, rather than those that beat each other during the search
+            possible_moves = list(self._board.generate_moves(self._rack.get_rack(), k=BALANCED_MOVE_COUNT))
         
         if not possible_moves or len(possible_moves)==0:
             return None
@@ -63,4 +63,13 @@ class GameState:
             GameState.GAME_STARTED: "GAME_STARTED",
             GameState.GAME_OVER: "GAME_OVER",
         }
-        return state_map.get(state, "UNKNOWN_STATE")  # Handle unexpected values
\ No newline at end of file
+        return state_map.get(state, "UNKNOWN_STATE")  # Handle unexpected values
+
+class DictionaryBackend:
+    OBJECT_GRAPH    = "OBJECT_GRAPH"  # Dictionary of linked LetterNode objects
+    PACKED          = "PACKED"        # Dictionary held in flat NumPy arrays
+    MAPPED          = "MAPPED"        # Packed dictionary read in place from a memory-mapped file
+
+class MoveGenerator:
+    DAWG    = "DAWG"    # Back up and extend through the pre/post-linked dictionary from every sequence root
+    GADDAG  = "GADDAG"  # One GADDAG traversal per anchor
@@ -289,6 +289,9 @@ class LANGUAGE:
     alphabet: ALPHABET
     uri: str
 
+# Canonical key of a move: row and column of its first letter, 1 if played down, its letters and the indices of its blanks
+MOVE_KEY = Tuple[int, int, int, str, Tuple[int, ...]]
+
 @dataclass(frozen=True)
 class MOVE:
     score: int
@@ -296,6 +299,23 @@ class MOVE:
     
     def __lt__(self, other: 'MOVE') -> bool:
         return self.score > other.score
+
+    def key(self) -> MOVE_KEY:
+        """
+        @brief Canonical key of the move, the same for every search path that finds it.
+        """
+        return MOVE.key_of(self.word)
+
+    @staticmethod
+    def key_of(word: WORD) -> MOVE_KEY:
+        """
+        @brief Canonical key of the move playing a word.
+        @param word: Tiles of the word, including the ones already on the board
+        """
+        first, last = word[0], word[-1]
+        down = 1 if first.col == last.col and first.row != last.row else 0
+        return (first.row, first.col, down, "".join(t.letter for t in word),
+                tuple(i for i, t in enumerate(word) if t.is_blank))
     
     def serialize(self) -> Tuple[str, int]:
         return ' '.join([str(tile) for tile in self.word]), self.score
@@ -309,6 +329,21 @@ RACK_CAPACITY: int = 7
 
 MIN_PLAYER_COUNT: int = 2
 
+# Seconds a dictionary no game uses is kept loaded
+DICTIONARY_IDLE_TIMEOUT: int = 600
+
+# Number of has_word and of has_sequence answers each dictionary wrapper remembers
+DICTIONARY_MEMO_SIZE: int = 4096
+
+# Extension of the words added to a dictionary by house rules, kept next to its .dict file
+DICTIONARY_WHITELIST_EXTENSION: str = ".white"
+
+# Length of the longest words whose hooks are precomputed for cross-checks
+HOOK_MAX_LENGTH: int = 4
+
+# Number of the best moves a BALANCED computer player weighs
+BALANCED_MOVE_COUNT: int = 20
+
 COMPUTER_PLAYER_NAMES = ["Socrates", "Plato", "Aristotle", "Pythagoras"]
 
 # Letter: (Count, Points, LetterType, Frequency)
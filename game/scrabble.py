@@ -64,14 +64,24 @@ class Scrabble(Subject):
         self.__update()
 
     def load_language(self, lang_key: LANG_KEYS) -> None:
-        self.__dictionary = DictionaryWrapper(LANGUAGES[lang_key])
-        self.__dictionary.load_language(LANGUAGES[lang_key])
+        # Keep the current dictionary if the new one can't be loaded
+        dictionary = DictionaryWrapper(LANGUAGES[lang_key])
+        if self.__dictionary is not None:
+            self.__dictionary.close()
+        self.__dictionary = dictionary
 
         self.__tile_bag = TileBag()
         self.__tile_bag.load(self.__dictionary.get_alphabet())
 
         self.__board = Board(self.__dictionary, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
 
+    def close(self) -> None:
+        """
+        @brief Release the resources shared with other games
+        """
+        if self.__dictionary is not None:
+            self.__dictionary.close()
+
     def get_game_id(self) -> str:
         return self.__game_id
 
@@ -514,6 +524,8 @@ class Scrabble(Subject):
             else:
                 player.set_player_state(PlayerState.LOST)
 
+        self.close()
+
         players_meta: List[PlayerMeta] = self.get_players_meta()
         # Notify all players about game is over
         self.__socketio.emit('game-ended', {"playersMeta": [player.__dict__ for player in players_meta], "winnerId": winner_id})
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from game.components import Board, DictionaryWrapper
 from game.globals import *
 from game.utils import *
@@ -150,6 +152,33 @@ class TestBoard(unittest.TestCase):
         points = board.calculate_points(word)
         self.assertEqual(points, exp_score, f"Failed for word: '{expected}'")
 
+    def test_incremental_cross_checks(self):
+        moves = [[TILE(7, 5, 'H'), TILE(7, 6, 'E'), TILE(7, 7, 'L'), TILE(7, 8, 'L'), TILE(7, 9, 'O')],
+                 [TILE(8, 9, 'P'), TILE(9, 9, 'E'), TILE(10, 9, 'N')],
+                 [TILE(11, 8, 'A'), TILE(11, 10, 'T')]]
+
+        board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
+        for word in moves:
+            board.place_word([TILE(t.row, t.col, t.letter) for t in word])
+            board._compute_cross_checks()
+
+            # Same masks as computed from scratch
+            fresh = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
+            for placed in moves[:moves.index(word) + 1]:
+                fresh.place_word([TILE(t.row, t.col, t.letter) for t in placed])
+            fresh._compute_cross_checks()
+            self.assertTrue(np.array_equal(board._cross_checks, fresh._cross_checks))
+
+        # Cells away from the tiles placed are not computed again
+        board._cross_checks[0, 0, 0] = 0
+        below = board._cross_checks[13, 8, 1]
+        board.place_word([TILE(12, 8, 'S')])
+        board._compute_cross_checks()
+        self.assertEqual(board._cross_checks[0, 0, 0], 0)
+        self.assertNotEqual(board._cross_checks[13, 8, 1], below)
+        self.assertTrue(self.dict.has_word("ASK"))
+        self.assertIn('K', self.dict.get_letter_index().letters_of(board._cross_checks.item(13, 8, 1)))
+
     @measure_time
     def test_calculate_points_complex(self):
         board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
@@ -3,7 +3,7 @@ import unittest
 from game.components import Board, DictionaryWrapper
 from game.computer_player import ComputerPlayer
 from game.globals import *
-from game.enums import PlayerState
+from game.enums import PlayerState, MoveGenerator
 from game.utils import *
 
 class TestBoard(unittest.TestCase):
@@ -85,8 +85,8 @@ class TestBoard(unittest.TestCase):
         player.add_tiles([TILE(letter="A"), TILE(letter="C"), TILE(letter="R"), TILE(letter="P")])
         player.set_player_state(PlayerState.PLAYING)
         move_0 = player.get_possible_moves()[0]  # Get most scored move
-        exp_move_0_score = 3
-        exp_move_0_word = [TILE(letter="E"), TILE(letter="A"), TILE(letter="R")]       
+        exp_move_0_score = 14
+        exp_move_0_word = [TILE(letter="C"), TILE(letter="A"), TILE(letter="P"), TILE(letter="E"), TILE(letter="R")]       
         board.print()
         board.print(move_0.word)
         self.assertEqual(move_0.score, exp_move_0_score, f"Wrong score: {move_0.score} ({exp_move_0_score})")
@@ -131,8 +131,8 @@ class TestBoard(unittest.TestCase):
         player.add_tiles([TILE(letter="A"), TILE(letter="C"), TILE(letter="R"), TILE(letter="P")])
         player.set_player_state(PlayerState.PLAYING)
         move_0 = player.get_possible_moves()[0]  # Get most scored move
-        exp_move_0_score = 13
-        exp_move_0_word = [TILE(letter="M"), TILE(letter="A"), TILE(letter="P")]       
+        exp_move_0_score = 30
+        exp_move_0_word = [TILE(letter="C"), TILE(letter="A"), TILE(letter="P"), TILE(letter="E"), TILE(letter="R")]       
         board.print()
         board.print(move_0.word)
         self.assertEqual(move_0.score, exp_move_0_score, f"Wrong score: {move_0.score} ({exp_move_0_score})")
@@ -193,5 +193,177 @@ class TestBoard(unittest.TestCase):
 
         self.assertTrue(is_same_word, f"Wrong best word: {move_0.word} ({exp_move_0_word})")
 
+    @measure_time
+    def test_find_best_play_gaddag(self):
+        serialized_board = ""
+        serialized_board += "     A  B  C  D  E  F  G  H  I  J  K  L  M  N  O\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        serialized_board += " 1 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 2 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 3 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 4 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 5 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 6 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 7 | .  .  .  G  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 8 | .  .  .  C  R  A  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 9 | .  .  .  T  O  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "10 | .  .  .  S  T  E  P  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "11 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "12 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "13 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "14 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "15 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        rack = [TILE(letter="A"), TILE(letter="C"), TILE(letter="R"), TILE(letter="P")]
+
+        board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
+        board.deserialize(serialized_board)
+        dawg_move = board.get_possible_moves(rack)[0]
+
+        board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS, MoveGenerator.GADDAG)
+        board.deserialize(serialized_board)
+        move_0 = board.get_possible_moves(rack)[0]
+
+        # The GADDAG reaches every word through an anchor
+        self.assertEqual(move_0.score, 14, f"Wrong score: {move_0.score} (14)")
+        self.assertGreaterEqual(move_0.score, dawg_move.score)
+
+        last = move_0.word[-1]
+        drow = 1 if move_0.word[0].col == last.col else 0
+        score, words = board.score_play(last.row, last.col, drow, 1 - drow, move_0.word)
+        self.assertEqual(score, move_0.score)
+        for word in words:
+            self.assertTrue(self.dict.has_word(word["word"]), f"Invalid word: {word['word']}")
+
+    @measure_time
+    def test_repeated_letters(self):
+        serialized_board = ""
+        serialized_board += "     A  B  C  D  E  F  G  H  I  J  K  L  M  N  O\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        serialized_board += " 1 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 2 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 3 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 4 | .  .  .  O  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 5 | .  .  .  P  .  .  .  A  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 6 | .  .  .  E  .  .  .  S  .  W  .  .  .  .  .  |\n"
+        serialized_board += " 7 | .  .  .  R  .  P  Y  T  H  O  N  .  .  .  .  |\n"
+        serialized_board += " 8 | .  .  .  A  L  A  .  R  .  R  O  L  E  .  .  |\n"
+        serialized_board += " 9 | .  .  .  .  .  .  .  O  .  L  .  .  .  .  .  |\n"
+        serialized_board += "10 | .  .  .  .  .  .  .  N  .  D  .  .  .  .  .  |\n"
+        serialized_board += "11 | .  .  .  H  E  L  L  O  .  .  .  .  .  .  .  |\n"
+        serialized_board += "12 | .  .  .  .  .  .  .  M  U  M  M  Y  .  .  .  |\n"
+        serialized_board += "13 | .  .  .  .  .  .  .  Y  .  .  .  A  Y  E  .  |\n"
+        serialized_board += "14 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "15 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        # Both P are played, and the blank once the rack has no R left
+        rack = [TILE(letter="A"), TILE(letter="P"), TILE(letter="P"), TILE(letter="E"), TILE(letter=" ", point=0)]
+
+        board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS)
+        board.deserialize(serialized_board)
+        dawg_move = board.get_possible_moves(rack)[0]
+
+        board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS, MoveGenerator.GADDAG)
+        board.deserialize(serialized_board)
+        gaddag_move = board.get_possible_moves(rack)[0]
+
+        self.assertEqual(dawg_move.score, 28, f"Wrong score: {dawg_move.score} (28)")
+        self.assertEqual("".join(t.letter for t in dawg_move.word), "PAPER")
+        self.assertEqual([t.is_blank for t in dawg_move.word], [False, False, False, False, True])
+        self.assertEqual(dawg_move.score, gaddag_move.score)
+
+    @measure_time
+    def test_generate_moves(self):
+        serialized_board = ""
+        serialized_board += "     A  B  C  D  E  F  G  H  I  J  K  L  M  N  O\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        serialized_board += " 1 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 2 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 3 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 4 | .  .  .  O  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 5 | .  .  .  P  .  .  .  A  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 6 | .  .  .  E  .  .  .  S  .  W  .  .  .  .  .  |\n"
+        serialized_board += " 7 | .  .  .  R  .  P  Y  T  H  O  N  .  .  .  .  |\n"
+        serialized_board += " 8 | .  .  .  A  L  A  .  R  .  R  O  L  E  .  .  |\n"
+        serialized_board += " 9 | .  .  .  .  .  .  .  O  .  L  .  .  .  .  .  |\n"
+        serialized_board += "10 | .  .  .  .  .  .  .  N  .  D  .  .  .  .  .  |\n"
+        serialized_board += "11 | .  .  .  H  E  L  L  O  .  .  .  .  .  .  .  |\n"
+        serialized_board += "12 | .  .  .  .  .  .  .  M  U  M  M  Y  .  .  .  |\n"
+        serialized_board += "13 | .  .  .  .  .  .  .  Y  .  .  .  A  Y  E  .  |\n"
+        serialized_board += "14 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "15 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        rack = [TILE(letter="A"), TILE(letter="C"), TILE(letter="R"), TILE(letter="P")]
+
+        for move_generator in [MoveGenerator.DAWG, MoveGenerator.GADDAG]:
+            board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS, move_generator)
+            board.deserialize(serialized_board)
+
+            board.enable_debug()
+
+            # Every legal move, and not only those beating the best score found so far
+            all_moves = list(board.generate_moves(rack))
+            self.assertEqual(len({move.key() for move in all_moves}), len(all_moves))
+
+            # Tiles after the first of their run anchor nothing, and the DAWG spells PRAY from two nodes
+            self.assertEqual(board.debug_skipped_anchor_count, 35)
+            self.assertEqual(board.debug_duplicate_move_count, 1 if move_generator == MoveGenerator.DAWG else 0)
+
+            greedy_moves = board.get_possible_moves(rack)
+            self.assertGreater(len(all_moves), len(greedy_moves))
+            scores = sorted((move.score for move in all_moves), reverse=True)
+            self.assertEqual(scores[0], greedy_moves[0].score)
+
+            top_moves = list(board.generate_moves(rack, k=3))
+            self.assertEqual([move.score for move in top_moves], scores[:3])
+
+            min_moves = list(board.generate_moves(rack, min_score=10))
+            self.assertEqual(sorted((move.score for move in min_moves), reverse=True), [s for s in scores if s >= 10])
+
+            # Opening plays cross the centre cell
+            board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS, move_generator)
+            opening_moves = list(board.generate_moves(rack, k=5))
+            self.assertEqual(len(opening_moves), 5)
+            for move in opening_moves:
+                self.assertIn((board.midrow, board.midcol), [(t.row, t.col) for t in move.word])
+
+    @measure_time
+    def test_house_rules(self):
+        serialized_board = ""
+        serialized_board += "     A  B  C  D  E  F  G  H  I  J  K  L  M  N  O\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        serialized_board += " 1 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 2 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 3 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 4 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 5 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 6 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 7 | .  .  .  G  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 8 | .  .  .  C  R  A  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += " 9 | .  .  .  T  O  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "10 | .  .  .  S  T  E  P  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "11 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "12 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "13 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "14 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "15 | .  .  .  .  .  .  .  .  .  .  .  .  .  .  .  |\n"
+        serialized_board += "   +----------------------------------------------+\n"
+        rack = [TILE(letter="A"), TILE(letter="C"), TILE(letter="R"), TILE(letter="P")]
+
+        def best_word(move_generator: MoveGenerator) -> str:
+            board = Board(self.dict, BOARD_ROW, BOARD_COL, PREMIUM_CELLS, move_generator)
+            board.deserialize(serialized_board)
+            move = max(board.get_possible_moves(rack), key=lambda m: m.score)
+            return "".join(tile.letter for tile in move.word)
+
+        self.assertEqual(best_word(MoveGenerator.GADDAG), "CAPER")
+
+        # Words removed are no longer played, words added are
+        self.dict.remove_words(["CAPER"])
+        self.assertEqual(best_word(MoveGenerator.GADDAG), "CAPE")
+        self.dict.add_words(["STEPCARP"])
+        for move_generator in [MoveGenerator.DAWG, MoveGenerator.GADDAG]:
+            self.assertEqual(best_word(move_generator), "STEPCARP")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from game.components import DictionaryWrapper
+from game.enums import DictionaryBackend
+from game.globals import *
+from game.utils import *
+
+class TestDictionaryWrapper(unittest.TestCase):
+
+    def setUp(self):
+        self.language = LANGUAGE(ALPH_ENGLISH, "dictionaries/CSW2021_English.dict")
+
+    def test_lru_cache(self):
+        cache = LRUCache(2)
+        cache.put("A", 1)
+        cache.put("B", 2)
+        self.assertEqual(cache.get("A"), 1)
+        cache.put("C", 3)  # B is the least recently used
+        self.assertIs(cache.get("B"), LRUCache.MISSING)
+        self.assertEqual(cache.get("C"), 3)
+        self.assertEqual(cache.stats(), {"size": 2, "capacity": 2, "hits": 2, "misses": 1, "evictions": 1})
+
+        disabled = LRUCache(0)
+        disabled.put("A", 1)
+        self.assertIs(disabled.get("A"), LRUCache.MISSING)
+        self.assertRaises(ValueError, LRUCache, -1)
+
+    def test_memo(self):
+        wrapper = DictionaryWrapper(self.language, DictionaryBackend.MAPPED, memo_size=2)
+        self.assertTrue(wrapper.has_word("HELLO"))
+        self.assertTrue(wrapper.has_word("HELLO"))
+        self.assertFalse(wrapper.has_word("HELLOX"))
+        self.assertEqual(wrapper.has_words(["HELLO", "WORLD", "HELLOX", ""]), [True, True, False, False])
+        self.assertTrue(wrapper.has_sequence("ELL"))
+        self.assertFalse(wrapper.has_sequence("QXZ"))
+        self.assertFalse(wrapper.has_sequence("QXZ"))
+
+        stats = wrapper.get_memo_stats()
+        self.assertEqual(stats["has_word"], {"size": 2, "capacity": 2, "hits": 3, "misses": 3, "evictions": 1})
+        self.assertEqual(stats["has_sequence"], {"size": 2, "capacity": 2, "hits": 1, "misses": 2, "evictions": 0})
+        wrapper.close()
+
+    def test_add_word(self):
+        wrapper = DictionaryWrapper(self.language, DictionaryBackend.MAPPED)
+        self.assertFalse(wrapper.has_word("QXZ"))
+        self.assertFalse(wrapper.has_sequence("QXZ"))
+        self.assertTrue(wrapper.add_word("QXZ"))
+        self.assertTrue(wrapper.has_word("QXZ"))
+        self.assertTrue(wrapper.has_sequence("QXZ"))
+        self.assertFalse(wrapper.add_word("QXZ"))
+        self.assertEqual(wrapper.get_memo_stats()["has_word"]["size"], 1)
+
+        # Removed words are found neither by lookups nor by anagram searches
+        self.assertTrue(wrapper.has_word("LAZY"))
+        self.assertIn("LAZY", wrapper.find_anagrams("YZAL"))
+        self.assertFalse(wrapper.has_removed_words())
+        self.assertEqual(wrapper.remove_words(["LAZY", "ZXQ"]), 1)
+        self.assertTrue(wrapper.has_removed_words())
+        self.assertFalse(wrapper.has_word("LAZY"))
+        self.assertNotIn("LAZY", wrapper.find_anagrams("YZAL"))
+        self.assertIn("QXZ", wrapper.find_anagrams("ZXQ"))
+        self.assertEqual(len(wrapper.get_gaddags()), 2)
+
+        # Other wrappers keep using the shared dictionary
+        other = DictionaryWrapper(self.language, DictionaryBackend.MAPPED)
+        self.assertFalse(other.has_word("QXZ"))
+        self.assertTrue(other.has_word("LAZY"))
+        self.assertEqual(len(other.get_gaddags()), 1)
+        other.close()
+        wrapper.close()
+
+    def test_whitelist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.dict")
+            shutil.copy(get_absolute_path('externals/dictionary/test/data/dictionary.dict'), path)
+            with open(os.path.join(tmp, "words" + DICTIONARY_WHITELIST_EXTENSION), 'w') as f:
+                f.write("qxz\nlazy\n")
+
+            for backend in [DictionaryBackend.OBJECT_GRAPH, DictionaryBackend.PACKED, DictionaryBackend.MAPPED]:
+                wrapper = DictionaryWrapper(LANGUAGE(ALPH_ENGLISH, path), backend)
+                self.assertTrue(wrapper.has_word("QXZ"))
+                self.assertTrue(wrapper.has_word("LAZY"))
+                self.assertTrue(wrapper.has_sequence("QX"))
+                self.assertEqual(wrapper.add_words(["QXZ", "ZXQ"]), 1)
+                self.assertTrue(wrapper.has_word("QXZ"))
+                self.assertTrue(wrapper.has_word("ZXQ"))
+
+                # The whitelist stays shared
+                other = DictionaryWrapper(LANGUAGE(ALPH_ENGLISH, path), backend)
+                self.assertTrue(other.has_word("QXZ"))
+                self.assertFalse(other.has_word("ZXQ"))
+                other.close()
+                wrapper.close()
+
+    def test_letter_index(self):
+        wrapper = DictionaryWrapper(self.language, DictionaryBackend.MAPPED)
+        letter_index = wrapper.get_letter_index()
+        self.assertEqual("".join(letter_index.letters), "ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        wrapper.close()
+
+        # W and X are not Turkish letters, the words using them can't be played
+        wrapper = DictionaryWrapper(LANGUAGE(ALPH_TURKISH, self.language.uri), DictionaryBackend.MAPPED)
+        self.assertNotIn("W", wrapper.get_letter_index())
+        self.assertTrue(wrapper.has_word("WAX"))
+        self.assertTrue(all("W" not in word and "X" not in word for word in wrapper.find_anagrams("AX ")))
+        wrapper.close()
+
+    def test_missing_dictionary(self):
+        wrapper = DictionaryWrapper(self.language, DictionaryBackend.MAPPED)
+        self.assertRaises(ValueError, wrapper.load_language, LANGUAGE(ALPH_ENGLISH, "dictionaries/Missing.dict"))
+        # The dictionary loaded so far is kept
+        self.assertTrue(wrapper.has_word("ZOO"))
+        wrapper.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,11 @@ import random
 import string
 import re
 import time
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Hashable
 
 from .globals import *
 
@@ -73,4 +75,72 @@ def measure_time(func):
         elapsed_time = time.perf_counter_ns() - start_time
         print(f"{func.__name__} executed in {elapsed_time/10**3} microseconds")
         return result
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+class LRUCache:
+    """
+    @brief Bounded map that evicts the least recently used entry when full.
+    Counts hits, misses and evictions so the hit rate can be monitored.
+    """
+    MISSING = object()  # Returned by get() for keys not in the cache
+
+    def __init__(self, capacity: int):
+        """
+        @brief Initialize an empty cache.
+        @param capacity: Maximum number of entries, 0 to disable caching
+        """
+        if capacity < 0:
+            raise ValueError(f"LRUCache: capacity must not be negative, got {capacity}")
+        self.capacity: int = capacity
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        @brief Get the value of a key and mark it as most recently used.
+        @param key: Key to look up
+        @return: The value, or LRUCache.MISSING if the key is not in the cache
+        """
+        with self.__lock:
+            value = self.__entries.get(key, LRUCache.MISSING)
+            if value is LRUCache.MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        @brief Store the value of a key, evicting the least recently used entry if the cache is full.
+        @param key: Key to store
+        @param value: Value of the key
+        """
+        if self.capacity == 0: return
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.capacity:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        @brief Remove every entry. The counters are kept.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        @brief Get the counters of the cache.
+        @return: Dictionary of size, capacity, hits, misses and evictions
+        """
+        return {"size": len(self.__entries), "capacity": self.capacity,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}